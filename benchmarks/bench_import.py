@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# file: bench_import.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Import-time cost of findfile, measured in fresh interpreters.
+
+    python benchmarks/bench_import.py --repeat 20 --output import.json
+
+Each statement runs in its own subprocess; the bare interpreter start-up is
+reported as the baseline, and ``-X importtime`` gives the heaviest modules.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = {
+    "baseline": "pass",
+    "import_findfile": "import findfile",
+    "first_use_find_files": "import findfile; findfile.find_files",
+    "first_use_file_manager": "import findfile; findfile.FileManager",
+}
+
+
+def _env():
+    return dict(os.environ, PYTHONPATH=REPO + os.pathsep + os.environ.get("PYTHONPATH", ""))
+
+
+def _run(statement, repeat):
+    env = _env()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True, env=env)
+        timings.append(time.perf_counter() - start)
+    return {"min": min(timings), "median": statistics.median(timings), "repeat": repeat}
+
+
+def _heaviest_imports(statement, top=10):
+    env = _env()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        rows.append((int(cumulative_us), name.strip()))
+    return [{"module": n, "cumulative_us": c} for c, n in sorted(rows, reverse=True)[:top]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {name: _run(stmt, args.repeat) for name, stmt in STATEMENTS.items()}
+    for name, res in results.items():
+        res["over_baseline"] = res["min"] - results["baseline"]["min"]
+    report = {
+        "python": sys.version.split()[0],
+        "results": results,
+        "heaviest_imports": _heaviest_imports(STATEMENTS["import_findfile"]),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# file: bench_memory.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Peak traversal memory of the breadth-first and depth-first walks.
+
+    python benchmarks/bench_memory.py --dirs 20000 --subdirs 5 --files 2
+
+builds a wide tree (``dirs`` directories under the root, each holding
+``subdirs`` directories of ``files`` files) and reports the ``tracemalloc``
+peak while streaming every entry through ``_walk``, without keeping results,
+so the number is the walker's own working set.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from findfile.find import _walk  # noqa: E402
+
+
+def build_wide_tree(root, dirs, subdirs, files):
+    for i in range(dirs):
+        top = os.path.join(root, "d{:06d}".format(i))
+        for j in range(subdirs):
+            sub = os.path.join(top, "s{}".format(j))
+            os.makedirs(sub)
+            for k in range(files):
+                open(os.path.join(sub, "f{}.txt".format(k)), "w").close()
+
+
+def measure(root, strategy, depth):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = 0
+    for _ in _walk(Path(root), depth, strategy=strategy):
+        count += 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"entries": count, "peak_bytes": peak, "seconds": elapsed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=20000)
+    parser.add_argument("--subdirs", type=int, default=5)
+    parser.add_argument("--files", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--workdir", default=None, help="where to create the tree")
+    parser.add_argument("--output", default=None, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="findfile_mem_", dir=args.workdir)
+    try:
+        build_wide_tree(root, args.dirs, args.subdirs, args.files)
+        report = {
+            "tree": {"dirs": args.dirs, "subdirs": args.subdirs, "files": args.files},
+            "results": {s: measure(root, s, args.depth) for s in ("bfs", "dfs")},
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
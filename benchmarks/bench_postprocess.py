@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# file: bench_postprocess.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Post-processing cost of ``_find`` over 1M synthetic results.
+
+Compares the former per-result ``Path.cwd()`` / ``Path.relative_to`` handling
+with the walker-provided depths used by ``findfile.find._finalize``.
+No files are touched; run with ``python benchmarks/bench_postprocess.py [n]``.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from findfile.find import _finalize  # noqa: E402
+
+
+def _legacy(paths, root, return_relative_path, return_deepest_path):
+    if return_deepest_path:
+        depths = [
+            len(p.relative_to(root if root != Path.cwd() else Path.cwd()).parts)
+            for p in paths
+        ]
+        max_depth = max(depths)
+        paths = [p for p, d in zip(paths, depths) if d == max_depth]
+    if return_relative_path:
+        return [str(p.relative_to(Path.cwd())) for p in paths]
+    return [str(p) for p in paths]
+
+
+def main(n=1000000):
+    root = Path.cwd() / "dataset"
+    hits = []
+    for i in range(n):
+        depth = 1 + i % 6
+        parts = ["d%d" % (i % (7 + k)) for k in range(depth - 1)] + ["f%d.txt" % i]
+        hits.append((os.path.join(str(root), *parts), depth))
+    legacy_paths = [Path(p) for p, _ in hits]  # what the old walker yielded
+
+    for rel, deep in [(True, False), (True, True), (False, True)]:
+        start = time.perf_counter()
+        expected = _legacy(legacy_paths, root, rel, deep)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = _finalize(hits, rel, deep)
+        current = time.perf_counter() - start
+
+        assert result == expected
+        print(
+            "return_relative_path={!s:5} return_deepest_path={!s:5} "
+            "legacy {:.3f}s  current {:.3f}s  speedup x{:.1f}".format(
+                rel, deep, legacy, current, legacy / current
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+# file: run.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Timed scenarios for every public findfile entry point over a synthetic tree.
+
+    python benchmarks/run.py --width 4 --depth 4 --files 20 --output bench.json
+
+Results are emitted as JSON so that runs can be stored and compared over time.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import findfile  # noqa: E402
+from tree import generate_tree  # noqa: E402
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    """Register ``fn(ctx) -> result`` as a timed scenario."""
+
+    def register(fn):
+        SCENARIOS[name] = fn
+        return fn
+
+    return register
+
+
+@scenario("find_file")
+def _find_file(ctx):
+    return findfile.find_file(
+        ctx["root"],
+        ["config", ".json"],
+        recursive=ctx["depth"] + 1,
+        return_relative_path=False,
+        disable_alert=True,
+    )
+
+
+@scenario("find_files")
+def _find_files(ctx):
+    return findfile.find_files(
+        ctx["root"], ".txt", recursive=ctx["depth"] + 1, return_relative_path=False
+    )
+
+
+@scenario("find_files_exclude")
+def _find_files_exclude(ctx):
+    return findfile.find_files(
+        ctx["root"],
+        ["data", ".json"],
+        exclude_key=["backup", "cache"],
+        recursive=ctx["depth"] + 1,
+        return_relative_path=False,
+    )
+
+
+@scenario("find_files_regex")
+def _find_files_regex(ctx):
+    return findfile.find_files(
+        ctx["root"],
+        r"(train|eval)_\d+\.py$",
+        use_regex=True,
+        recursive=ctx["depth"] + 1,
+        return_relative_path=False,
+    )
+
+
+@scenario("find_dirs_leaf")
+def _find_dirs_leaf(ctx):
+    return findfile.find_dirs(
+        ctx["root"], "", recursive=ctx["depth"] + 1, return_relative_path=False
+    )
+
+
+@scenario("find_files_or_key")
+def _find_files_or_key(ctx):
+    return findfile.find_files(
+        ctx["root"],
+        or_key=["checkpoint", "label", ".yaml"],
+        recursive=ctx["depth"] + 1,
+        return_relative_path=False,
+    )
+
+
+_MANY_QUERIES = [
+    {"key": [word, ext]}
+    for word in ("config", "train", "eval", "model", "data")
+    for ext in (".json", ".yaml", ".py", ".txt")
+]
+
+
+@scenario("find_file_x20")
+def _find_file_x20(ctx):
+    return [
+        findfile.find_file(
+            ctx["root"],
+            q["key"],
+            recursive=ctx["depth"] + 1,
+            return_relative_path=False,
+            disable_alert=True,
+        )
+        for q in _MANY_QUERIES
+    ]
+
+
+@scenario("find_many_x20")
+def _find_many_x20(ctx):
+    return findfile.find_many(
+        ctx["root"],
+        _MANY_QUERIES,
+        recursive=ctx["depth"] + 1,
+        return_relative_path=False,
+        disable_alert=True,
+    )
+
+
+@scenario("rm_dirs_dry_run")
+def _rm_dirs_dry_run(ctx):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return findfile.rm_dirs(
+            ctx["root"], "cache", recursive=ctx["depth"] + 1, dry_run=True
+        )
+
+
+@scenario("file_manager_build")
+def _file_manager_build(ctx):
+    cache_file = os.path.join(ctx["root"], ".findfile_disk_cache.pkl")
+    if os.path.exists(cache_file):
+        os.remove(cache_file)
+    return findfile.FileManager(ctx["root"]).disk_cache
+
+
+@scenario("file_manager_load")
+def _file_manager_load(ctx):
+    return findfile.FileManager(ctx["root"]).disk_cache
+
+
+@scenario("file_manager_find_files")
+def _file_manager_find_files(ctx):
+    fm = ctx.get("file_manager")
+    if fm is None:
+        fm = ctx["file_manager"] = findfile.FileManager(ctx["root"])
+    return fm.find_files(
+        ctx["root"], ".txt", recursive=ctx["depth"] + 1, return_relative_path=False
+    )
+
+
+def _time(fn, ctx, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(ctx)
+        timings.append(time.perf_counter() - start)
+    if result is None or isinstance(result, str):
+        size = int(result is not None)
+    else:
+        size = len(result)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "repeat": repeat,
+        "results": size,
+    }
+
+
+def run(
+    width=4,
+    depth=4,
+    files_per_dir=20,
+    seed=0,
+    name_dist="zipf",
+    symlink_ratio=0.0,
+    repeat=5,
+    only=None,
+    workdir=None,
+):
+    """Generate the tree, time the selected scenarios and return the JSON report."""
+    tmp = tempfile.mkdtemp(prefix="findfile_bench_", dir=workdir)
+    root = os.path.join(tmp, "tree")
+    try:
+        start = time.perf_counter()
+        tree = generate_tree(
+            root,
+            width=width,
+            depth=depth,
+            files_per_dir=files_per_dir,
+            seed=seed,
+            name_dist=name_dist,
+            symlink_ratio=symlink_ratio,
+        )
+        tree["generate_seconds"] = time.perf_counter() - start
+
+        ctx = {"root": root, "depth": depth}
+        results = {}
+        for name, fn in SCENARIOS.items():
+            if only and name not in only:
+                continue
+            results[name] = _time(fn, ctx, repeat)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return {
+        "meta": {
+            "findfile": findfile.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "tree": tree,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--files", type=int, default=20, help="files per directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--name-dist", choices=["zipf", "uniform"], default="zipf")
+    parser.add_argument("--symlinks", type=float, default=0.0, help="symlink ratio")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", choices=sorted(SCENARIOS))
+    parser.add_argument("--workdir", help="where to create the tree (default: TMPDIR)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(
+        width=args.width,
+        depth=args.depth,
+        files_per_dir=args.files,
+        seed=args.seed,
+        name_dist=args.name_dist,
+        symlink_ratio=args.symlinks,
+        repeat=args.repeat,
+        only=args.only,
+        workdir=args.workdir,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# file: tree.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Deterministic synthetic directory trees for the findfile benchmarks."""
+import os
+import random
+
+VOCAB = [
+    "config",
+    "train",
+    "eval",
+    "model",
+    "checkpoint",
+    "data",
+    "dataset",
+    "log",
+    "utils",
+    "test",
+    "image",
+    "label",
+    "cache",
+    "backup",
+    "result",
+    "tmp",
+]
+
+EXTENSIONS = ["txt", "json", "py", "pt", "csv", "yaml", "png", "log"]
+
+
+def _weights(n, name_dist):
+    if name_dist == "uniform":
+        return [1.0] * n
+    if name_dist == "zipf":
+        return [1.0 / (rank + 1) for rank in range(n)]
+    raise ValueError("Unknown name distribution: {}".format(name_dist))
+
+
+def generate_tree(
+    root,
+    width=4,
+    depth=4,
+    files_per_dir=20,
+    seed=0,
+    name_dist="zipf",
+    vocab=None,
+    extensions=None,
+    symlink_ratio=0.0,
+):
+    """
+    'root' directory to create the tree in, it must not exist yet
+    'width' sub-directories per directory
+    'depth' levels of sub-directories below 'root'
+    'files_per_dir' files in every directory
+    'seed' the same seed and parameters always produce the same tree
+    'name_dist' "zipf" or "uniform" distribution of the vocabulary words in names
+    'symlink_ratio' fraction of directories that get a symlink to another directory
+
+    :return a dict with the parameters and the number of dirs, files and symlinks
+    """
+    rng = random.Random(seed)
+    vocab = list(vocab or VOCAB)
+    extensions = list(extensions or EXTENSIONS)
+    weights = _weights(len(vocab), name_dist)
+
+    os.makedirs(root)
+    dirs = [root]
+    frontier = [root]
+    n_files = 0
+    for level in range(depth + 1):
+        next_frontier = []
+        for d in frontier:
+            words = rng.choices(vocab, weights, k=files_per_dir)
+            exts = rng.choices(extensions, k=files_per_dir)
+            for i, (word, ext) in enumerate(zip(words, exts)):
+                with open(os.path.join(d, "{}_{}.{}".format(word, i, ext)), "w"):
+                    pass
+            n_files += files_per_dir
+            if level == depth:
+                continue
+            for j, word in enumerate(rng.choices(vocab, weights, k=width)):
+                sub = os.path.join(d, "{}_{}".format(word, j))
+                os.mkdir(sub)
+                next_frontier.append(sub)
+        dirs.extend(next_frontier)
+        frontier = next_frontier
+
+    n_links = 0
+    if symlink_ratio > 0:
+        for i, d in enumerate(rng.sample(dirs, int(len(dirs) * symlink_ratio))):
+            target = rng.choice(dirs)
+            try:
+                os.symlink(target, os.path.join(d, "link_{}".format(i)))
+                n_links += 1
+            except OSError:
+                break  # no symlink support (e.g. unprivileged Windows)
+
+    return {
+        "width": width,
+        "depth": depth,
+        "files_per_dir": files_per_dir,
+        "seed": seed,
+        "name_dist": name_dist,
+        "symlink_ratio": symlink_ratio,
+        "dirs": len(dirs),
+        "files": n_files,
+        "symlinks": n_links,
+    }
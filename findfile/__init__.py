@@ -8,20 +8,82 @@
 __name__ = "findfile"
 __version__ = "2.1.2"
 
-from findfile.find import (
-    find_files,
-    find_file,
-    find_dirs,
-    find_dir,
-    find_cwd_dir,
-    find_cwd_file,
-    find_cwd_dirs,
-    find_cwd_files,
-    rm_dirs,
-    rm_files,
-    rm_dir,
-    rm_file,
-    rm_cwd_files,
-    rm_cwd_dirs,
-)
-from findfile.file_manager import DiskCache, FileManager
+# Public names are resolved lazily (PEP 562) so that ``import findfile`` does not
+# import the search machinery, e.g. in short-lived CLI tools and subprocesses.
+_LAZY_ATTRS = {
+    "findfile.find": [
+        "find_files",
+        "find_file",
+        "find_dirs",
+        "find_dir",
+        "find_cwd_dir",
+        "find_cwd_file",
+        "find_cwd_dirs",
+        "find_cwd_files",
+        "find_ranked_files",
+        "find_ranked_dirs",
+        "rm_dirs",
+        "rm_files",
+        "rm_dir",
+        "rm_file",
+        "rm_cwd_files",
+        "rm_cwd_dirs",
+        "FindCursor",
+        "FindResult",
+    ],
+    "findfile.backends": [
+        "Backend",
+        "LocalBackend",
+        "MemoryBackend",
+        "PrefixBackend",
+        "DictObjectStore",
+    ],
+    "findfile.duplicates": ["find_duplicates"],
+    "findfile.file_manager": ["DiskCache", "FileManager"],
+    "findfile.multi": ["find_many"],
+    "findfile.paging": ["find_files_page", "find_dirs_page"],
+    "findfile.query_cache": [
+        "enable_query_cache",
+        "disable_query_cache",
+        "clear_query_cache",
+        "query_cache_info",
+    ],
+    "findfile.snapshot": ["Snapshot", "take_snapshot"],
+    "findfile.stats": ["FindStats", "add_stats_hook", "remove_stats_hook"],
+    "findfile.server": ["IndexServer"],
+    "findfile.throttle": ["Throttle"],
+}
+_LAZY_MODULES = {attr: mod for mod, attrs in _LAZY_ATTRS.items() for attr in attrs}
+_SUBMODULES = {
+    "backends",
+    "duplicates",
+    "find",
+    "file_manager",
+    "fuzzy",
+    "multi",
+    "paging",
+    "query_cache",
+    "server",
+    "snapshot",
+    "stats",
+    "throttle",
+}
+
+__all__ = list(_LAZY_MODULES)
+
+
+def __getattr__(name):
+    from importlib import import_module
+
+    if name in _SUBMODULES:
+        return import_module("findfile." + name)
+    module = _LAZY_MODULES.get(name)
+    if module is None:
+        raise AttributeError("module 'findfile' has no attribute '{}'".format(name))
+    value = getattr(import_module(module), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_MODULES))
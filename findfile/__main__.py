@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+# file: __main__.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import sys
+
+from findfile.cli import main
+
+sys.exit(main())
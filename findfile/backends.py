@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+# file: backends.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Filesystems the key matching can run on: list, stat and open.
+
+    find_files("datasets", ".json", backend=MemoryBackend({"/datasets/a.json": b"{}"}))
+    find_files("datasets", ".json", backend=PrefixBackend(store, page_size=1000))
+
+A backend only has to list one directory; :meth:`Backend.walk` lists a whole
+level per :meth:`Backend.list_many` call, so a store that can list several
+directories per request overrides that, and :class:`PrefixBackend` walks a
+flat key space with a few paginated listings of the whole prefix instead of
+one request per directory. Matching, depth limits and post-processing are
+those of :func:`findfile.find_files` whatever the backend; the query cache,
+the index server, glob queries and the rm_* functions stay with the local walk.
+"""
+import bisect
+import io
+import os
+import posixpath
+import stat as stat_module
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+
+class FileStat(NamedTuple):
+    is_dir: bool
+    size: int
+    mtime: float
+
+
+def _check_options(backend, walk_options):
+    unsupported = sorted(
+        k for k, v in walk_options.items() if v and not (k == "strategy" and v == "bfs")
+    )
+    if unsupported:
+        raise ValueError("{} does not support: {}".format(type(backend).__name__, unsupported))
+
+
+class Backend:
+    """The operations a walk needs; subclasses implement ``resolve``, ``stat``, ``list``, ``open``.
+
+    Paths are strings in the backend's own namespace, joined with ``sep``.
+    """
+
+    sep = "/"
+    local = False  # results may be made relative to the CWD
+
+    def resolve(self, path) -> str:
+        """The absolute backend path of a ``search_path`` (None for the root)."""
+        return posixpath.normpath(posixpath.join("/", str(path or "/").replace("\\", "/")))
+
+    def stat(self, path: str) -> FileStat | None:
+        """A :class:`FileStat`, or None when *path* does not exist."""
+        raise NotImplementedError
+
+    # defined before ``list``, which shadows the builtin in the class body
+    def list_many(self, paths: list[str]) -> Iterator[tuple[str, list | None]]:
+        """``(path, children)`` for every dir of *paths*, children None when unreadable.
+
+        Override to list several directories per request.
+        """
+        for path in paths:
+            try:
+                yield path, self.list(path)
+            except OSError:
+                yield path, None
+
+    def list(self, path: str) -> list[tuple[str, bool]]:
+        """``(child path, is_dir)`` of the files and dirs in *path*; OSError if unreadable."""
+        raise NotImplementedError
+
+    def open(self, path: str, mode: str = "rb"):
+        raise NotImplementedError
+
+    def walk(self, root: str, max_depth: int, stats=None, **walk_options):
+        """``(path, depth, is_dir)`` like :func:`findfile.find._walk`, one batch per level."""
+        _check_options(self, walk_options)
+        if stats is not None:
+            stats.stat_calls += 1
+            stats.entries_visited += 1
+        st = self.stat(root)
+        if st is None or max_depth < 0:
+            return
+        yield root, 0, st.is_dir
+        if not st.is_dir:
+            return
+        clock = time.perf_counter
+        level, depth = [root], 0
+        while level and depth < max_depth:
+            below = []
+            started = clock()
+            for path, children in self.list_many(level):
+                if stats is not None:
+                    now = clock()
+                    stats.dirs_listed += 1
+                    stats.entries_visited += len(children or ())
+                    stats.record_listing(path, now - started)
+                    started = now
+                for child, is_dir in children or ():
+                    yield child, depth + 1, is_dir
+                    if is_dir:
+                        below.append(child)
+            level, depth = below, depth + 1
+
+
+class LocalBackend(Backend):
+    """The local filesystem; its walk is :func:`findfile.find._walk` with all its options."""
+
+    sep = os.sep
+    local = True
+
+    def resolve(self, path) -> str:
+        return str(Path(path or Path.cwd()).expanduser().resolve())
+
+    def stat(self, path: str) -> FileStat | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return FileStat(stat_module.S_ISDIR(st.st_mode), st.st_size, st.st_mtime)
+
+    def list(self, path: str) -> list[tuple[str, bool]]:
+        children = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_symlink():
+                        continue
+                    is_dir = entry.is_dir()
+                    if is_dir or entry.is_file():
+                        children.append((entry.path, is_dir))
+                except OSError:
+                    continue
+        return children
+
+    def open(self, path: str, mode: str = "rb"):
+        return open(path, mode)
+
+    def walk(self, root: str, max_depth: int, stats=None, **walk_options):
+        from findfile.find import _walk
+
+        return _walk(Path(root), max_depth, stats=stats, **walk_options)
+
+
+class MemoryBackend(Backend):
+    """An in-memory tree of absolute ``/``-separated paths, e.g. for tests.
+
+    'files' ``{path: bytes}``; parent dirs are created implicitly, empty dirs
+    with :meth:`add_dir`.
+    """
+
+    def __init__(self, files: dict | None = None, dirs=()):
+        self._files = {}
+        self._dirs = {"/": {}}  # dir -> {child path: is_dir}
+        for path in dirs:
+            self.add_dir(path)
+        for path, data in (files or {}).items():
+            self.add_file(path, data)
+
+    def add_dir(self, path) -> dict:
+        path = self.resolve(path)
+        if path in self._files:
+            raise ValueError("{} is a file".format(path))
+        if path not in self._dirs:
+            self.add_dir(posixpath.dirname(path))[path] = True
+            self._dirs[path] = {}
+        return self._dirs[path]
+
+    def add_file(self, path, data: bytes = b"", mtime: float | None = None):
+        path = self.resolve(path)
+        if path in self._dirs:
+            raise ValueError("{} is a dir".format(path))
+        self.add_dir(posixpath.dirname(path))[path] = False
+        self._files[path] = (bytes(data), time.time() if mtime is None else mtime)
+
+    def stat(self, path: str) -> FileStat | None:
+        if path in self._dirs:
+            return FileStat(True, 0, 0.0)
+        if path in self._files:
+            data, mtime = self._files[path]
+            return FileStat(False, len(data), mtime)
+        return None
+
+    def list(self, path: str) -> list[tuple[str, bool]]:
+        try:
+            return list(self._dirs[path].items())
+        except KeyError:
+            raise NotADirectoryError(path) from None
+
+    def open(self, path: str, mode: str = "rb"):
+        if path not in self._files:
+            raise FileNotFoundError(path)
+        data = self._files[path][0]
+        return io.BytesIO(data) if "b" in mode else io.StringIO(data.decode())
+
+
+class DictObjectStore:
+    """A local stand-in for an object store: sorted keys with S3-style listings.
+
+    'objects' ``{key: bytes}``; keys are ``/``-separated and have no leading ``/``.
+    ``calls`` counts listing requests.
+    """
+
+    def __init__(self, objects: dict | None = None):
+        self._objects = {}
+        for key, data in (objects or {}).items():
+            self._objects[key] = (bytes(data), time.time())
+        self._keys = sorted(self._objects)
+        self.calls = 0
+
+    def put(self, key: str, data: bytes = b"", mtime: float | None = None):
+        if key not in self._objects:
+            bisect.insort(self._keys, key)
+        self._objects[key] = (bytes(data), time.time() if mtime is None else mtime)
+
+    def head(self, key: str) -> tuple[int, float] | None:
+        obj = self._objects.get(key)
+        return None if obj is None else (len(obj[0]), obj[1])
+
+    def get(self, key: str) -> bytes:
+        return self._objects[key][0]
+
+    def list_objects(self, prefix="", delimiter=None, start_after=None, max_keys=1000):
+        """Up to *max_keys* ``(key, size, mtime)`` objects and common prefixes after *start_after*.
+
+        With a *delimiter*, keys with another delimiter after *prefix* are rolled
+        up into their common prefix (ending with the delimiter). Objects and
+        prefixes count together against *max_keys*, in key order.
+        """
+        self.calls += 1
+        keys = self._keys
+        i = bisect.bisect_right(keys, max(prefix, start_after or ""))
+        objects, prefixes = [], []
+        while i < len(keys) and len(objects) + len(prefixes) < max_keys:
+            key = keys[i]
+            if not key.startswith(prefix):
+                break
+            cut = key.find(delimiter, len(prefix)) if delimiter else -1
+            if cut < 0:
+                size, mtime = len(self._objects[key][0]), self._objects[key][1]
+                objects.append((key, size, mtime))
+                i += 1
+                continue
+            common = key[: cut + 1]
+            if start_after is None or common > start_after:
+                prefixes.append(common)
+            # skip the rest of that prefix
+            i = bisect.bisect_left(keys, key[:cut] + chr(ord(delimiter) + 1), i)
+        return objects, prefixes
+
+
+class PrefixBackend(Backend):
+    """A flat key space listed by prefix, like an object store bucket.
+
+    'store' has ``list_objects(prefix, delimiter, start_after, max_keys)``,
+    ``head(key)`` and ``get(key)`` as :class:`DictObjectStore`; directories are
+    the key prefixes up to a ``/``. Paths are keys, without a leading ``/``.
+    'page_size' keys per listing request
+    'flat' walk with paginated listings of the whole prefix (few requests,
+        but keys below the depth limit are listed too); False lists one level
+        at a time with a delimiter, which suits shallow walks
+    """
+
+    def __init__(self, store, page_size: int = 1000, flat: bool = True):
+        self.store = store
+        self.page_size = page_size
+        self.flat = flat
+
+    def resolve(self, path) -> str:
+        parts = str(path or "").replace("\\", "/").split("/")
+        return "/".join(p for p in parts if p not in ("", "."))
+
+    def _pages(self, prefix: str, delimiter: str | None):
+        start_after = None
+        while True:
+            objects, prefixes = self.store.list_objects(
+                prefix, delimiter=delimiter, start_after=start_after, max_keys=self.page_size
+            )
+            yield objects, prefixes
+            if len(objects) + len(prefixes) < self.page_size:
+                return
+            start_after = max(objects[-1][0] if objects else "", prefixes[-1] if prefixes else "")
+
+    def stat(self, path: str) -> FileStat | None:
+        head = self.store.head(path) if path else None
+        if head is not None:
+            return FileStat(False, head[0], head[1])
+        objects, prefixes = self.store.list_objects(path + "/" if path else "", max_keys=1)
+        return FileStat(True, 0, 0.0) if objects or prefixes else None
+
+    def list(self, path: str) -> list[tuple[str, bool]]:
+        prefix = path + "/" if path else ""
+        children = []
+        for objects, prefixes in self._pages(prefix, "/"):
+            children += [(key, False) for key, _, _ in objects if key != prefix]
+            children += [(common[:-1], True) for common in prefixes]
+        if not children and self.stat(path) is None:
+            raise FileNotFoundError(path)
+        return children
+
+    def open(self, path: str, mode: str = "rb"):
+        data = self.store.get(path)
+        return io.BytesIO(data) if "b" in mode else io.StringIO(data.decode())
+
+    def walk(self, root: str, max_depth: int, stats=None, **walk_options):
+        if not self.flat:
+            for entry in super().walk(root, max_depth, stats=stats, **walk_options):
+                if entry[0]:  # the bucket itself has no name to report
+                    yield entry
+            return
+        _check_options(self, walk_options)
+        if stats is not None:
+            stats.stat_calls += 1
+            stats.entries_visited += 1
+        st = self.stat(root)
+        if st is None or max_depth < 0:
+            return
+        if root:  # the bucket itself has no name to report
+            yield root, 0, st.is_dir
+        if not st.is_dir or max_depth == 0:
+            return
+        prefix = root + "/" if root else ""
+        # keys sharing a prefix are contiguous, so a dir is reported when its
+        # first key comes by and only the current dir chain needs remembering
+        current: list[str] = []
+        clock = time.perf_counter
+        started = clock()
+        for objects, _ in self._pages(prefix, None):
+            if stats is not None:
+                now = clock()
+                stats.dirs_listed += 1
+                stats.entries_visited += len(objects)
+                stats.record_listing(prefix, now - started)
+                started = now
+            for key, _, _ in objects:
+                parts = key[len(prefix) :].split("/")
+                name = parts.pop()  # "" for a directory marker key
+                common = 0
+                while common < min(len(parts), len(current)) and parts[common] == current[common]:
+                    common += 1
+                current = parts
+                for depth in range(common + 1, min(len(parts), max_depth) + 1):
+                    yield prefix + "/".join(parts[:depth]), depth, True
+                if name and len(parts) < max_depth:
+                    yield key, len(parts) + 1, False
@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+# file: cli.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""``findfile`` command line interface.
+
+    findfile config .yaml -p ./experiments -e backup
+    findfile --or-key .ckpt .pt -d 10 -0 | xargs -0 du -ch
+    findfile __pycache__ --type d --delete --dry-run
+    findfile serve ~/datasets --depth 20 &   # then: findfile .csv -p ~/datasets --server
+
+Matches are written to stdout as soon as the walker finds them.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
+
+def _size(text: str) -> int:
+    text = text.strip().lower().rstrip("b")
+    unit = text[-1:] if text[-1:] in _SIZE_UNITS else ""
+    return int(float(text[: len(text) - len(unit)]) * _SIZE_UNITS[unit])
+
+
+def _add_walk_arguments(parser):
+    walk = parser.add_argument_group("traversal")
+    walk.add_argument("-L", "--follow", action="store_true", help="follow symlinks (cycle-safe)")
+    walk.add_argument(
+        "--dedupe-targets",
+        action="store_true",
+        help="report each file/dir once however many links point to it",
+    )
+    walk.add_argument(
+        "-x", "--one-file-system", action="store_true", help="stay on the device of the path"
+    )
+    walk.add_argument(
+        "--skip-fstypes",
+        nargs="*",
+        default=None,
+        metavar="TYPE",
+        help="do not enter mounts of these types (no TYPE: proc, nfs, fuse, ...)",
+    )
+    walk.add_argument(
+        "--strategy",
+        choices=["bfs", "dfs"],
+        default="bfs",
+        help="dfs: depth-first, memory bounded by depth (for very wide trees)",
+    )
+    walk.add_argument("-j", "--workers", type=int, default=None, help="listing threads")
+    walk.add_argument(
+        "--listing-timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="give up on a directory whose listing takes longer",
+    )
+    throttle = parser.add_argument_group("throttling (for busy hosts)")
+    throttle.add_argument(
+        "--max-dirs-per-sec", type=float, default=None, metavar="N", help="directory listings"
+    )
+    throttle.add_argument(
+        "--max-stats-per-sec", type=float, default=None, metavar="N", help="stat calls"
+    )
+    throttle.add_argument(
+        "--adaptive-throttle",
+        action="store_true",
+        help="back off while directory listings are slower than usual",
+    )
+    throttle.add_argument(
+        "--low-priority", action="store_true", help="lowest CPU and idle I/O priority"
+    )
+
+
+def _throttle(args):
+    if not (
+        args.max_dirs_per_sec
+        or args.max_stats_per_sec
+        or args.adaptive_throttle
+        or args.low_priority
+    ):
+        return None
+    from findfile.throttle import Throttle
+
+    return Throttle(
+        dirs_per_second=args.max_dirs_per_sec,
+        stats_per_second=args.max_stats_per_sec,
+        adaptive=args.adaptive_throttle,
+        low_priority=args.low_priority,
+    )
+
+
+def _walk_options(args) -> dict:
+    skip = args.skip_fstypes
+    return {
+        "follow_symlinks": args.follow,
+        "dedupe_targets": args.dedupe_targets,
+        "one_file_system": args.one_file_system,
+        "skip_fstypes": (skip or True) if skip is not None else None,
+        "workers": args.workers,
+        "listing_timeout": args.listing_timeout,
+        "strategy": args.strategy,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="findfile",
+        description="Search files/dirs whose path contains all the given keys.",
+    )
+    parser.add_argument("key", nargs="*", help="keys that every match must contain")
+    parser.add_argument("-p", "--path", default=None, help="search path (default: CWD)")
+    parser.add_argument(
+        "-o", "--or-key", nargs="+", default=None, help="match any instead of all keys"
+    )
+    parser.add_argument(
+        "-e", "--exclude-key", nargs="+", default=None, help="ignore paths containing these"
+    )
+    parser.add_argument(
+        "--exclude-logic",
+        choices=["or", "and"],
+        default="or",
+        help="exclude paths matching any (or) / all (and) exclude keys",
+    )
+    parser.add_argument("-r", "--regex", action="store_true", help="keys are regexes")
+    parser.add_argument(
+        "-g", "--glob", default=None, help="only walk paths matching e.g. 'data/*/**/*.json'"
+    )
+    parser.add_argument("-d", "--depth", type=int, default=5, help="recursive search limit")
+    parser.add_argument(
+        "-t", "--type", choices=["f", "d"], default="f", help="f: files (default), d: dirs"
+    )
+    _add_walk_arguments(parser)
+
+    predicates = parser.add_argument_group("predicates (need one stat per match)")
+    predicates.add_argument("--min-size", type=_size, help="e.g. 10M")
+    predicates.add_argument("--max-size", type=_size, help="e.g. 1G")
+    predicates.add_argument(
+        "--newer", type=float, metavar="SECONDS", help="modified in the last SECONDS"
+    )
+    predicates.add_argument(
+        "--older", type=float, metavar="SECONDS", help="not modified in the last SECONDS"
+    )
+
+    output = parser.add_argument_group("output")
+    output.add_argument(
+        "-0", "--null", action="store_true", help="NUL-separated output for xargs -0"
+    )
+    output.add_argument("--json", action="store_true", help="one JSON object per line")
+    output.add_argument("-a", "--absolute", action="store_true", help="absolute paths")
+    output.add_argument(
+        "--leaf-only",
+        action="store_true",
+        help="dirs only: drop dirs containing another match (buffers the output)",
+    )
+    output.add_argument("--stats", action="store_true", help="print stats to stderr")
+    output.add_argument(
+        "--server",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="SOCKET",
+        help="ask a running `findfile serve` first (default socket if none given)",
+    )
+
+    deletion = parser.add_argument_group("deletion")
+    deletion.add_argument(
+        "--delete", action="store_true", help="remove the matches (needs a key, spares the root)"
+    )
+    deletion.add_argument(
+        "--dry-run", action="store_true", help="with --delete: only list the targets"
+    )
+    return parser
+
+
+def build_serve_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="findfile serve",
+        description="Keep in-memory indexes of ROOTs and answer queries on a Unix socket.",
+    )
+    parser.add_argument("root", nargs="*", default=["."], help="dirs to index (default: CWD)")
+    parser.add_argument("-s", "--socket", default=None, help="socket path")
+    parser.add_argument("-d", "--depth", type=int, default=30, help="index depth limit")
+    parser.add_argument(
+        "--refresh",
+        type=float,
+        default=2.0,
+        metavar="SECONDS",
+        help="interval of the directory mtime checks",
+    )
+    _add_walk_arguments(parser)
+    return parser
+
+
+def _serve(argv) -> int:
+    import signal
+
+    from findfile.server import default_socket_path, serve
+
+    args = build_serve_parser().parse_args(argv)
+    # stop cleanly (and remove the socket) under service managers too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    socket_path = args.socket or default_socket_path()
+    print("findfile: serving {} on {}".format(", ".join(args.root), socket_path), file=sys.stderr)
+    try:
+        serve(
+            args.root,
+            socket_path,
+            args.depth,
+            args.refresh,
+            throttle=_throttle(args),
+            **_walk_options(args),
+        )
+    except KeyboardInterrupt:
+        pass
+    except (RuntimeError, ValueError) as e:
+        print("findfile: {}".format(e), file=sys.stderr)
+        return 1
+    return 0
+
+
+def _served(args, want):
+    """Matches from the daemon as (path, depth), or None to walk locally."""
+    from findfile.find import _normalize_query
+    from findfile.server import _find_via_server
+
+    keys = args.or_key if args.or_key else [args.key or None]
+    hits = []
+    for key in keys:
+        root, key, _, exclude_combined, recursive = _normalize_query(
+            args.path, key, args.exclude_key, args.depth
+        )
+        served = _find_via_server(
+            args.server,
+            root,
+            want=want,
+            key=key,
+            exclude_key=exclude_combined,
+            use_regex=args.regex,
+            recursive=recursive,
+            exclude_logic=args.exclude_logic,
+            **_walk_options(args),
+        )
+        if served is None:
+            return None
+        hits.extend(served)
+    if args.or_key:
+        hits = list(dict.fromkeys(hits))
+    return hits
+
+
+def _predicate(args):
+    checks = []
+    now = time.time()
+    if args.min_size is not None:
+        checks.append(lambda st: st.st_size >= args.min_size)
+    if args.max_size is not None:
+        checks.append(lambda st: st.st_size <= args.max_size)
+    if args.newer is not None:
+        checks.append(lambda st: now - st.st_mtime <= args.newer)
+    if args.older is not None:
+        checks.append(lambda st: now - st.st_mtime > args.older)
+    if not checks:
+        return None
+
+    def accept(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return all(check(st) for check in checks)
+
+    return accept
+
+
+def _remove(path, is_dir):
+    import shutil
+
+    if not os.path.lexists(path):
+        return  # already gone with a removed parent dir
+    try:
+        if is_dir:
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    except OSError as e:
+        print("findfile: cannot remove {}: {}".format(path, e), file=sys.stderr)
+
+
+def _search_root(args) -> str:
+    """The dir the walk starts from; --delete never removes it or anything above it."""
+    from pathlib import Path
+
+    root = Path(args.path or os.getcwd()).expanduser().resolve()
+    if args.glob is not None:
+        from findfile.globbing import _glob_root
+
+        root, _ = _glob_root(root, args.glob)
+    return str(root)
+
+
+def run(args) -> int:
+    from findfile.find import _filter_leaf_dirs, _ifind
+    from findfile.stats import FindStats
+
+    want = "dir" if args.type == "d" else "file"
+    stats = FindStats() if args.stats else None
+    started = time.perf_counter()
+    matches = _served(args, want) if args.server and args.glob is None else None
+    if matches is not None and stats is not None:
+        stats.cache_hits += 1
+        stats.matches += len(matches)
+    if matches is None:
+        matches = _ifind(
+            args.path,
+            key=args.key or None,
+            or_key=args.or_key,
+            exclude_key=args.exclude_key,
+            use_regex=args.regex,
+            recursive=args.depth,
+            disable_alert=True,
+            want=want,
+            exclude_logic=args.exclude_logic,
+            stats=stats,
+            glob=args.glob,
+            throttle=_throttle(args),
+            **_walk_options(args),
+        )
+    paths = (p for p, _ in matches)
+    accept = _predicate(args)
+    if accept is not None:
+        paths = filter(accept, paths)
+    if args.leaf_only:
+        paths = _filter_leaf_dirs(list(paths))
+
+    cwd = os.getcwd()
+    prefix = cwd if cwd.endswith(os.sep) else cwd + os.sep
+    end = "\0" if args.null else "\n"
+    write = sys.stdout.write
+    root = _search_root(args) if args.delete else None
+    inside = root.rstrip(os.sep) + os.sep if root else None
+    removed = []
+    found = 0
+    for path in paths:
+        found += 1
+        shown = path
+        if not args.absolute:
+            shown = path[len(prefix) :] if path.startswith(prefix) else os.path.relpath(path)
+        if args.json:
+            write(json.dumps({"path": shown, "type": want}) + end)
+        else:
+            write(shown + end)
+        if args.delete:
+            if path.startswith(inside):
+                removed.append(path)
+            else:
+                print("findfile: not removing the search root {}".format(path), file=sys.stderr)
+
+    sys.stdout.flush()
+    if removed and not args.dry_run:
+        # after the walk, so the walker never lists a directory being removed
+        for path in removed:
+            _remove(path, want == "dir")
+
+    if stats is not None:
+        stats.calls += 1
+        stats.total_time = time.perf_counter() - started
+        stats.query = {
+            "search_path": os.path.abspath(args.path or cwd),
+            "want": want,
+            "key": args.key,
+            "or_key": args.or_key,
+            "exclude_key": args.exclude_key,
+            "recursive": args.depth,
+        }
+        report = stats.as_dict()
+        report["results"] = found
+        print(json.dumps(report), file=sys.stderr)
+    return 0 if found else 1
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["serve"]:
+        return _serve(argv[1:])
+    args = build_parser().parse_args(argv)
+    if args.leaf_only and args.type != "d":
+        build_parser().error("--leaf-only requires --type d")
+    if args.delete and not (args.key or args.or_key):
+        # like rm_files(): without a key every entry matches, the search root included
+        build_parser().error("--delete requires a key or --or-key")
+    try:
+        return run(args)
+    except BrokenPipeError:
+        # the reader went away (e.g. `| head`); silence the flush at exit too
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
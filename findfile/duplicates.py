@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# file: duplicates.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Groups of identical files among the results of a ``find_files`` query.
+
+Candidates are narrowed down in rounds that each read more of fewer files:
+equal sizes first (one stat per file, no reads), then a hash of the first
+and last block, and only the files still colliding after that are hashed in
+full, in a thread pool. Paths sharing an inode are one file and are read
+once, so in a typical tree only a small fraction of the bytes is ever read.
+"""
+import hashlib
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from findfile.find import _relative_to_cwd, find_files
+from findfile.stats import FindStats
+
+
+def _edge_digest(path: str, size: int, block_size: int) -> tuple[bytes, int]:
+    """Digest of the first and last *block_size* bytes, and the bytes read."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        head = f.read(block_size)
+        h.update(head)
+        read = len(head)
+        if size > block_size:
+            f.seek(max(block_size, size - block_size))
+            tail = f.read(block_size)
+            h.update(tail)
+            read += len(tail)
+    return h.digest(), read
+
+
+def _full_digest(path: str, chunk_size: int = 1 << 20) -> tuple[bytes, int]:
+    h = hashlib.blake2b()
+    read = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+            read += len(chunk)
+    return h.digest(), read
+
+
+def _regroup(groups, digest, workers, stats) -> list:
+    """Split every group of ``(path, size, inode)`` files by *digest* computed in threads."""
+    files = [f for group in groups for f in group]
+    split = defaultdict(list)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(f, pool.submit(digest, f[0], f[1])) for f in files]
+        for f, future in futures:
+            try:
+                value, read = future.result()
+            except OSError:  # vanished or unreadable: not a duplicate of anything
+                continue
+            if stats is not None:
+                stats.bytes_read += read
+            split[f[1], value].append(f)
+    return [group for group in split.values() if len(group) > 1]
+
+
+def find_duplicates(
+    search_path: str | Path = None,
+    and_key=None,
+    exclude_key=None,
+    use_regex=False,
+    return_relative_path=True,
+    disable_alert=False,
+    min_size: int = 1,
+    block_size: int = 64 * 1024,
+    hash_workers: int = 4,
+    include_hardlinks: bool = False,
+    **kwargs,
+) -> list[list[str]]:
+    """
+    Groups of files with identical content among the ``find_files`` results.
+
+    'key', 'or_key', 'exclude_key', 'use_regex', 'recursive' and the other
+        arguments select the candidates exactly as in :func:`findfile.find_files`
+    'min_size' smaller files are ignored (by default the empty ones)
+    'block_size' bytes hashed at each end of a file before a full hash
+    'hash_workers' threads reading files (``workers`` lists directories, as usual)
+    'include_hardlinks' also report paths that are all hard links to one file
+        (deleting one of them frees nothing)
+    'stats' a :class:`findfile.FindStats` also gets ``bytes_read``
+    'backend' only a local one: the files are stat'ed and read from the local disk
+
+    :return groups of paths, largest files first; within a group the paths
+        are sorted and hard links to one file are listed together
+    """
+    key = kwargs.pop("key", and_key)
+    backend = kwargs.get("backend")
+    if backend is not None and not backend.local:
+        # sizes, inodes and contents are read with os.stat and open
+        raise ValueError(
+            "find_duplicates() needs local files, not {}".format(type(backend).__name__)
+        )
+    stats = kwargs.get("stats")
+    stats = stats if isinstance(stats, FindStats) else None
+    paths = find_files(
+        search_path,
+        key=key,
+        exclude_key=exclude_key,
+        use_regex=use_regex,
+        return_relative_path=False,
+        disable_alert=disable_alert,
+        **kwargs,
+    )
+
+    # hard links are one file: keep one representative per inode
+    links = defaultdict(list)
+    by_size = defaultdict(list)
+    for path in dict.fromkeys(paths):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if st.st_size < min_size:
+            continue
+        inode = (st.st_dev, st.st_ino)
+        if not links[inode]:
+            by_size[st.st_size].append((path, st.st_size, inode))
+        links[inode].append(path)
+
+    groups = [group for group in by_size.values() if len(group) > 1]
+    groups = _regroup(groups, lambda p, s: _edge_digest(p, s, block_size), hash_workers, stats)
+    # the edges already covered files of up to two blocks
+    whole = [group for group in groups if group[0][1] <= 2 * block_size]
+    partial = [group for group in groups if group[0][1] > 2 * block_size]
+    groups = whole + _regroup(partial, lambda p, s: _full_digest(p), hash_workers, stats)
+
+    results = [(group[0][1], [links.pop(inode) for _, _, inode in group]) for group in groups]
+    if include_hardlinks:
+        sizes = {inode: size for group in by_size.values() for _, size, inode in group}
+        results += [
+            (sizes[inode], [inode_paths])
+            for inode, inode_paths in links.items()
+            if len(inode_paths) > 1
+        ]
+
+    duplicates = sorted(
+        (-size, [p for m in sorted(sorted(m) for m in members) for p in m])
+        for size, members in results
+    )
+    return [_relative_to_cwd(g) if return_relative_path else g for _, g in duplicates]
@@ -7,10 +7,10 @@
 # google scholar: https://scholar.google.com/citations?user=NPq5a_0AAAAJ&hl=en
 # Copyright (C) 2021. All Rights Reserved.
 import os
-import pickle
 import time
+from array import array
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import Union, List
 
 
 from findfile.find import find_dir, find_dirs, find_file, find_files  # noqa: F401
@@ -24,11 +24,53 @@ from findfile.find import (
 )  # noqa: F401
 
 from findfile.find import __FINDFILE_IGNORE__
+from findfile.find import (
+    _compile_extensions,
+    _compile_patterns,
+    _filter_leaf_dirs,
+    _finalize,
+    _find,
+    _fstypes,
+    _reject_budget,
+    _select_target,
+    _walk,
+    _matches_all_include,
+    _matches_any_exclude_and,
+    _matches_any_exclude_or,
+    _matches_any_include,
+)
+from findfile.fuzzy import NameIndex, TrigramIndex
+from findfile.query_cache import _dirs_unchanged
+from findfile.stats import _emit_stats, _stats_for
+
+
+# walk options a DiskCache build honours; the first four change which entries it holds
+_WALK_OPTIONS = (
+    "follow_symlinks",
+    "dedupe_targets",
+    "one_file_system",
+    "skip_fstypes",
+    "workers",
+    "listing_timeout",
+    "strategy",
+    "throttle",
+)
+
+
+def _result_options(kwargs) -> dict:
+    return {
+        "follow_symlinks": bool(kwargs.get("follow_symlinks", False)),
+        "dedupe_targets": bool(kwargs.get("dedupe_targets", False)),
+        "one_file_system": bool(kwargs.get("one_file_system", False)),
+        "skip_fstypes": list(_fstypes(kwargs.get("skip_fstypes"))),
+    }
 
 
 class DiskCache(list):
-    def __init__(self, work_dir: Union[str, Path], **kwargs):
+    def __init__(self, work_dir: str | Path, **kwargs):
         recursive = kwargs.get("recursive", 30)
+        if kwargs.get("engine", "python") not in ("python", "numpy"):
+            raise ValueError("engine must be 'python' or 'numpy': {!r}".format(kwargs["engine"]))
         # Resolve or locate working directory
         if work_dir and os.path.isdir(work_dir):
             self.work_dir = str(Path(work_dir).resolve())
@@ -45,44 +87,663 @@ class DiskCache(list):
                 raise ValueError(f"Work directory '{work_dir}' not found")
             self.work_dir = located
 
-        # Build initial list cache (absolute paths)
-        self.disk_list_cache = find_files(
-            self.work_dir,
-            and_key="",
-            recursive=recursive,
-            return_relative_path=False,
-            disable_alert=True,
-        ) + find_dirs(
-            self.work_dir,
-            and_key="",
-            recursive=recursive,
-            return_relative_path=False,
-            disable_alert=True,
+        self.kwargs = kwargs
+        self._build(recursive)
+
+    def _build(self, recursive):
+        if recursive is True:
+            recursive = 5
+        self.recursive = int(recursive)
+
+        # One walk for files and dirs, sorted by path so that every subtree is
+        # the contiguous range [dir/, dir0) of the cache.
+        ignore = _compile_patterns(list(__FINDFILE_IGNORE__), False, disable_alert=True)
+        # with track_mtimes, (dir, st_mtime_ns) of every listed dir for is_fresh()
+        self.listed_dirs = [] if self.kwargs.get("track_mtimes", False) else None
+        entries = sorted(
+            (path, is_dir, depth)
+            for path, depth, is_dir in _walk(
+                Path(self.work_dir),
+                self.recursive,
+                listed=self.listed_dirs,
+                **self._walk_options(),
+            )
+            if not _matches_any_exclude_or(path, ignore)
         )
+        self._set_entries(entries)
 
-        self.kwargs = kwargs
+    def _set_entries(self, entries):
+        """Index sorted ``(path, is_dir, depth)`` entries (depths relative to work_dir)."""
+        self.disk_list_cache = [e[0] for e in entries]
+        self.kinds = bytearray(e[1] for e in entries)
+        self.depths = array("H", (e[2] for e in entries))
+        del entries
+
+        # per-directory offset table: dir -> (start, end) of its descendants
+        self.dir_offsets = {}
+        for i, path in enumerate(self.disk_list_cache):
+            if self.kinds[i]:
+                self.dir_offsets[path] = self._subtree_range(path, lo=i + 1)
+
+        self._name_index = None
+        self._vector_index = None
+        self.path_index = None
+        if self.kwargs.get("trigram_index", False):
+            self.build_trigram_index()
+        list.__init__(self, self.disk_list_cache)
+
+    @property
+    def build_params(self) -> dict:
+        """The parameters that decide which entries a build contains."""
+        return {
+            "root": self.work_dir,
+            "recursive": self.recursive,
+            "ignore": sorted(__FINDFILE_IGNORE__),
+            **_result_options(self.kwargs),
+        }
+
+    def _walk_options(self) -> dict:
+        return {k: self.kwargs[k] for k in _WALK_OPTIONS if k in self.kwargs}
+
+    def _entries(self):
+        return zip(self.disk_list_cache, self.kinds, self.depths)
+
+    def deepen(self, recursive) -> "DiskCache":
+        """Deepen the cache to *recursive* by walking only below its depth frontier.
+
+        Directories at the old depth limit are the only ones never listed, so
+        each of them is walked for the missing levels and the new entries are
+        merged into the sorted arrays; nothing above the frontier is re-read.
+        """
+        import heapq
+
+        recursive = int(recursive)
+        extra = recursive - self.recursive
+        if extra <= 0:
+            return self
+        if self.kwargs.get("follow_symlinks") or self.kwargs.get("dedupe_targets"):
+            # cycle and duplicate detection need the (st_dev, st_ino) of the whole walk
+            self.kwargs["recursive"] = recursive
+            self._build(recursive)
+            return self
+        ignore = _compile_patterns(list(__FINDFILE_IGNORE__), False, disable_alert=True)
+        frontier = [
+            path for path, is_dir, depth in self._entries() if is_dir and depth == self.recursive
+        ]
+        new_entries = []
+        for top in frontier:
+            walk = _walk(
+                Path(top),
+                extra,
+                listed=getattr(self, "listed_dirs", None),
+                **self._walk_options(),
+            )
+            next(walk, None)  # the frontier dir itself is cached already
+            new_entries.extend(
+                (path, is_dir, self.recursive + depth)
+                for path, depth, is_dir in walk
+                if not _matches_any_exclude_or(path, ignore)
+            )
+        new_entries.sort()
+        self.recursive = recursive
+        self.kwargs["recursive"] = recursive
+        self._set_entries(list(heapq.merge(self._entries(), new_entries)))
+        return self
+
+    def view(self, recursive) -> "DiskCache":
+        """A new cache with only the entries within *recursive* levels, no disk access."""
+        recursive = int(recursive)
+        if recursive >= self.recursive:
+            return self
+        shallow = type(self).__new__(type(self))
+        shallow.__dict__.update(self.__dict__)
+        shallow.kwargs = dict(self.kwargs, recursive=recursive)
+        shallow.recursive = recursive
+        if getattr(self, "listed_dirs", None) is not None:
+            shallow.listed_dirs = list(self.listed_dirs)
+        shallow._set_entries([e for e in self._entries() if e[2] <= recursive])
+        return shallow
+
+    @classmethod
+    def merge(cls, parts) -> "DiskCache":
+        """One cache from partial caches of disjoint subtrees, e.g. built on several machines.
+
+        One part indexes the top of the tree and every other part is rooted at
+        a dir on the depth frontier of another part (a dir it reports but did
+        not list): index ``/data`` with ``recursive=2`` and hand each dir at
+        depth 2 to a worker. The sorted entries are merged k-way with their
+        depths shifted. A part rooted anywhere else (an overlap or a gap), a
+        path that is a file in one part and a dir in another, or parts built
+        with other walk options or ignore lists raise ValueError. The merged
+        depth is where the first part stops, deeper entries are dropped, so
+        the result deepens and serves queries like any cache.
+        """
+        import heapq
+
+        parts = sorted(parts, key=lambda p: (len(Path(p.work_dir).parts), p.work_dir))
+        if not parts:
+            raise ValueError("Nothing to merge")
+        top = parts[0]
+
+        def options(part):
+            return {k: v for k, v in part.build_params.items() if k not in ("root", "recursive")}
+
+        offsets = {top.work_dir: 0}  # part root -> its depth in the merged cache
+        for part in parts[1:]:
+            if options(part) != options(top):
+                raise ValueError(
+                    "{} was built with other options than {}".format(part.work_dir, top.work_dir)
+                )
+            if part.work_dir in offsets:
+                raise ValueError("Overlapping parts: {} is indexed twice".format(part.work_dir))
+            containing = [
+                p for p in parts if p.work_dir in offsets and _is_within(part.work_dir, p.work_dir)
+            ]
+            parent = max(containing, key=lambda p: len(p.work_dir), default=None)
+            if parent is None:
+                raise ValueError(
+                    "{} is not inside the top part {}".format(part.work_dir, top.work_dir)
+                )
+            depth = len(Path(part.work_dir).relative_to(parent.work_dir).parts)
+            i = bisect_left(parent.disk_list_cache, part.work_dir)
+            found = i < len(parent) and parent.disk_list_cache[i] == part.work_dir
+            if depth < parent.recursive:
+                if found and parent.kinds[i]:
+                    raise ValueError(
+                        "Overlapping parts: {} already lists {}".format(
+                            parent.work_dir, part.work_dir
+                        )
+                    )
+                raise ValueError("{} is not a dir in {}".format(part.work_dir, parent.work_dir))
+            if depth > parent.recursive:
+                raise ValueError(
+                    "Gap between parts: {} is below the depth frontier of {}".format(
+                        part.work_dir, parent.work_dir
+                    )
+                )
+            if not (found and parent.kinds[i]):
+                raise ValueError("{} is not a dir in {}".format(part.work_dir, parent.work_dir))
+            offsets[part.work_dir] = offsets[parent.work_dir] + depth
+
+        # complete down to the first frontier dir that no part continues
+        recursive = max(offsets[p.work_dir] + p.recursive for p in parts)
+        for part in parts:
+            if any(
+                kind and depth == part.recursive and path not in offsets
+                for path, kind, depth in part._entries()
+            ):
+                recursive = min(recursive, offsets[part.work_dir] + part.recursive)
+
+        def shifted(part):
+            base = offsets[part.work_dir]
+            for path, kind, depth in part._entries():
+                if base + depth <= recursive:
+                    yield path, kind, base + depth
+
+        entries = []
+        for entry in heapq.merge(*map(shifted, parts)):
+            if entries and entries[-1][0] == entry[0]:
+                # a part root is also reported by the part it continues
+                if entry[0] not in offsets or entry != entries[-1]:
+                    raise ValueError("Conflicting entries for {}".format(entry[0]))
+                continue
+            entries.append(entry)
+
+        merged = cls.__new__(cls)
+        merged.work_dir = top.work_dir
+        merged.kwargs = dict(top.kwargs, recursive=recursive)
+        merged.recursive = recursive
+        listed = [getattr(p, "listed_dirs", None) for p in parts]
+        merged.listed_dirs = None if None in listed else [d for dirs in listed for d in dirs]
+        merged._set_entries(entries)
+        return merged
+
+    def save(self, cache_file=None) -> str:
+        """Write the cache atomically; by default to where :class:`FileManager` loads it from."""
+        cache_file = cache_file or os.path.join(self.work_dir, _CACHE_NAME)
+        _save_disk_cache(cache_file, self, strict=True)
+        return cache_file
+
+    @classmethod
+    def load(cls, cache_file) -> "DiskCache":
+        """A cache written by :meth:`save`, e.g. a part built on another machine."""
+        cache = _load_disk_cache(cache_file, {"format": _CACHE_FORMAT, "version": _CACHE_VERSION})
+        if cache is None:
+            raise ValueError("Not a readable findfile cache: {}".format(cache_file))
+        return cache
+
+    def snapshot(self, snapshot_file):
+        """A :class:`findfile.snapshot.Snapshot` of the cached tree as it is on disk now.
+
+        Compare two of them with :func:`findfile.snapshot.diff`.
+        """
+        from findfile.snapshot import take_snapshot
 
-        super().__init__(self.disk_list_cache)
+        return take_snapshot(self.work_dir, snapshot_file, recursive=self.recursive)
+
+    def _subtree_range(self, path, lo=0):
+        prefix = path if path.endswith(os.sep) else path + os.sep
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+        start = bisect_left(self.disk_list_cache, prefix, lo)
+        return start, bisect_left(self.disk_list_cache, upper, start)
 
     def recache(self, **kwargs):
-        recursive = kwargs.get("recursive", self.kwargs.get("recursive", 30))
-        files = find_files(
-            self.work_dir,
-            and_key="",
-            recursive=recursive,
-            return_relative_path=False,
+        self.kwargs.update(kwargs)
+        self._build(self.kwargs.get("recursive", 30))
+        return self
+
+    def is_fresh(self) -> bool:
+        """Whether no listed dir changed since the build (needs ``track_mtimes=True``)."""
+        if getattr(self, "listed_dirs", None) is None:
+            raise ValueError("DiskCache was built without track_mtimes=True")
+        return _dirs_unchanged(self.listed_dirs)
+
+    def changed_dirs(self, search_path=None, recursive=None) -> list[str]:
+        """The listed dirs whose ``st_mtime_ns`` changed (needs ``track_mtimes=True``).
+
+        With *search_path* (a cached dir) only the dirs a query of it within
+        *recursive* levels lists are checked, one ``stat`` each.
+        """
+        if getattr(self, "listed_dirs", None) is None:
+            raise ValueError("DiskCache was built without track_mtimes=True")
+        mtimes = dict(self.listed_dirs)
+        if search_path is None:
+            scope = list(mtimes)
+        else:
+            search_path = str(search_path)
+            base = self.depths[bisect_left(self.disk_list_cache, search_path)]
+            max_depth = base + (self.recursive if recursive is None else recursive)
+            start, end = self.dir_offsets[search_path]
+            scope = [search_path] + [
+                self.disk_list_cache[i]
+                for i in range(start, end)
+                if self.kinds[i] and self.depths[i] < max_depth
+            ]
+        return [d for d in scope if d in mtimes and not _dirs_unchanged([(d, mtimes[d])])]
+
+    def relisted(self, dirs) -> "DiskCache":
+        """A copy of the cache with the changed *dirs* (see :meth:`changed_dirs`) listed again.
+
+        Entries a dir no longer holds are dropped with their subtrees and new
+        subdirs are walked down to the depth limit; every other dir keeps its
+        cached entries. A cache following links is rebuilt instead when an entry
+        changed, as cycle and duplicate detection need the ``(st_dev, st_ino)``
+        of the whole walk. The copy shares the entries when only mtimes moved.
+        """
+        import heapq
+
+        if not dirs:
+            return self
+        fresh = type(self).__new__(type(self))
+        fresh.__dict__.update(self.__dict__)
+        fresh.kwargs = dict(self.kwargs)
+        follow = self.kwargs.get("follow_symlinks") or self.kwargs.get("dedupe_targets")
+
+        ignore = _compile_patterns(list(__FINDFILE_IGNORE__), False, disable_alert=True)
+        paths, kinds = self.disk_list_cache, self.kinds
+
+        def walk(top, depth, max_depth):
+            entries = _walk(Path(top), max_depth, listed=listed, **self._walk_options())
+            next(entries, None)  # *top* itself is cached already
+            for path, d, is_dir in entries:
+                if not _matches_any_exclude_or(path, ignore):
+                    yield path, is_dir, depth + d
+
+        listed, added, removed, dropped = [], [], set(), []
+        for top in sorted(dirs):
+            if top not in self.dir_offsets or top.startswith(tuple(dropped)):
+                continue  # gone with a changed parent
+            if not os.path.isdir(top):
+                continue  # dropped by its parent, which changed too
+            base = self.depths[bisect_left(paths, top)]
+            before = {}
+            i, end = self.dir_offsets[top]
+            while i < end:  # the direct children, skipping their subtrees
+                before[paths[i]] = bool(kinds[i])
+                i = self.dir_offsets[paths[i]][1] if kinds[i] else i + 1
+            now = {path: is_dir for path, is_dir, _ in walk(top, base, 1)}
+            for path, was_dir in before.items():
+                if now.get(path) != was_dir:
+                    removed.add(path)
+                    if was_dir:
+                        dropped.append(path + os.sep)
+            for path, is_dir in now.items():
+                if before.get(path) == is_dir:
+                    continue
+                added.append((path, is_dir, base + 1))
+                if is_dir and base + 1 < self.recursive and not follow:
+                    added.extend(walk(path, base + 1, self.recursive - base - 1))
+        if follow and (added or removed):
+            fresh._build(self.recursive)
+            return fresh
+
+        dropped = tuple(dropped)
+        mtimes = {
+            d: m
+            for d, m in self.listed_dirs
+            if d not in removed and not d.startswith(dropped)
+        }
+        mtimes.update(listed)
+        fresh.listed_dirs = list(mtimes.items())
+        if not (added or removed):  # only mtimes moved, the entries are shared
+            list.__init__(fresh, self)
+            return fresh
+        kept = (e for e in self._entries() if e[0] not in removed and not e[0].startswith(dropped))
+        fresh._set_entries(list(heapq.merge(kept, sorted(added))))
+        return fresh
+
+    def walked_like(self, **kwargs) -> bool:
+        """Whether a query with these walk options would see the cached entries."""
+        if kwargs.get("exclude_logic", "or") != "or":
+            # the build dropped the __FINDFILE_IGNORE__ entries, which a walk only
+            # excludes when its exclude keys are or-ed with the ignore list
+            return False
+        return _result_options(kwargs) == _result_options(self.kwargs)
+
+    def covers(self, search_path, recursive) -> bool:
+        """Whether every entry within *recursive* levels below *search_path* is cached."""
+        search_path = str(search_path)
+        if search_path != self.work_dir and not search_path.startswith(
+            self.work_dir.rstrip(os.sep) + os.sep
+        ):
+            return False
+        if search_path not in self.dir_offsets:
+            return False
+        if any(_result_options(self.kwargs).values()) and search_path != self.work_dir:
+            # which link to a subtree got descended, and which dirs count as
+            # another device, depend on the walk root: only serve the root itself
+            return False
+        base = self.depths[bisect_left(self.disk_list_cache, search_path)]
+        return base + recursive <= self.recursive
+
+    def query(
+        self,
+        search_path,
+        want="file",
+        key=None,
+        exclude_key=None,
+        use_regex=False,
+        recursive=5,
+        exclude_logic="or",
+    ) -> list[tuple[str, int]]:
+        """
+        'search_path' a cached dir, see :meth:`covers`
+        'want' "file" or "dir"
+        'key', 'exclude_key', 'use_regex', 'exclude_logic' as in :func:`findfile.find_files`
+        'recursive' depth limit relative to 'search_path'
+
+        :return the matched (path, depth) pairs in sorted path order, depth relative to 'search_path'
+        """
+        search_path = str(search_path)
+        paths, kinds, depths = self.disk_list_cache, self.kinds, self.depths
+        root = bisect_left(paths, search_path)
+        start, end = self.dir_offsets[search_path]
+        base = depths[root]
+        max_depth = base + recursive
+        kind = 1 if want == "dir" else 0
+
+        if self._engine == "numpy" and not use_regex:
+            import numpy as np
+
+            kinds_, depths_ = np.frombuffer(kinds, np.uint8), np.frombuffer(depths, np.uint16)
+            ids = []
+            for lo, hi in ((root, root + 1), (start, end)):
+                accepted = self.vector_index.mask(key, exclude_key, exclude_logic, lo=lo, hi=hi)
+                accepted &= (kinds_[lo:hi] == kind) & (depths_[lo:hi] <= max_depth)
+                ids.extend((np.flatnonzero(accepted) + lo).tolist())
+            return [(paths[i], depths[i] - base) for i in ids]
+
+        if getattr(self, "path_index", None) is not None and not use_regex:
+            ids = self._search_ids(key, exclude_key, False, exclude_logic)
+            lo, hi = bisect_left(ids, start), bisect_left(ids, end)
+            candidates = ids[lo:hi]
+            j = bisect_left(ids, root)
+            if j < len(ids) and ids[j] == root:
+                candidates.insert(0, root)
+            return [
+                (paths[i], depths[i] - base)
+                for i in candidates
+                if kinds[i] == kind and depths[i] <= max_depth
+            ]
+
+        include = _compile_patterns(
+            [key] if isinstance(key, str) else key, use_regex, disable_alert=True
+        )
+        exclude = _compile_patterns(
+            [exclude_key] if isinstance(exclude_key, str) else exclude_key,
+            use_regex,
             disable_alert=True,
         )
-        dirs = find_dirs(
-            self.work_dir,
-            and_key="",
-            recursive=recursive,
-            return_relative_path=False,
+        excluded = (
+            _matches_any_exclude_or if exclude_logic == "or" else _matches_any_exclude_and
+        )
+        return [
+            (paths[i], depths[i] - base)
+            for i in [root, *range(start, end)]
+            if kinds[i] == kind
+            and depths[i] <= max_depth
+            and _matches_all_include(paths[i], include)
+            and not excluded(paths[i], exclude)
+        ]
+
+    def query_page(
+        self,
+        search_path,
+        want="file",
+        key=None,
+        exclude_key=None,
+        use_regex=False,
+        recursive=5,
+        exclude_logic="or",
+        page_size=1000,
+        after=None,
+        include_logic="and",
+    ) -> list[tuple[str, int]]:
+        """
+        Like :meth:`query`, but at most 'page_size' hits whose path sorts after 'after'.
+
+        The scan starts at the bisected position of 'after', so a page costs
+        O(page_size) entries for unselective keys instead of a full scan.
+        """
+        search_path = str(search_path)
+        paths, kinds, depths = self.disk_list_cache, self.kinds, self.depths
+        root = bisect_left(paths, search_path)
+        start, end = self.dir_offsets[search_path]
+        base = depths[root]
+        max_depth = base + recursive
+        kind = 1 if want == "dir" else 0
+        include = _compile_patterns(
+            [key] if isinstance(key, str) else key, use_regex, disable_alert=True
+        )
+        exclude = _compile_patterns(
+            [exclude_key] if isinstance(exclude_key, str) else exclude_key,
+            use_regex,
             disable_alert=True,
         )
-        self.disk_list_cache = files + dirs
-        super().__init__(self.disk_list_cache)
-        return self
+        included = _matches_any_include if include_logic == "or" else _matches_all_include
+        excluded = (
+            _matches_any_exclude_or if exclude_logic == "or" else _matches_any_exclude_and
+        )
+        ids = range(start, end)
+        if after is None:
+            ids = [root, *ids]
+        elif after < search_path:
+            ids = [root, *ids]
+        else:
+            ids = range(max(start, bisect_right(paths, after, start, end)), end)
+        hits = []
+        for i in ids:
+            p = paths[i]
+            if (
+                kinds[i] == kind
+                and depths[i] <= max_depth
+                and included(p, include)
+                and not excluded(p, exclude)
+            ):
+                hits.append((p, depths[i] - base))
+                if len(hits) == page_size:
+                    break
+        return hits
+
+    def build_trigram_index(self) -> TrigramIndex:
+        """Build the trigram inverted index over the full cached paths.
+
+        It is pickled together with the cache, so literal :meth:`search` queries
+        only verify the paths sharing all trigrams of the keys instead of
+        scanning every cached path.
+        """
+        self.path_index = TrigramIndex(self.disk_list_cache)
+        return self.path_index
+
+    def search(
+        self,
+        and_key=None,
+        exclude_key=None,
+        use_regex=False,
+        exclude_logic="or",
+        extensions=None,
+        **kwargs,
+    ):
+        """
+        'key': the cached paths that contain all the 'key' are returned
+        'or_key': the cached paths that contain any of the 'or_key' are returned
+        'exclude_key': cached paths containing 'exclude_key' will be ignored
+        'use_regex' treat the keys as regular expressions, which always scans all paths
+        'exclude_logic' "or" to exclude paths matching any exclude key, "and" for all
+        'extensions' only paths ending with one of these, e.g. [".json", ".jsonl"]
+
+        :return the matched cached paths, in cache order
+        """
+        key = kwargs.pop("key", and_key)
+        or_key = kwargs.pop("or_key", "")
+        if or_key and isinstance(or_key, str):
+            or_key = [or_key]
+        if or_key and key:
+            raise ValueError("The key and or_key arg are contradictory!")
+
+        if or_key:
+            ids = set()
+            for k in or_key:
+                ids.update(
+                    self._search_ids(k, exclude_key, use_regex, exclude_logic, extensions)
+                )
+            ids = sorted(ids)
+        else:
+            ids = self._search_ids(key, exclude_key, use_regex, exclude_logic, extensions)
+        return [self.disk_list_cache[i] for i in ids]
+
+    def search_many(self, queries) -> list[list[str]]:
+        """
+        'queries' dicts of :meth:`search` arguments ('key', 'exclude_key', 'exclude_logic',
+            'extensions'; no 'or_key' or regexes)
+
+        :return the matched cached paths of every query; with ``engine="numpy"`` each
+            distinct key is matched once against all paths for the whole batch
+        """
+        paths = self.disk_list_cache
+        if self._engine == "numpy":
+            return [[paths[i] for i in ids] for ids in self.vector_index.match_many(queries)]
+        return [
+            [
+                paths[i]
+                for i in self._search_ids(
+                    q.get("key"),
+                    q.get("exclude_key"),
+                    False,
+                    q.get("exclude_logic", "or"),
+                    q.get("extensions"),
+                )
+            ]
+            for q in queries
+        ]
+
+    def _search_ids(self, key, exclude_key, use_regex, exclude_logic, extensions=None):
+        if self._engine == "numpy" and not use_regex:
+            return self.vector_index.match_ids(
+                key, exclude_key, exclude_logic, extensions
+            ).tolist()
+        ids = self._search_ids_python(key, exclude_key, use_regex, exclude_logic)
+        ext = _compile_extensions(extensions)
+        if ext is not None:
+            ids = [i for i in ids if ext.search(self.disk_list_cache[i])]
+        return ids
+
+    def _search_ids_python(self, key, exclude_key, use_regex, exclude_logic):
+        keys = [key] if isinstance(key, str) else list(key or [])
+        excludes = [exclude_key] if isinstance(exclude_key, str) else list(exclude_key or [])
+        paths = self.disk_list_cache
+        index = getattr(self, "path_index", None)
+
+        include = _compile_patterns(keys, use_regex, disable_alert=True)
+        exclude = _compile_patterns(excludes, use_regex, disable_alert=True)
+        if exclude_logic == "or":
+            excluded = _matches_any_exclude_or
+        else:
+            excluded = _matches_any_exclude_and
+        if use_regex or index is None:
+            return [
+                i
+                for i, p in enumerate(paths)
+                if _matches_all_include(p, include) and not excluded(p, exclude)
+            ]
+
+        # intersect the posting lists of the trigrams of all include keys ...
+        candidates = index.candidates(*[k for k in keys if k])
+        if candidates is None:
+            candidates = set(range(len(paths)))
+
+        # ... subtract the (verified) postings of selective exclude keys ...
+        if exclude_logic == "or":
+            for e, pattern in zip(excludes, exclude or ()):
+                estimate = index.estimate(e) if e else None
+                if estimate is not None and estimate < len(candidates):
+                    ids = index.candidates(e)
+                    candidates -= {i for i in ids if pattern.search(paths[i])}
+
+        # ... and verify the remaining candidates with the matchers of a scan
+        return [
+            i
+            for i in sorted(candidates)
+            if _matches_all_include(paths[i], include) and not excluded(paths[i], exclude)
+        ]
+
+    @property
+    def _engine(self) -> str:
+        return getattr(self, "kwargs", {}).get("engine", "python")
+
+    @property
+    def vector_index(self):
+        """The :class:`findfile.vectorized.PathArray` of ``engine="numpy"``, built on first use."""
+        if getattr(self, "_vector_index", None) is None:
+            from findfile.vectorized import PathArray
+
+            self._vector_index = PathArray(self.disk_list_cache)
+        return self._vector_index
+
+    @property
+    def name_index(self) -> NameIndex:
+        """Trigram index over the basenames of the cached paths, built on first use."""
+        if getattr(self, "_name_index", None) is None:
+            self._name_index = NameIndex(self.disk_list_cache)
+        return self._name_index
+
+    def rank(self, query, top_n=10, want=None):
+        """
+        'query': approximate basename of the target, e.g. 'cfg' for 'config.yaml'
+        'top_n' number of candidates to return
+        'want' "file", "dir" or None for both
+
+        :return a list of (path, score) pairs, best match first, score in [0, 1]
+        """
+        accept = None
+        if want in ("file", "dir"):
+            # the kind as indexed, found by position in the sorted cache: no stat per candidate
+            paths, kinds, is_dir = self.disk_list_cache, self.kinds, want == "dir"
+
+            def accept(path):
+                return bool(kinds[bisect_left(paths, path)]) == is_dir
+
+        return self.name_index.search(query, top_n=top_n, accept=accept)
 
     def __iter__(self):
         return iter(self.disk_list_cache)
@@ -97,24 +758,142 @@ class DiskCache(list):
         return len(self.disk_list_cache)
 
 
+_CACHE_NAME = ".findfile_disk_cache.pkl"  # kept out of results by __FINDFILE_IGNORE__
+_CACHE_FORMAT = "findfile-disk-cache"
+_CACHE_VERSION = 4
+
+
+def _is_within(path, directory) -> bool:
+    return path.startswith(directory.rstrip(os.sep) + os.sep)
+
+
+def _load_disk_cache(cache_file, header) -> DiskCache | None:
+    """The pickled cache if it is intact and its header agrees with *header*.
+
+    The file holds two pickles, the header dict and the :class:`DiskCache`, so
+    a stale cache is rejected before its (large) payload is unpickled. Missing,
+    truncated, corrupt, foreign-version or stale files all yield None. Only the
+    keys in *header* are compared: the caller decides about a different depth.
+    """
+    import pickle
+
+    try:
+        with open(cache_file, "rb") as fp:
+            stored = pickle.load(fp)
+            if not isinstance(stored, dict) or any(
+                stored.get(k) != v for k, v in header.items()
+            ):
+                return None
+            cache = pickle.load(fp)
+    except FileNotFoundError:
+        return None
+    except Exception:  # truncated or garbled pickles raise almost anything
+        return None
+    if not isinstance(cache, DiskCache) or not hasattr(cache, "dir_offsets"):
+        return None
+    return cache
+
+
+def _save_disk_cache(cache_file, cache, strict=False):
+    """Write a header and *cache* to a temp file, fsync it and rename it into place.
+
+    Readers see either the previous file or the complete new one, never a
+    partial write. An unwritable work dir leaves the cache in memory only,
+    unless *strict*: then the OSError is raised.
+    """
+    import pickle
+    import tempfile
+
+    directory = os.path.dirname(cache_file)
+    try:
+        fd, tmp = tempfile.mkstemp(
+            prefix=os.path.basename(cache_file) + ".", suffix=".tmp", dir=directory
+        )
+    except OSError:
+        if strict:
+            raise
+        return
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            header = dict(
+                cache.build_params,
+                format=_CACHE_FORMAT,
+                version=_CACHE_VERSION,
+                trigram_index=cache.path_index is not None,
+                created=time.time(),
+            )
+            pickle.dump(header, fp, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(cache, fp, pickle.HIGHEST_PROTOCOL)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp, cache_file)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        if strict:
+            raise
+        return
+    try:  # persist the rename itself
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except (OSError, AttributeError):
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+class _file_lock:
+    """Exclusive advisory lock on *path* (``fcntl.flock``), held for a ``with`` block.
+
+    Without ``fcntl`` (Windows) or a writable lock file this is a no-op; the
+    atomic rename in :func:`_save_disk_cache` still keeps readers safe, at the
+    cost of concurrent processes building the cache more than once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def __enter__(self):
+        try:
+            import fcntl
+        except ImportError:
+            return self
+        try:
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            return self
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        except OSError:
+            os.close(self.fd)
+            self.fd = None
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.fd is not None:
+            import fcntl
+
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
+
+
 class FileManager:
 
     def __init__(self, work_dir, **kwargs):
 
-        self.find_dir = find_dir
-        self.find_dirs = find_dirs
-        self.find_file = find_file
-        self.find_files = find_files
         self.rm_dir = rm_dir
         self.rm_dirs = rm_dirs
         self.rm_file = rm_file
         self.rm_files = rm_files
         self.rm_cwd_dirs = rm_cwd_dirs
         self.rm_cwd_files = rm_cwd_files
-        self.find_cwd_dir = find_cwd_dir
-        self.find_cwd_dirs = find_cwd_dirs
-        self.find_cwd_file = find_cwd_file
-        self.find_cwd_files = find_cwd_files
 
         self.__FINDFILE_IGNORE__ = __FINDFILE_IGNORE__
 
@@ -125,17 +904,328 @@ class FileManager:
         # Use a stable cache file inside the work directory
         cache_file = None
         if self.work_dir and os.path.isdir(self.work_dir):
-            cache_file = os.path.join(self.work_dir, ".findfile_disk_cache.pkl")
+            cache_file = os.path.join(self.work_dir, _CACHE_NAME)
 
-        # Build or load cache
-        if cache_file and os.path.isfile(cache_file):
-            with open(cache_file, "rb") as fp:
-                self.disk_cache = pickle.load(fp)
-        else:
+        # the dir mtimes tell whether the tree changed since the cache was built
+        kwargs = dict(kwargs, track_mtimes=True)
+        self.disk_cache = None
+        if cache_file is None:
             self.disk_cache = DiskCache(self.work_dir, **kwargs)
-            if cache_file:
-                with open(cache_file, "wb") as fp:
-                    pickle.dump(self.disk_cache, fp)
+            return
+
+        recursive = 5 if self.recursive is True else int(self.recursive)
+        header = {
+            "format": _CACHE_FORMAT,
+            "version": _CACHE_VERSION,
+            "root": self.work_dir,
+            "ignore": sorted(__FINDFILE_IGNORE__),
+            **_result_options(kwargs),
+        }
+        # Fast path without the lock; otherwise one process builds (or deepens, or
+        # re-lists the changed dirs) while the others wait on the lock and then
+        # load what it wrote.
+        cache, stale = self._refreshed(_load_disk_cache(cache_file, header))
+        if stale or self._needs_update(cache, recursive, kwargs):
+            with _file_lock(cache_file + ".lock"):
+                cache, stale = self._refreshed(_load_disk_cache(cache_file, header))
+                if cache is None:
+                    cache = DiskCache(self.work_dir, **kwargs)
+                    _save_disk_cache(cache_file, cache)
+                elif stale or self._needs_update(cache, recursive, kwargs):
+                    cache.deepen(recursive)
+                    if kwargs.get("trigram_index", False) and cache.path_index is None:
+                        cache.kwargs["trigram_index"] = True
+                        cache.build_trigram_index()
+                    _save_disk_cache(cache_file, cache)
+        # a deeper cache on disk serves shallower requests as a filtered view
+        self.disk_cache = cache.view(recursive)
+        if "engine" in kwargs:  # a per-process choice, not part of the cached data
+            self.disk_cache.kwargs = dict(self.disk_cache.kwargs, engine=kwargs["engine"])
+
+    @staticmethod
+    def _refreshed(cache):
+        """*cache* with its changed dirs listed again, and whether an entry changed.
+
+        A cache saved without dir mtimes counts as missing. Saving moves the
+        mtime of the work dir holding the cache file, so an mtime that moved
+        on its own is updated in memory but not worth saving again.
+        """
+        if cache is None or getattr(cache, "listed_dirs", None) is None:
+            return None, True
+        fresh = cache.relisted(cache.changed_dirs())
+        return fresh, fresh.disk_list_cache is not cache.disk_list_cache
+
+    @staticmethod
+    def _needs_update(cache, recursive, kwargs) -> bool:
+        if cache is None or cache.recursive < recursive:
+            return True
+        return bool(kwargs.get("trigram_index", False)) and cache.path_index is None
+
+    def _serves(self, root, recursive) -> bool:
+        """Whether the disk cache covers a query, once the changed dirs it reads are re-listed."""
+        if not self.disk_cache.covers(root, recursive):
+            return False
+        changed = self.disk_cache.changed_dirs(root, recursive)
+        if changed:
+            self.disk_cache = self.disk_cache.relisted(changed)
+        return self.disk_cache.covers(root, recursive)
+
+    def _find(self, want, search_path=None, key=None, **kwargs) -> list[str]:
+        """Answer one query from the disk cache, or walk the disk if it is not covered."""
+        recursive = kwargs.pop("recursive", 5)
+        if recursive is True:
+            recursive = 5
+        if recursive is False:
+            recursive = 0
+        known = {"exclude_key", "use_regex", "exclude_logic"}
+        known |= {"return_relative_path", "return_deepest_path", "disable_alert"}
+        known |= set(_WALK_OPTIONS)
+        root = Path(search_path or Path.cwd()).expanduser().resolve()
+        if (
+            not set(kwargs) - {"stats"} <= known
+            or not self.disk_cache.walked_like(**kwargs)
+            or not self._serves(root, int(recursive))
+        ):
+            return _find(
+                search_path=search_path,
+                key=key,
+                recursive=recursive,
+                want=want,
+                **kwargs,
+            )
+
+        stats = _stats_for(kwargs.pop("stats", None))
+        started = time.perf_counter()
+
+        exclude_key = kwargs.get("exclude_key")
+        if isinstance(exclude_key, str):
+            exclude_key = [exclude_key]
+        hits = self.disk_cache.query(
+            root,
+            want=want,
+            key=key,
+            exclude_key=(exclude_key or []) + list(__FINDFILE_IGNORE__),
+            use_regex=kwargs.get("use_regex", False),
+            recursive=int(recursive),
+            exclude_logic=kwargs.get("exclude_logic", "or"),
+        )
+        t = time.perf_counter()
+        results = _finalize(
+            hits,
+            kwargs.get("return_relative_path", True),
+            kwargs.get("return_deepest_path", False),
+        )
+        if stats is not None:
+            stats.calls += 1
+            stats.cache_hits += 1
+            stats.matches += len(hits)
+            stats.match_time += t - started
+            stats.postprocess_time += time.perf_counter() - t
+            stats.total_time += time.perf_counter() - started
+            stats.query = {"search_path": str(root), "want": want, "key": key}
+            _emit_stats(stats)
+        return results
+
+    def _find_all(self, want, search_path, and_key, **kwargs) -> list[str]:
+        key = kwargs.pop("key", and_key)
+        or_key = kwargs.pop("or_key", "")
+        if or_key and isinstance(or_key, str):
+            or_key = [or_key]
+        if or_key:
+            if or_key and key:
+                raise ValueError("The key and or_key arg are contradictory!")
+            _reject_budget(kwargs, "or_key")
+            res = []
+            for key in or_key:
+                res += self._find(want, search_path, key=key, **kwargs)
+            return res
+        return self._find(want, search_path, key=key, **kwargs)
+
+    def _find_page(self, want, search_path, and_key, exclude_key, page_size, cursor, **kwargs):
+        """One page from the disk cache when it covers the query, else from a sorted walk."""
+        from findfile.paging import _find_page, _page_result
+
+        key = kwargs.pop("key", and_key)
+        or_key = kwargs.pop("or_key", None)
+        if key and or_key:
+            raise ValueError("The key and or_key arg are contradictory!")
+        recursive = kwargs.get("recursive", 5)
+        recursive = 5 if recursive is True else 0 if recursive is False else int(recursive)
+        known = {"use_regex", "exclude_logic", "recursive", "return_relative_path"}
+        known |= {"disable_alert", "one_file_system", "skip_fstypes"}
+        root = Path(search_path or Path.cwd()).expanduser().resolve()
+        if (
+            page_size < 1
+            or not set(kwargs) - {"stats"} <= known
+            or not self.disk_cache.walked_like(**kwargs)
+            or not self._serves(root, recursive)
+        ):
+            return _find_page(
+                want,
+                search_path,
+                key,
+                exclude_key,
+                page_size=page_size,
+                cursor=cursor,
+                or_key=or_key,
+                **kwargs,
+            )
+        stats = _stats_for(kwargs.get("stats"))
+        started = time.perf_counter()
+        if isinstance(exclude_key, str):
+            exclude_key = [exclude_key]
+        if isinstance(or_key, str):
+            or_key = [or_key]
+        hits = self.disk_cache.query_page(
+            root,
+            want=want,
+            key=or_key or key,
+            exclude_key=(exclude_key or []) + list(__FINDFILE_IGNORE__),
+            use_regex=kwargs.get("use_regex", False),
+            recursive=recursive,
+            exclude_logic=kwargs.get("exclude_logic", "or"),
+            page_size=page_size,
+            after=cursor,
+            include_logic="or" if or_key else "and",
+        )
+        if stats is not None:
+            stats.cache_hits += 1
+        return _page_result(
+            hits,
+            page_size,
+            kwargs.get("return_relative_path", True),
+            stats,
+            started,
+            root,
+            want,
+        )
+
+    def find_files_page(
+        self,
+        search_path=None,
+        and_key=None,
+        exclude_key=None,
+        page_size=1000,
+        cursor=None,
+        **kwargs,
+    ):
+        """See :func:`findfile.find_files_page`; served by seeking in the disk cache."""
+        return self._find_page(
+            "file", search_path, and_key, exclude_key, page_size, cursor, **kwargs
+        )
+
+    def find_dirs_page(
+        self,
+        search_path=None,
+        and_key=None,
+        exclude_key=None,
+        page_size=1000,
+        cursor=None,
+        **kwargs,
+    ):
+        """See :func:`findfile.find_dirs_page`; served by seeking in the disk cache."""
+        return self._find_page(
+            "dir", search_path, and_key, exclude_key, page_size, cursor, **kwargs
+        )
+
+    def find_file(
+        self,
+        search_path=None,
+        and_key=None,
+        exclude_key=None,
+        return_deepest_path=False,
+        disable_alert=False,
+        **kwargs,
+    ):
+        """
+        Same as :func:`findfile.find_file`, but answered from the disk cache when
+        'search_path' lies inside the work dir and within the cached depth.
+        """
+        _reject_budget(kwargs, "find_file(), which picks one path")
+        res = self._find_all(
+            "file",
+            search_path,
+            and_key,
+            exclude_key=exclude_key,
+            return_deepest_path=return_deepest_path,
+            disable_alert=disable_alert,
+            **kwargs,
+        )
+        return _select_target(res, return_deepest_path, disable_alert)
+
+    def find_files(self, search_path=None, and_key=None, exclude_key=None, **kwargs):
+        """
+        Same as :func:`findfile.find_files`, but answered from the disk cache when
+        'search_path' lies inside the work dir and within the cached depth.
+        Cached results come in sorted path order.
+        """
+        if kwargs.get("return_deepest_path", False):
+            raise ValueError(
+                "return_deepest_path is not supported in find_files() which return all the results."
+            )
+        return self._find_all("file", search_path, and_key, exclude_key=exclude_key, **kwargs)
+
+    def find_dir(
+        self,
+        search_path=None,
+        and_key=None,
+        exclude_key=None,
+        return_deepest_path=False,
+        disable_alert=False,
+        **kwargs,
+    ):
+        """Same as :func:`findfile.find_dir`, see :meth:`find_file`."""
+        _reject_budget(kwargs, "find_dir(), which picks one path")
+        res = self._find_all(
+            "dir",
+            search_path,
+            and_key,
+            exclude_key=exclude_key,
+            return_deepest_path=return_deepest_path,
+            **kwargs,
+        )
+        return _select_target(res, return_deepest_path, disable_alert)
+
+    def find_dirs(self, search_path=None, and_key=None, exclude_key=None, **kwargs):
+        """Same as :func:`findfile.find_dirs`, see :meth:`find_files`."""
+        if kwargs.get("return_deepest_path", False):
+            raise ValueError(
+                "return_deepest_path is not supported in find_dirs() which return all the results."
+            )
+        return_leaf_only = kwargs.pop("return_leaf_only", True)
+        if return_leaf_only:
+            _reject_budget(kwargs, "return_leaf_only")
+        res = self._find_all("dir", search_path, and_key, exclude_key=exclude_key, **kwargs)
+        return _filter_leaf_dirs(res) if return_leaf_only else res
+
+    def find_cwd_file(self, and_key=None, exclude_key=None, **kwargs):
+        """Same as :func:`findfile.find_cwd_file`, see :meth:`find_file`."""
+        return self.find_file(os.getcwd(), and_key, exclude_key, **kwargs)
+
+    def find_cwd_files(self, and_key=None, exclude_key=None, **kwargs):
+        """Same as :func:`findfile.find_cwd_files`, see :meth:`find_files`."""
+        if kwargs.get("return_deepest_path", False):
+            raise ValueError(
+                "return_deepest_path is not supported in find_cwd_files() which return all the results."
+            )
+        return self.find_files(os.getcwd(), and_key, exclude_key, **kwargs)
+
+    def find_cwd_dir(self, and_key=None, exclude_key=None, **kwargs):
+        """Same as :func:`findfile.find_cwd_dir`, see :meth:`find_file`."""
+        return self.find_dir(os.getcwd(), and_key, exclude_key, **kwargs)
+
+    def find_cwd_dirs(self, and_key=None, exclude_key=None, **kwargs):
+        """Same as :func:`findfile.find_cwd_dirs`, see :meth:`find_files`."""
+        if kwargs.get("return_deepest_path", False):
+            raise ValueError(
+                "return_deepest_path is not supported in find_cwd_dirs() which return all the results."
+            )
+        return self.find_dirs(os.getcwd(), and_key, exclude_key, **kwargs)
+
+    def find_ranked(self, query, top_n=10, want=None):
+        """Rank the cached paths by basename similarity to *query*, see :meth:`DiskCache.rank`."""
+        self._serves(self.disk_cache.work_dir, self.disk_cache.recursive)
+        return self.disk_cache.rank(query, top_n=top_n, want=want)
 
     def readlines(self, file_type=None, mode="r", encoding="utf-8", **kwargs):
         if file_type is None:
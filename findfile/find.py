@@ -6,19 +6,23 @@
 # Copyright (C) 2021. All Rights Reserved.
 import os
 import re
-import shutil
-import warnings
+import time
 from collections import deque
-from functools import reduce
+from collections.abc import Iterator, Sequence
 from pathlib import Path
-from typing import Iterator, Sequence, Union
 
+from findfile.query_cache import _QUERY_CACHE, _query_cache_enabled, _root_anchor
+from findfile.stats import FindStats, _CountingPattern, _emit_stats, _stats_for
 
-from termcolor import colored
+# the FileManager cache file, its ".lock" and its ".tmp" files are never results
+__FINDFILE_IGNORE__ = [".FFIGNORE", ".ffignore", ".ffi", ".FFI", ".findfile_disk_cache"]
 
-__FINDFILE_IGNORE__ = [".FFIGNORE", ".ffignore", ".ffi", ".FFI"]
 
-warnings.filterwarnings("once")
+def colored(text, *args, **kwargs):
+    """``termcolor.colored``, imported on first use to keep ``import findfile`` cheap."""
+    from termcolor import colored as _colored
+
+    return _colored(text, *args, **kwargs)
 
 
 def accessible(search_path):
@@ -64,6 +68,8 @@ def _compile_patterns(
                 compiled.append(re.compile(re.escape(p), flags=re.IGNORECASE))
         except re.error as exc:
             if not disable_alert:
+                import warnings
+
                 warnings.warn(
                     f"Pattern '{p}' could not be compiled: {exc}. Falling back to substring search.",
                     RuntimeWarning,
@@ -72,6 +78,17 @@ def _compile_patterns(
     return compiled
 
 
+def _compile_extensions(extensions: Sequence[str] | str | None) -> re.Pattern | None:
+    """One case‑insensitive pattern matching paths that end with any of *extensions*."""
+    if not extensions:
+        return None
+    if isinstance(extensions, str):
+        extensions = [extensions]
+    return re.compile(
+        "(?:{})\\Z".format("|".join(map(re.escape, extensions))), flags=re.IGNORECASE
+    )
+
+
 # MODIFIED: Split matching logic into separate functions for include and exclude
 def _matches_any_include(path: Path, patterns: list[re.Pattern] | None) -> bool:
     """Check if path matches any include pattern (OR logic)."""
@@ -125,41 +142,880 @@ def _iter_paths(
     exclude: list[re.Pattern] | None,
     max_depth: int,
     exclude_logic: str = "or",  # NEW PARAMETER
-) -> Iterator[Path]:
-    """Breadth‑first traversal that stops at *max_depth* (0 means only *root* itself)."""
+    listed: list | None = None,
+    stats: FindStats | None = None,
+    include_logic: str = "and",
+    glob: str | None = None,
+    backend=None,
+    **walk_options,
+) -> Iterator[tuple[str, int]]:
+    """Breadth‑first traversal that stops at *max_depth* (0 means only *root* itself).
+
+    Yields ``(path, depth)`` with *depth* relative to *root*, so post-processing
+    needs neither ``Path`` objects nor ``getcwd`` calls per result.
+    When *listed* is a list, ``(dir, st_mtime_ns)`` is appended for every directory
+    listed so that the result can later be validated by the query cache.
+    *stats* is filled in when given; the untimed loop is used otherwise.
+    *include_logic* "or" matches paths that contain any instead of all include keys.
+    *walk_options* (symlink, mount and thread options) are passed to :func:`_walk`.
+    *glob* walks only the entries matching that pattern, see :mod:`findfile.globbing`.
+    A :class:`findfile.backends.Backend` *backend* walks instead of the local walk.
+    """
+    if want not in ("file", "dir"):
+        return
+    want_dir = want == "dir"
+    included = _matches_any_include if include_logic == "or" else _matches_all_include
+    if exclude_logic == "or":
+        excluded = _matches_any_exclude_or
+    else:  # "and" or any other value defaults to original behavior
+        excluded = _matches_any_exclude_and
+
+    if backend is not None:
+        if glob is not None:
+            raise ValueError("glob queries need the local walk, not a backend")
+        entries = backend.walk(root, max_depth, listed=listed, stats=stats, **walk_options)
+    elif glob is not None:
+        from findfile.globbing import _walk_glob
+
+        unsupported = sorted(
+            k for k, v in walk_options.items() if v and k not in ("follow_symlinks", "strategy")
+        )
+        if unsupported or walk_options.get("strategy", "bfs") != "bfs":
+            raise ValueError(
+                "glob queries do not support: {}".format(unsupported or ["strategy"])
+            )
+        entries = _walk_glob(
+            root,
+            glob,
+            max_depth,
+            listed=listed,
+            stats=stats,
+            follow_symlinks=bool(walk_options.get("follow_symlinks")),
+        )
+    else:
+        entries = _walk(root, max_depth, listed=listed, stats=stats, **walk_options)
+    if stats is None:
+        for path, depth, is_dir in entries:
+            if (
+                is_dir == want_dir
+                and included(path, include)
+                and not excluded(path, exclude)
+            ):
+                yield path, depth
+        return
+
+    clock = time.perf_counter
+    start = clock()
+    match_time = 0.0
+    for path, depth, is_dir in entries:
+        if is_dir == want_dir:
+            t = clock()
+            matched = included(path, include) and not excluded(path, exclude)
+            match_time += clock() - t
+            if matched:
+                stats.matches += 1
+                yield path, depth
+    stats.match_time += match_time
+    stats.walk_time += clock() - start - match_time
+
+
+# Pseudo and remote filesystems skipped by ``skip_fstypes=True``
+DEFAULT_SKIP_FSTYPES = (
+    "proc",
+    "sysfs",
+    "devtmpfs",
+    "devpts",
+    "cgroup",
+    "cgroup2",
+    "debugfs",
+    "tracefs",
+    "securityfs",
+    "pstore",
+    "bpf",
+    "configfs",
+    "fusectl",
+    "mqueue",
+    "hugetlbfs",
+    "autofs",
+    "binfmt_misc",
+    "nfs",
+    "nfs4",
+    "cifs",
+    "smb3",
+    "fuse",
+)
+
+
+def _mount_fstypes() -> dict[str, str]:
+    """Mount point -> filesystem type from ``/proc/self/mountinfo`` ({} elsewhere)."""
+    try:
+        with open("/proc/self/mountinfo", encoding="utf-8", errors="surrogateescape") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return {}
+    unescape = re.compile(r"\\([0-7]{3})")
+    mounts = {}
+    for line in lines:
+        # id parent major:minor root mount_point options [optional...] - fstype source ...
+        fields = line.split(" ")
+        try:
+            sep = fields.index("-", 6)
+        except ValueError:
+            continue
+        mount_point = unescape.sub(lambda m: chr(int(m.group(1), 8)), fields[4])
+        mounts[mount_point] = fields[sep + 1]  # a later mount hides an earlier one
+    return mounts
+
+
+def _fstypes(skip_fstypes) -> tuple[str, ...]:
+    """Normalized *skip_fstypes*: *True* means :data:`DEFAULT_SKIP_FSTYPES`."""
+    if not skip_fstypes:
+        return ()
+    if skip_fstypes is True:
+        skip_fstypes = DEFAULT_SKIP_FSTYPES
+    elif isinstance(skip_fstypes, str):
+        skip_fstypes = [skip_fstypes]
+    return tuple(sorted(set(skip_fstypes)))
+
+
+def _skipped_mounts(skip_fstypes) -> set[str]:
+    """Mount points whose type (or its ``fuse.*``-style family) is in *skip_fstypes*."""
+    skip = set(_fstypes(skip_fstypes))
+    return {
+        mount_point
+        for mount_point, fstype in _mount_fstypes().items()
+        if fstype in skip or fstype.split(".", 1)[0] in skip
+    }
+
+
+class FindCursor:
+    """Where a budgeted search stopped: pass it back as ``cursor=`` to continue.
+
+    Holds the query it belongs to, the directories not yet listed as
+    ``(path, depth)`` and the cycle/duplicate/device state of the walk, so the
+    resumed walk reports exactly the entries the first one did not.
+    """
+
+    __slots__ = ("query", "frontier", "walk_state")
 
-    queue: deque[tuple[Path, int]] = deque([(root, 0)])
+    def __init__(self, query, frontier, walk_state):
+        self.query = query
+        self.frontier = tuple(frontier)
+        self.walk_state = walk_state
+
+    def __repr__(self):
+        return "FindCursor({} dirs pending)".format(len(self.frontier))
+
+
+class FindResult(list):
+    """The matches of a budgeted search or of one page; ``cursor`` is None once complete.
+
+    The cursor is a :class:`FindCursor` for budgets and the last absolute path
+    for the pages of :func:`findfile.find_files_page`.
+    """
+
+    def __init__(self, paths=(), cursor: FindCursor | str | None = None):
+        super().__init__(paths)
+        self.cursor = cursor
+
+    @property
+    def complete(self) -> bool:
+        return self.cursor is None
+
+
+class _Budget:
+    """*timeout* seconds and *max_entries* visited entries for one :func:`_walk`.
+
+    Checked between directory listings, so a walk overshoots by at most one
+    directory. When exhausted, :func:`_walk` leaves the pending queue and its
+    state in ``frontier``/``walk_state``; a *resume* cursor starts from those.
+    """
+
+    def __init__(self, timeout=None, max_entries=None, resume: FindCursor | None = None):
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.max_entries = max_entries
+        self.resume = resume
+        self.entries = 0
+        self.frontier = None
+        self.walk_state = None
+
+    def exhausted(self) -> bool:
+        if self.max_entries is not None and self.entries >= self.max_entries:
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+
+def _walk(
+    root: Path,
+    max_depth: int,
+    listed: list | None = None,
+    stats: FindStats | None = None,
+    follow_symlinks: bool = False,
+    dedupe_targets: bool = False,
+    one_file_system: bool = False,
+    skip_fstypes: Sequence[str] | bool | None = None,
+    workers: int | None = None,
+    listing_timeout: float | None = None,
+    strategy: str = "bfs",
+    budget: _Budget | None = None,
+    throttle=None,
+) -> Iterator[tuple[str, int, bool]]:
+    """Breadth‑first ``os.scandir`` walk yielding ``(path, depth, is_dir)``.
+
+    *root* itself comes first at depth 0; symlinks and entries that are neither
+    regular files nor dirs (sockets, fifos) are skipped, and directories are
+    listed only while their depth is below *max_depth*. The ``DirEntry`` type
+    cache is used, so no extra ``stat`` is needed per entry on most filesystems.
+
+    With *follow_symlinks*, links are resolved (broken ones skipped) and every
+    directory is stat'ed. A link to a path the walk reaches anyway (under the
+    real *root* and within *max_depth*) is reported but not descended, so its
+    subtree comes under its real path only; other directories whose
+    ``(st_dev, st_ino)`` was already listed are reported but not descended,
+    which breaks cycles and lists a subtree outside *root* shared by several
+    links only once, under the link seen first. *dedupe_targets* also reports
+    each ``(st_dev, st_ino)`` only once, so a target is found under one path
+    however many links point to it: its real path when the walk reaches it.
+
+    Directories on another device than *root* (*one_file_system*, one stat per
+    dir) and mount points whose filesystem type is in *skip_fstypes* (*True*
+    for :data:`DEFAULT_SKIP_FSTYPES`; matched by path, no stat) are reported
+    but not descended. *workers* lists directories in that many threads and
+    *listing_timeout* abandons a directory whose listing takes longer, see
+    :func:`_walk_threaded`; entries then come in completion order.
+
+    *strategy* "dfs" walks depth-first instead, see :func:`_walk_dfs`: the same
+    entries in pre-order, with memory bounded by the depth instead of the
+    width of the tree.
+
+    A *budget* stops the walk between two listings once it is exhausted and
+    records the pending directories; with ``budget.resume`` the walk continues
+    from such a cursor instead of starting at *root* (breadth-first only).
+    A :class:`findfile.Throttle` *throttle* paces the listings of any strategy;
+    with ``low_priority`` they run on a walker thread, never the caller's.
+    """
+    if strategy not in ("bfs", "dfs"):
+        raise ValueError("strategy must be 'bfs' or 'dfs', not {!r}".format(strategy))
+    if strategy == "dfs" and (workers or listing_timeout):
+        raise ValueError("strategy='dfs' cannot be combined with workers/listing_timeout")
+    if budget is not None and (strategy != "bfs" or workers or listing_timeout):
+        raise ValueError("timeout/max_entries budgets need the plain breadth-first walk")
+    # the listings would lower the caller's own thread for good: make them elsewhere
+    on_thread = _on_worker_thread if throttle is not None and throttle.low_priority else iter
+    resume = budget.resume if budget is not None else None
+    if resume is not None:
+        # a cursor can be resumed any number of times: walk on copies of its seen sets
+        walk_state = {
+            k: set(v) if isinstance(v, set) else v for k, v in resume.walk_state.items()
+        }
+        yield from on_thread(
+            _walk_bfs(
+                list(resume.frontier),
+                max_depth,
+                listed,
+                stats,
+                follow_symlinks,
+                budget,
+                throttle,
+                **walk_state,
+            )
+        )
+        return
+    if stats is not None:
+        stats.stat_calls += 3  # exists, is_symlink, is_dir (+ is_file for a file root)
+        stats.entries_visited += 1
+    if not root.exists() or max_depth < 0:
+        return
+    if root.is_symlink() and not follow_symlinks:
+        return
+    root_is_dir = root.is_dir()
+    if not root_is_dir:
+        if stats is not None:
+            stats.stat_calls += 1
+        if not root.is_file():
+            return
+    yield str(root), 0, root_is_dir
+    if not root_is_dir:
+        return
+
+    # (st_dev, st_ino) of the dirs queued so far, and of the targets reported
+    seen_dirs = seen_targets = None
+    root_dev = None
+    if follow_symlinks or one_file_system or dedupe_targets:
+        st = root.stat()
+        seen_dirs = {(st.st_dev, st.st_ino)} if follow_symlinks else None
+        seen_targets = {(st.st_dev, st.st_ino)} if dedupe_targets else None
+        root_dev = st.st_dev if one_file_system else None
+    skip_mounts = _skipped_mounts(skip_fstypes) if skip_fstypes else None
+    walk_state = {
+        "seen_dirs": seen_dirs,
+        "seen_targets": seen_targets,
+        "root_dev": root_dev,
+        "skip_mounts": skip_mounts,
+        "real_root": os.path.realpath(root) if follow_symlinks else None,
+    }
+    if strategy == "bfs" and not (workers or listing_timeout):
+        yield from on_thread(
+            _walk_bfs(
+                [(str(root), 0)],
+                max_depth,
+                listed,
+                stats,
+                follow_symlinks,
+                budget,
+                throttle,
+                **walk_state,
+            )
+        )
+        return
+    admit, needs_stat = _admission(follow_symlinks, max_depth=max_depth, **walk_state)
+
+    if strategy == "dfs":
+        yield from on_thread(
+            _walk_dfs(
+                str(root),
+                max_depth,
+                listed,
+                stats,
+                follow_symlinks,
+                admit,
+                needs_stat,
+                throttle,
+            )
+        )
+        return
+    yield from _walk_threaded(
+        str(root),
+        max_depth,
+        listed,
+        stats,
+        follow_symlinks,
+        admit,
+        needs_stat,
+        workers or 1,
+        listing_timeout,
+        throttle,
+    )
+
+
+def _admission(
+    follow_symlinks, seen_dirs, seen_targets, root_dev, skip_mounts, real_root=None, max_depth=0
+):
+    """``(admit, needs_stat)`` of the careful walk, or ``(None, needs_stat)``.
+
+    ``admit(path, is_dir, st, depth, is_link)`` returns ``(report, descend)``
+    for an entry at *depth* that passed the type checks and updates the seen
+    sets; it is None when no option needs it, which keeps the plain walk free
+    of per-entry calls.
+
+    A link whose target lies under *real_root* within *max_depth* is an alias
+    of a path the walk reaches anyway: it is reported (unless *seen_targets*
+    dedupes it) but never descended, so a subtree is always listed under its
+    real path, whichever of the two ``scandir`` yields first, and the seen
+    sets only ever hold real paths or targets out of the walk's reach.
+    """
+    stat_dirs = follow_symlinks or root_dev is not None
+    careful = stat_dirs or seen_targets is not None or bool(skip_mounts)
+    inside = real_root.rstrip(os.sep) + os.sep if real_root is not None else None
+
+    def reached_anyway(path, is_dir) -> bool:
+        target = os.path.realpath(path)
+        if target == real_root:
+            return True
+        if not target.startswith(inside):
+            return False
+        depth = target.count(os.sep) - inside.count(os.sep) + 1
+        # a dir counts once it is listed, a file once it is reported
+        return depth < max_depth if is_dir else depth <= max_depth
+
+    def admit(path, is_dir, st, depth=0, is_link=False):
+        """``(report, descend)`` for an entry that passed the type checks."""
+        if is_link and inside is not None and reached_anyway(path, is_dir):
+            return seen_targets is None, False
+        if seen_targets is not None:
+            target = (st.st_dev, st.st_ino)
+            if target in seen_targets:
+                return False, False
+            seen_targets.add(target)
+        if not is_dir:
+            return True, False
+        if skip_mounts and path in skip_mounts:
+            return True, False
+        if root_dev is not None and st.st_dev != root_dev:
+            return True, False
+        if seen_dirs is not None:
+            target = (st.st_dev, st.st_ino)
+            if target in seen_dirs:
+                return True, False
+            seen_dirs.add(target)
+        return True, True
+
+    def needs_stat(is_dir):
+        return seen_targets is not None or (is_dir and stat_dirs)
+
+    return (admit if careful else None), needs_stat
+
+
+def _walk_bfs(
+    frontier, max_depth, listed, stats, follow_symlinks, budget, throttle, **walk_state
+) -> Iterator[tuple[str, int, bool]]:
+    """The breadth‑first listing loop of :func:`_walk`, from the ``(dir, depth)`` *frontier*."""
+    admit, needs_stat = _admission(follow_symlinks, max_depth=max_depth, **walk_state)
+    careful = admit is not None
+    clock = time.perf_counter
+    queue: deque[tuple[str, int]] = deque(frontier)
     while queue:
+        if budget is not None and budget.exhausted():
+            budget.frontier = list(queue)
+            budget.walk_state = walk_state
+            return
         current, depth = queue.popleft()
+        if depth >= max_depth:
+            if stats is not None:
+                stats.entries_pruned += 1
+            continue
+        visited = pruned = stat_calls = 0
+        if throttle is not None:
+            slept = throttle.before_listing()
+            if stats is not None:
+                stats.throttle_sleep += slept
+        timed = stats is not None or throttle is not None
+        started = seconds = clock() if timed else 0.0
         try:
-            if not current.exists() or current.is_symlink():
-                continue  # skip broken links / non‑existent entries
+            if listed is not None:
+                # stat before listing: a concurrent change then shows up as a mismatch
+                listed.append((current, os.stat(current).st_mtime_ns))
+            with os.scandir(current) as it:
+                if timed:
+                    # list eagerly so the timing excludes what consumers do per entry
+                    it = list(it)
+                    seconds = clock()
+                    if stats is not None:
+                        stats.record_listing(current, seconds - started)
+                for entry in it:
+                    visited += 1
+                    is_link = entry.is_symlink()
+                    if is_link and not follow_symlinks:
+                        pruned += 1
+                        continue
+                    try:
+                        is_dir = entry.is_dir()  # follows links, stat'ing them
+                        if not is_dir and not entry.is_file():
+                            pruned += 1
+                            continue
+                        descend = is_dir
+                        if careful:
+                            st = None
+                            if needs_stat(is_dir):
+                                st = entry.stat()
+                                stat_calls += 1
+                            report, descend = admit(entry.path, is_dir, st, depth + 1, is_link)
+                            if not report:
+                                pruned += 1
+                                continue
+                    except OSError:  # broken link or vanished entry
+                        pruned += 1
+                        continue
+                    yield entry.path, depth + 1, is_dir
+                    if descend:
+                        queue.append((entry.path, depth + 1))
+        except OSError:
+            # Silently ignore unreadable or vanished directories
+            continue
+        finally:
+            if budget is not None:
+                budget.entries += visited
+            if throttle is not None:
+                slept = throttle.after_listing(
+                    seconds - started, stat_calls + (listed is not None), visited
+                )
+                if stats is not None:
+                    stats.throttle_sleep += slept
+            if stats is not None:
+                stats.dirs_listed += 1
+                stats.entries_visited += visited
+                stats.entries_pruned += pruned
+                stats.stat_calls += stat_calls + (listed is not None)
+
+
+def _walk_dfs(
+    root, max_depth, listed, stats, follow_symlinks, admit, needs_stat, throttle=None
+) -> Iterator[tuple[str, int, bool]]:
+    """The listing loop of :func:`_walk`, depth-first over a stack of open iterators.
+
+    Entries come in pre-order: a directory right before its subtree, siblings
+    in ``scandir`` order. Nothing is queued per entry; the stack holds one
+    ``scandir`` iterator (and one open file descriptor) per level being walked,
+    so memory is O(depth) however wide the tree is, where the breadth-first
+    queue holds every not yet listed directory of the next level. The depth
+    limit, the skip rules and the set of entries are the same as breadth-first;
+    with *follow_symlinks*, a subtree outside the walk's reach that is shared
+    by several links is reported under the link met first in this order.
+    """
+    clock = time.perf_counter
+    timed = stats is not None or throttle is not None
+    stack = []  # [path, depth, iterator, listing seconds so far, stat calls, entries]
+
+    def push(path, depth):
+        if throttle is not None:
+            slept = throttle.before_listing()
+            if stats is not None:
+                stats.throttle_sleep += slept
+        started = clock() if timed else 0.0
+        try:
+            if listed is not None:
+                listed.append((path, os.stat(path).st_mtime_ns))
+            it = os.scandir(path)
+        except OSError:
+            return
+        if stats is not None:
+            stats.dirs_listed += 1
+            stats.stat_calls += listed is not None
+        stack.append(
+            [path, depth, it, clock() - started if timed else 0.0, listed is not None, 0]
+        )
 
-            if depth > max_depth:
+    if max_depth > 0:
+        push(root, 0)
+    elif stats is not None:
+        stats.entries_pruned += 1
+    try:
+        while stack:
+            frame = stack[-1]
+            depth = frame[1]
+            started = clock() if timed else 0.0
+            try:
+                entry = next(frame[2], None)
+            except OSError:
+                entry = None
+            if timed:
+                frame[3] += clock() - started
+            if entry is None:
+                stack.pop()
+                frame[2].close()
+                if stats is not None:
+                    stats.record_listing(frame[0], frame[3])
+                if throttle is not None:
+                    slept = throttle.after_listing(frame[3], frame[4], frame[5])
+                    if stats is not None:
+                        stats.throttle_sleep += slept
+                continue
+            frame[5] += 1
+            if stats is not None:
+                stats.entries_visited += 1
+            is_link = entry.is_symlink()
+            if is_link and not follow_symlinks:
+                if stats is not None:
+                    stats.entries_pruned += 1
+                continue
+            try:
+                is_dir = entry.is_dir()
+                if not is_dir and not entry.is_file():
+                    if stats is not None:
+                        stats.entries_pruned += 1
+                    continue
+                descend = is_dir
+                if admit is not None:
+                    st = None
+                    if needs_stat(is_dir):
+                        st = entry.stat()
+                        frame[4] += 1
+                        if stats is not None:
+                            stats.stat_calls += 1
+                    report, descend = admit(entry.path, is_dir, st, depth + 1, is_link)
+                    if not report:
+                        if stats is not None:
+                            stats.entries_pruned += 1
+                        continue
+            except OSError:
+                if stats is not None:
+                    stats.entries_pruned += 1
+                continue
+            yield entry.path, depth + 1, is_dir
+            if descend:
+                if depth + 1 < max_depth:
+                    push(entry.path, depth + 1)
+                elif stats is not None:
+                    stats.entries_pruned += 1
+    finally:
+        for frame in stack:  # the consumer stopped early: release the descriptors
+            frame[2].close()
+
+
+def _scan_dir(current, follow_symlinks, needs_stat, want_mtime):
+    """List *current* for :func:`_walk_threaded`, in a worker thread.
+
+    Returns ``(mtime, entries, visited, pruned, stat_calls)`` with entries as
+    ``(path, is_dir, stat or None, is_link)``; raises OSError if *current* cannot be listed.
+    """
+    mtime = os.stat(current).st_mtime_ns if want_mtime else None
+    entries = []
+    visited = pruned = stat_calls = 0
+    with os.scandir(current) as it:
+        for entry in it:
+            visited += 1
+            is_link = entry.is_symlink()
+            if is_link and not follow_symlinks:
+                pruned += 1
                 continue
+            try:
+                is_dir = entry.is_dir()
+                if not is_dir and not entry.is_file():
+                    pruned += 1
+                    continue
+                st = None
+                if needs_stat(is_dir):
+                    st = entry.stat()
+                    stat_calls += 1
+            except OSError:
+                pruned += 1
+                continue
+            entries.append((entry.path, is_dir, st, is_link))
+    return mtime, entries, visited, pruned, stat_calls
 
-            # Decide whether to yield *current* before descending
-            if (want == "file" and current.is_file()) or (
-                want == "dir" and current.is_dir()
-            ):
 
-                should_include = _matches_all_include(current, include)
+def _on_worker_thread(entries: Iterator, batch_size: int = 256) -> Iterator:
+    """Iterate *entries* on a dedicated daemon thread and yield them in the caller's.
 
-                if exclude_logic == "or":
-                    should_exclude = _matches_any_exclude_or(current, exclude)
-                else:  # "and" or any other value defaults to original behavior
-                    should_exclude = _matches_any_exclude_and(current, exclude)
+    For walks with a ``Throttle(low_priority=True)``: the listings lower the
+    priority of the thread making them, which cannot be undone without
+    privileges, so they must not run in the caller's thread. Entries are
+    passed over in batches, a batch as soon as the caller is waiting for it;
+    exceptions are raised in the caller, and abandoning the iterator stops
+    the thread at its next entry.
+    """
+    import queue as queue_module
+    import threading
+
+    out = queue_module.Queue(maxsize=64)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue_module.Full:
+                continue
+        return False
 
-                if should_include and not should_exclude:
-                    yield current
+    def produce():
+        batch = []
+        try:
+            for entry in entries:
+                batch.append(entry)
+                if len(batch) >= batch_size or out.empty():
+                    if not put(batch):
+                        return
+                    batch = []
+            put(batch)
+            put(None)
+        except BaseException as e:  # re-raised in the caller's thread
+            put(e)
+        finally:
+            entries.close()
+
+    threading.Thread(target=produce, daemon=True, name="findfile-walker").start()
+    try:
+        while True:
+            batch = out.get()
+            if batch is None:
+                return
+            if isinstance(batch, BaseException):
+                raise batch
+            yield from batch
+    finally:
+        stop.set()
+
+
+def _walk_threaded(
+    root,
+    max_depth,
+    listed,
+    stats,
+    follow_symlinks,
+    admit,
+    needs_stat,
+    workers,
+    timeout,
+    throttle=None,
+) -> Iterator[tuple[str, int, bool]]:
+    """The listing loop of :func:`_walk` on *workers* daemon threads.
+
+    Only listing (and stat'ing) runs in the threads; cycle, device and mount
+    decisions stay in the caller's thread. A directory still being listed
+    *timeout* seconds after its listing started is abandoned: its entries are
+    dropped even if they arrive later, a replacement thread keeps the pool at
+    full size, and the stuck thread (e.g. on a hung NFS mount) can neither
+    stall the search nor block interpreter exit.
+    """
+    import queue as queue_module
+    import threading
+
+    tasks = queue_module.SimpleQueue()
+    done = queue_module.SimpleQueue()
+    running = {}  # dir -> listing start time, for the timeout
+    clock = time.monotonic
+
+    def worker():
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            current, depth = task
+            slept = throttle.before_listing() if throttle is not None else 0.0
+            started = running[current] = clock()
+            try:
+                result = _scan_dir(current, follow_symlinks, needs_stat, listed is not None)
+            except OSError:
+                result = None
+            seconds = clock() - started
+            if throttle is not None:
+                if result is None:
+                    slept += throttle.after_listing(seconds)
+                else:
+                    calls = result[4] + (listed is not None)
+                    slept += throttle.after_listing(seconds, calls, result[2])
+            done.put((current, depth, result, seconds, slept))
+
+    def spawn():
+        threading.Thread(target=worker, daemon=True, name="findfile-walker").start()
+
+    for _ in range(workers):
+        spawn()
+    tasks.put((root, 0))
+    pending = {root}
+    abandoned = set()
+    try:
+        while pending:
+            wait = None
+            if timeout is not None:
+                now = clock()
+                starts = [running[d] for d in pending if d in running]
+                wait = max(0.0, min(starts) + timeout - now) if starts else timeout
+            try:
+                current, depth, result, seconds, slept = done.get(timeout=wait)
+            except queue_module.Empty:
+                now = clock()
+                for d in [d for d in pending if d in running and now - running[d] >= timeout]:
+                    pending.discard(d)
+                    abandoned.add(d)
+                    spawn()
+                    if listed is not None:
+                        listed.append((d, None))  # never a valid cache entry
+                    if stats is not None:
+                        stats.dirs_timed_out += 1
+                continue
+            running.pop(current, None)
+            if current in abandoned:
+                continue
+            pending.discard(current)
+            if stats is not None:
+                stats.dirs_listed += 1
+                stats.throttle_sleep += slept
+                stats.record_listing(current, seconds)
+            if result is None:
+                continue
+            mtime, entries, visited, pruned, stat_calls = result
+            if listed is not None:
+                listed.append((current, mtime))
+            for path, is_dir, st, is_link in entries:
+                descend = is_dir
+                if admit is not None:
+                    report, descend = admit(path, is_dir, st, depth + 1, is_link)
+                    if not report:
+                        pruned += 1
+                        continue
+                yield path, depth + 1, is_dir
+                if descend:
+                    if depth + 1 >= max_depth:
+                        if stats is not None:
+                            stats.entries_pruned += 1
+                        continue
+                    pending.add(path)
+                    tasks.put((path, depth + 1))
+            if stats is not None:
+                stats.entries_visited += visited
+                stats.entries_pruned += pruned
+                stats.stat_calls += stat_calls + (listed is not None)
+    finally:
+        try:  # drop queued listings nobody will consume
+            while True:
+                tasks.get_nowait()
+        except queue_module.Empty:
+            pass
+        for _ in range(workers + len(abandoned)):
+            tasks.put(None)
+
+
+def _finalize(
+    hits: list[tuple[str, int]],
+    return_relative_path: bool = True,
+    return_deepest_path: bool = False,
+) -> list[str]:
+    """Turn ``(path, depth)`` hits into the ``_find`` result list."""
+    if not hits:
+        return []
+    if return_deepest_path:
+        max_depth = max(d for _, d in hits)
+        paths = [p for p, d in hits if d == max_depth]
+    else:
+        paths = [p for p, _ in hits]
+    if return_relative_path:
+        return _relative_to_cwd(paths)
+    return paths
 
-            # Descend only into directories (and only if we haven't exceeded depth)
-            if current.is_dir() and depth < max_depth:
-                for child in current.iterdir():
-                    queue.append((child, depth + 1))
-        except PermissionError:
-            # Silently ignore unreadable directories
-            continue
+
+def _relative_to_cwd(paths: list[str], cwd: str | None = None) -> list[str]:
+    """Make absolute *paths* relative to the CWD, with a single ``getcwd``."""
+    cwd = cwd or os.getcwd()
+    prefix = cwd if cwd.endswith(os.sep) else cwd + os.sep
+    n = len(prefix)
+    return [
+        p[n:] if p.startswith(prefix) else "." if p == cwd else os.path.relpath(p, cwd)
+        for p in paths
+    ]
+
+
+def _select_target(res: list[str], return_deepest_path: bool, disable_alert: bool):
+    """Pick the shortest (or longest) of *res* the way ``find_file`` does.
+
+    Paths of equal length are decided by the smallest string, not by their
+    order in *res*, so a walk and the (sorted) disk cache pick the same one.
+    """
+    if not return_deepest_path:
+        _res = min(res, key=lambda p: (len(p), p)) if res else None
+    else:
+        _res = min(res, key=lambda p: (-len(p), p)) if res else None
+    if len(res) > 1 and not disable_alert:
+        print(
+            "FindFile Warning --> multiple targets {} found, only return the {} path: <{}>".format(
+                res,
+                "deepest" if return_deepest_path else "shortest",
+                colored(_res, "yellow"),
+            )
+        )
+    return _res
+
+
+def _filter_leaf_dirs(res: list[str]) -> list[str]:
+    """Drop every dir that is a string prefix of (or equal to) another result.
+
+    Same semantics as the pairwise ``return_leaf_only`` filter, in O(n log n):
+    all strings starting with *x* sort directly after *x*.
+    """
+    ordered = sorted(res)
+    dropped = set()
+    for x, y in zip(ordered, ordered[1:]):
+        if y.startswith(x):
+            dropped.add(x)
+    return [x for x in res if x not in dropped]
+
+
+def _reject_budget(kwargs, use: str):
+    """A budgeted walk returns a partial :class:`FindResult`; *use* needs every match."""
+    if any(kwargs.get(k) is not None for k in ("timeout", "max_entries", "cursor")):
+        raise ValueError("timeout/max_entries/cursor cannot be combined with {}".format(use))
 
 
 # ---------------------------------------------------------------------------
@@ -167,36 +1023,17 @@ def _iter_paths(
 # ---------------------------------------------------------------------------
 
 
-def _find(
-    search_path: Union[str, Path] | None = None,
-    *,
-    key: Sequence[str] | str | None = None,
-    exclude_key: Sequence[str] | str | None = None,
-    use_regex: bool = False,
-    recursive: int | bool = 5,
-    return_relative_path: bool = True,
-    return_deepest_path: bool = False,
-    disable_alert: bool = False,
-    want: str = "file",  # "file" or "dir"
-    exclude_logic: str = "or",  # NEW PARAMETER: "or" or "and"
-) -> list[str]:
-    """Internal unified implementation for both files and dirs.
+def _normalize_query(search_path, key, exclude_key, recursive, backend=None):
+    """Resolve the root and normalise keys/depth the way every query does.
 
-    Parameters
-    ----------
-    exclude_logic : str, default "or"
-        Logic for exclude_key patterns:
-        - "or": exclude if path matches ANY exclude pattern (recommended)
-        - "and": exclude if path matches ALL exclude patterns (original behavior)
-    return_deepest_path
-        When *True*, filter the resulting matches so that only those at the greatest
-        depth (relative to *search_path* or CWD) are returned. Useful for "take the
-        deepest hit" semantics.
-    disable_alert
-        Suppress warnings emitted when regex compilation fails.
-    """
+    The root is a ``Path``, or the backend path string with a *backend*.
 
-    root = Path(search_path or Path.cwd()).expanduser().resolve()
+    :return (root, key, exclude_key, exclude_key + global ignore list, depth)
+    """
+    if backend is not None:
+        root = backend.resolve(search_path)
+    else:
+        root = Path(search_path or Path.cwd()).expanduser().resolve()
 
     # Compatibility shim: recursive=True behaves like depth 5 (legacy)
     if recursive is True:
@@ -217,38 +1054,300 @@ def _find(
         )
     except Exception:
         exclude_combined = exclude_key
+    return root, key, exclude_key, exclude_combined, int(recursive)
 
+
+def _ifind(
+    search_path: str | Path | None = None,
+    *,
+    key: Sequence[str] | str | None = None,
+    or_key: Sequence[str] | str | None = None,
+    exclude_key: Sequence[str] | str | None = None,
+    use_regex: bool = False,
+    recursive: int | bool = 5,
+    disable_alert: bool = False,
+    want: str = "file",
+    exclude_logic: str = "or",
+    stats: FindStats | None = None,
+    glob: str | None = None,
+    backend=None,
+    **walk_options,
+) -> Iterator[tuple[str, int]]:
+    """Stream the ``(absolute path, depth)`` matches of a query as they are found.
+
+    Unlike ``_find`` there is no post-processing, caching or ``or_key`` re-walk:
+    *or_key* matches paths containing any of its keys in a single traversal,
+    so each path is reported at most once. *walk_options* are those of ``_find``.
+    """
+    if key and or_key:
+        raise ValueError("The key and or_key arg are contradictory!")
+    include_logic = "or" if or_key else "and"
+    root, key, exclude_key, exclude_combined, recursive = _normalize_query(
+        search_path, or_key or key, exclude_key, recursive, backend
+    )
+    if glob is not None:
+        from findfile.globbing import _glob_root
+
+        root, glob = _glob_root(root, glob)
     include = _compile_patterns(key, use_regex, disable_alert=disable_alert)
     exclude = _compile_patterns(
         exclude_combined, use_regex, disable_alert=disable_alert
     )
-
-    # MODIFIED: Pass exclude_logic parameter to _iter_paths
-    path_iter = _iter_paths(
+    if stats is not None:
+        include = include and [_CountingPattern(p, stats) for p in include]
+        exclude = exclude and [_CountingPattern(p, stats) for p in exclude]
+    return _iter_paths(
         root,
         want=want,
         include=include,
         exclude=exclude,
-        max_depth=int(recursive),
-        exclude_logic=exclude_logic,  # NEW PARAMETER
+        max_depth=recursive,
+        exclude_logic=exclude_logic,
+        stats=stats,
+        include_logic=include_logic,
+        glob=glob,
+        backend=backend,
+        **walk_options,
     )
-    paths: list[Path] = list(path_iter)
 
-    if not paths:
-        return []
 
-    # Retain only the deepest match(es) if requested
-    if return_deepest_path:
-        depths = [
-            len(p.relative_to(root if root != Path.cwd() else Path.cwd()).parts)
-            for p in paths
-        ]
-        max_depth = max(depths)
-        paths = [p for p, d in zip(paths, depths) if d == max_depth]
+def _find(
+    search_path: str | Path | None = None,
+    *,
+    key: Sequence[str] | str | None = None,
+    exclude_key: Sequence[str] | str | None = None,
+    use_regex: bool = False,
+    recursive: int | bool = 5,
+    return_relative_path: bool = True,
+    return_deepest_path: bool = False,
+    disable_alert: bool = False,
+    want: str = "file",  # "file" or "dir"
+    exclude_logic: str = "or",  # NEW PARAMETER: "or" or "and"
+    use_cache: bool | None = None,
+    stats: FindStats | bool | None = None,
+    server: str | bool | None = None,
+    follow_symlinks: bool = False,
+    dedupe_targets: bool = False,
+    one_file_system: bool = False,
+    skip_fstypes: Sequence[str] | bool | None = None,
+    workers: int | None = None,
+    listing_timeout: float | None = None,
+    strategy: str = "bfs",
+    throttle=None,
+    glob: str | None = None,
+    timeout: float | None = None,
+    max_entries: int | None = None,
+    cursor: FindCursor | None = None,
+    backend=None,
+) -> list[str]:
+    """Internal unified implementation for both files and dirs.
 
-    if return_relative_path:
-        return [str(p.relative_to(Path.cwd())) for p in paths]
-    return [str(p) for p in paths]
+    Parameters
+    ----------
+    exclude_logic : str, default "or"
+        Logic for exclude_key patterns:
+        - "or": exclude if path matches ANY exclude pattern (recommended)
+        - "and": exclude if path matches ALL exclude patterns (original behavior)
+    return_deepest_path
+        When *True*, filter the resulting matches so that only those at the greatest
+        depth (relative to *search_path* or CWD) are returned. Useful for "take the
+        deepest hit" semantics.
+    disable_alert
+        Suppress warnings emitted when regex compilation fails.
+    use_cache
+        Serve repeated identical queries from the in-process query cache
+        (see :func:`findfile.enable_query_cache`). *None* follows the global switch.
+    stats
+        A :class:`findfile.FindStats` to fill with traversal counters and phase
+        timings, or *True* to only report them to the stats hooks and the
+        ``findfile`` logger. Collection is skipped entirely when nobody listens.
+    server
+        Ask a running ``findfile serve`` daemon first: *True* for the default
+        socket, or a socket path. *None* follows ``$FINDFILE_SERVER``. Queries
+        the daemon does not index, or any connection failure, walk locally.
+        Served hits come in sorted path order instead of walk order.
+    follow_symlinks
+        Descend into symlinked dirs and report symlinked files, with
+        ``(st_dev, st_ino)`` cycle detection; shared subtrees are walked once.
+    dedupe_targets
+        Report every file or dir only once however many links point to it.
+    one_file_system
+        Do not descend into directories on another device than *search_path*.
+    skip_fstypes
+        Filesystem types whose mount points are not descended, e.g.
+        ``["nfs", "fuse"]`` (``fuse`` covers ``fuse.sshfs``, ...), or *True* for
+        :data:`DEFAULT_SKIP_FSTYPES`. Read from ``/proc/self/mountinfo``.
+    workers
+        List directories in that many threads (results in completion order).
+    listing_timeout
+        Seconds after which a single directory listing is abandoned, so one
+        hung mount cannot stall the search; implies a threaded walk.
+    strategy
+        "bfs" (default) or "dfs": depth-first pre-order, whose memory is bounded
+        by the depth rather than the width of the tree (same matches, other order).
+    throttle
+        A :class:`findfile.Throttle` capping listings and stats per second, with
+        optional latency back-off and low-priority listing threads.
+    glob
+        Only walk the entries matching this pattern relative to *search_path*,
+        e.g. ``"data/*/train/**/*.json"``: directories that cannot match are not
+        descended and literal segments are stat'ed instead of listed. An absolute
+        pattern is walked from its literal prefix. *key* and *exclude_key* still
+        filter the matches and *recursive* still bounds the depth.
+        Supports *follow_symlinks* but no other traversal option.
+    timeout, max_entries
+        Budgets in seconds and visited entries, checked between directory
+        listings. The result is then a :class:`FindResult` whose ``cursor``
+        (None once the walk completed) continues the search when passed back
+        as *cursor* with otherwise identical arguments. Breadth-first walks only.
+        ``find_files`` and ``find_dirs(return_leaf_only=False)`` with one key only:
+        picking, ranking, leaf-filtering or or_key-merging a partial result
+        raises ValueError.
+    cursor
+        The ``cursor`` of a previous budgeted result; only the entries that call
+        did not reach are walked. May come with a new *timeout*/*max_entries*.
+    backend
+        A :class:`findfile.backends.Backend` to search instead of the local
+        filesystem, e.g. a ``MemoryBackend`` or a ``PrefixBackend`` over an
+        object store; *search_path* is then a path of that backend. Results are
+        its absolute paths (relative to the CWD for a ``LocalBackend`` only);
+        the query cache, the server, globs and budgets are not used.
+    """
+    stats = _stats_for(stats)
+    started = time.perf_counter() if stats is not None else 0.0
+
+    root, key, exclude_key, exclude_combined, recursive = _normalize_query(
+        search_path, key, exclude_key, recursive, backend
+    )
+    if glob is not None:
+        from findfile.globbing import _glob_root
+
+        root, glob = _glob_root(root, glob)
+    include = _compile_patterns(key, use_regex, disable_alert=disable_alert)
+    exclude = _compile_patterns(
+        exclude_combined, use_regex, disable_alert=disable_alert
+    )
+    if backend is not None:
+        # mtime validation and the daemon only know the local filesystem
+        use_cache, server = False, False
+        return_relative_path = return_relative_path and backend.local
+
+    cache_enabled = _query_cache_enabled(use_cache)
+    cache_key = (
+        str(root),
+        want,
+        tuple(key or ()),
+        tuple(exclude_combined or ()),
+        bool(use_regex),
+        recursive,
+        exclude_logic,
+        bool(follow_symlinks),
+        bool(dedupe_targets),
+        bool(one_file_system),
+        _fstypes(skip_fstypes),
+        strategy,
+        glob,
+    )
+    budgeted = timeout is not None or max_entries is not None or cursor is not None
+    if cursor is not None:
+        if cursor.query != cache_key:
+            raise ValueError("The cursor belongs to another query")
+        cache_enabled = False  # only the rest of a walk, nothing to share
+    cached = _QUERY_CACHE.get(cache_key) if cache_enabled else None
+    # a daemon answer is served like a cache hit: no walk, same (path, depth) hits;
+    # a budget or cursor needs a walk of its own to stop and resume
+    use_server = server or (server is None and "FINDFILE_SERVER" in os.environ)
+    if cached is None and glob is None and not budgeted and use_server:
+        from findfile.server import _find_via_server
+
+        cached = _find_via_server(
+            server,
+            root,
+            want=want,
+            key=key,
+            exclude_key=exclude_combined,
+            use_regex=bool(use_regex),
+            recursive=recursive,
+            exclude_logic=exclude_logic,
+            follow_symlinks=bool(follow_symlinks),
+            dedupe_targets=bool(dedupe_targets),
+            one_file_system=bool(one_file_system),
+            skip_fstypes=list(_fstypes(skip_fstypes)),
+        )
+
+    if stats is not None:
+        stats.calls += 1
+        stats.query = {
+            "search_path": str(root),
+            "want": want,
+            "key": key,
+            "exclude_key": exclude_key,
+            "use_regex": use_regex,
+            "recursive": recursive,
+        }
+        if include:
+            include = [_CountingPattern(p, stats) for p in include]
+        if exclude:
+            exclude = [_CountingPattern(p, stats) for p in exclude]
+
+    budget = None
+    if cached is not None:
+        hits = list(cached)
+        if stats is not None:
+            stats.cache_hits += 1
+            stats.matches += len(hits)
+    else:
+        if budgeted:
+            budget = _Budget(timeout, max_entries, resume=cursor)
+        listed = [] if cache_enabled else None
+        if listed is not None and not root.exists():
+            listed.append((str(root), None))  # invalidate once the root appears
+        elif listed is not None and (recursive <= 0 or not root.is_dir()):
+            listed.append(_root_anchor(root))  # the walk lists nothing to validate by
+        # MODIFIED: Pass exclude_logic parameter to _iter_paths
+        path_iter = _iter_paths(
+            root,
+            want=want,
+            include=include,
+            exclude=exclude,
+            max_depth=recursive,
+            exclude_logic=exclude_logic,  # NEW PARAMETER
+            listed=listed,
+            stats=stats,
+            follow_symlinks=follow_symlinks,
+            dedupe_targets=dedupe_targets,
+            one_file_system=one_file_system,
+            skip_fstypes=skip_fstypes,
+            workers=workers,
+            listing_timeout=listing_timeout,
+            strategy=strategy,
+            throttle=throttle,
+            glob=glob,
+            backend=backend,
+            budget=budget,
+        )
+        hits = list(path_iter)
+        if cache_enabled and (budget is None or budget.frontier is None):
+            _QUERY_CACHE.put(cache_key, hits, listed)
+
+    # Retain only the deepest match(es) if requested; depths come from the walker
+    if stats is None and not budgeted:
+        return _finalize(hits, return_relative_path, return_deepest_path)
+
+    t = time.perf_counter()
+    results = _finalize(hits, return_relative_path, return_deepest_path)
+    if budgeted:
+        stopped = budget is not None and budget.frontier is not None
+        results = FindResult(
+            results,
+            FindCursor(cache_key, budget.frontier, budget.walk_state) if stopped else None,
+        )
+    if stats is None:
+        return results
+    stats.postprocess_time += time.perf_counter() - t
+    stats.total_time += time.perf_counter() - started
+    _emit_stats(stats)
+    return results
 
 
 def _find_files(**kwargs) -> list[str]:
@@ -274,7 +1373,7 @@ def _find_dirs(**kwargs) -> list[str]:
 
 
 def find_file(
-    search_path: Union[str, Path] = None,
+    search_path: str | Path = None,
     and_key=None,
     exclude_key=None,
     use_regex=False,
@@ -302,6 +1401,7 @@ def find_file(
      :return the target files' path in current working directory
      """
     key = kwargs.pop("key", and_key)
+    _reject_budget(kwargs, "find_file(), which picks one path")
 
     res = []
     or_key = kwargs.pop("or_key", "")
@@ -333,19 +1433,7 @@ def find_file(
             **kwargs,
         )
 
-    if not return_deepest_path:
-        _res = reduce(lambda x, y: x if len(x) < len(y) else y, res) if res else None
-    else:
-        _res = reduce(lambda x, y: x if len(x) > len(y) else y, res) if res else None
-    if len(res) > 1 and not disable_alert:
-        print(
-            "FindFile Warning --> multiple targets {} found, only return the {} path: <{}>".format(
-                res,
-                "deepest" if return_deepest_path else "shortest",
-                colored(_res, "yellow"),
-            )
-        )
-    return _res
+    return _select_target(res, return_deepest_path, disable_alert)
 
 
 def find_cwd_file(
@@ -368,6 +1456,7 @@ def find_cwd_file(
     :return the target file path in current working directory
     """
     key = kwargs.pop("key", and_key)
+    _reject_budget(kwargs, "find_cwd_file(), which picks one path")
 
     res = []
     or_key = kwargs.pop("or_key", "")
@@ -399,19 +1488,7 @@ def find_cwd_file(
             **kwargs,
         )
 
-    if not return_deepest_path:
-        _res = reduce(lambda x, y: x if len(x) < len(y) else y, res) if res else None
-    else:
-        _res = reduce(lambda x, y: x if len(x) > len(y) else y, res) if res else None
-    if len(res) > 1 and not disable_alert:
-        print(
-            "FindFile Warning --> multiple targets {} found, only return the {} path: <{}>".format(
-                res,
-                "deepest" if return_deepest_path else "shortest",
-                colored(_res, "yellow"),
-            )
-        )
-    return _res
+    return _select_target(res, return_deepest_path, disable_alert)
 
 
 def find_cwd_files(
@@ -444,6 +1521,7 @@ def find_cwd_files(
     if or_key:
         if or_key and key:
             raise ValueError("The key and or_key arg are contradictory!")
+        _reject_budget(kwargs, "or_key")
         for key in or_key:
             res += _find_files(
                 search_path=os.getcwd(),
@@ -468,7 +1546,7 @@ def find_cwd_files(
 
 
 def find_files(
-    search_path: Union[str, Path] = None,
+    search_path: str | Path = None,
     and_key=None,
     exclude_key=None,
     use_regex=False,
@@ -497,6 +1575,7 @@ def find_files(
     if or_key:
         if or_key and key:
             raise ValueError("The key and or_key arg are contradictory!")
+        _reject_budget(kwargs, "or_key")
         for key in or_key:
             res += _find_files(
                 search_path=search_path,
@@ -521,7 +1600,7 @@ def find_files(
 
 
 def find_dir(
-    search_path: Union[str, Path] = None,
+    search_path: str | Path = None,
     and_key=None,
     exclude_key=None,
     use_regex=False,
@@ -542,6 +1621,7 @@ def find_dir(
     :return the dir path
     """
     key = kwargs.pop("key", and_key)
+    _reject_budget(kwargs, "find_dir(), which picks one path")
 
     res = []
     or_key = kwargs.pop("or_key", "")
@@ -572,19 +1652,7 @@ def find_dir(
             **kwargs,
         )
 
-    if not return_deepest_path:
-        _res = reduce(lambda x, y: x if len(x) < len(y) else y, res) if res else None
-    else:
-        _res = reduce(lambda x, y: x if len(x) > len(y) else y, res) if res else None
-    if len(res) > 1 and not disable_alert:
-        print(
-            "FindFile Warning --> multiple targets {} found, only return the {} path: <{}>".format(
-                res,
-                "deepest" if return_deepest_path else "shortest",
-                colored(_res, "yellow"),
-            )
-        )
-    return _res
+    return _select_target(res, return_deepest_path, disable_alert)
 
 
 def find_cwd_dir(
@@ -607,6 +1675,7 @@ def find_cwd_dir(
     :return the target dir path in current working directory
     """
     key = kwargs.pop("key", and_key)
+    _reject_budget(kwargs, "find_cwd_dir(), which picks one path")
 
     res = []
     or_key = kwargs.pop("or_key", "")
@@ -639,19 +1708,7 @@ def find_cwd_dir(
             **kwargs,
         )
 
-    if not return_deepest_path:
-        _res = reduce(lambda x, y: x if len(x) < len(y) else y, res) if res else None
-    else:
-        _res = reduce(lambda x, y: x if len(x) > len(y) else y, res) if res else None
-    if len(res) > 1 and not disable_alert:
-        print(
-            "FindFile Warning --> multiple targets {} found, only return the {} path: <{}>".format(
-                res,
-                "deepest" if return_deepest_path else "shortest",
-                colored(_res, "yellow"),
-            )
-        )
-    return _res
+    return _select_target(res, return_deepest_path, disable_alert)
 
 
 def find_cwd_dirs(
@@ -678,6 +1735,10 @@ def find_cwd_dirs(
             "return_deepest_path is not supported in find_cwd_dirs() which return all the results."
         )
 
+    return_leaf_only = kwargs.pop("return_leaf_only", True)
+    if return_leaf_only:
+        _reject_budget(kwargs, "return_leaf_only")
+
     res = []
     or_key = kwargs.pop("or_key", "")
     if or_key and isinstance(or_key, str):
@@ -685,6 +1746,7 @@ def find_cwd_dirs(
     if or_key:
         if or_key and key:
             raise ValueError("The key and or_key arg are contradictory!")
+        _reject_budget(kwargs, "or_key")
         for key in or_key:
             res += _find_dirs(
                 search_path=os.getcwd(),
@@ -707,23 +1769,14 @@ def find_cwd_dirs(
             **kwargs,
         )
 
-    if kwargs.get("return_leaf_only", True):
-        _res = []
-        for i, x in enumerate(res):
-            flag = True
-            for j, y in enumerate(res[:i] + res[i + 1 :]):
-                if y == x or y.startswith(x):
-                    flag = False
-                    break
-            if flag:
-                _res.append(x)
-        res = _res
+    if return_leaf_only:
+        res = _filter_leaf_dirs(res)
 
     return res
 
 
 def find_dirs(
-    search_path: Union[str, Path] = None,
+    search_path: str | Path = None,
     and_key=None,
     exclude_key=None,
     use_regex=False,
@@ -748,6 +1801,10 @@ def find_dirs(
             "return_deepest_path is not supported in find_dirs() which return all the results."
         )
 
+    return_leaf_only = kwargs.pop("return_leaf_only", True)
+    if return_leaf_only:
+        _reject_budget(kwargs, "return_leaf_only")
+
     res = []
     or_key = kwargs.pop("or_key", "")
     if or_key and isinstance(or_key, str):
@@ -755,6 +1812,7 @@ def find_dirs(
     if or_key:
         if or_key and key:
             raise ValueError("The key and or_key arg are contradictory!")
+        _reject_budget(kwargs, "or_key")
         for key in or_key:
             res += _find_dirs(
                 search_path=search_path,
@@ -779,23 +1837,103 @@ def find_dirs(
             **kwargs,
         )
 
-    if kwargs.get("return_leaf_only", True):
-        _res = []
-        for i, x in enumerate(res):
-            flag = True
-            for j, y in enumerate(res[:i] + res[i + 1 :]):
-                if y == x or y.startswith(x):
-                    flag = False
-                    break
-            if flag:
-                _res.append(x)
-        res = _res
+    if return_leaf_only:
+        res = _filter_leaf_dirs(res)
 
     return res
 
 
+def find_ranked_files(
+    search_path: str | Path = None,
+    query="",
+    top_n=10,
+    and_key=None,
+    exclude_key=None,
+    use_regex=False,
+    return_relative_path=True,
+    disable_alert=False,
+    **kwargs,
+):
+    """
+    'search_path': path to search
+    'query': approximate basename of the target, e.g. 'cfg' or 'config' for 'config.yaml'
+    'top_n' number of candidates to return
+    'key': optional filter, only the files whose absolute path contain the 'key' are ranked
+    'exclude_key': file whose absolute path contains 'exclude_key' will be ignored
+    'recursive' integer, recursive search limit
+    'return_relative_path' return the relative path instead of absolute path
+
+    :return a list of (path, score) pairs, best match first, score in [0, 1]
+    """
+    from findfile.fuzzy import rank_paths
+
+    key = kwargs.pop("key", and_key)
+    _reject_budget(kwargs, "find_ranked_files(), which ranks every match")
+    res = _find_files(
+        search_path=search_path,
+        key=key,
+        exclude_key=exclude_key,
+        use_regex=use_regex,
+        return_relative_path=return_relative_path,
+        disable_alert=disable_alert,
+        **kwargs,
+    )
+    return rank_paths(query, res, top_n)
+
+
+def find_ranked_dirs(
+    search_path: str | Path = None,
+    query="",
+    top_n=10,
+    and_key=None,
+    exclude_key=None,
+    use_regex=False,
+    return_relative_path=True,
+    disable_alert=False,
+    **kwargs,
+):
+    """
+    'search_path': path to search
+    'query': approximate basename of the target dir
+    'top_n' number of candidates to return
+    'key': optional filter, only the dirs whose absolute path contain the 'key' are ranked
+    'exclude_key': dir whose absolute path contains 'exclude_key' will be ignored
+    'recursive' integer, recursive search limit
+    'return_relative_path' return the relative path instead of absolute path
+
+    :return a list of (path, score) pairs, best match first, score in [0, 1]
+    """
+    from findfile.fuzzy import rank_paths
+
+    key = kwargs.pop("key", and_key)
+    _reject_budget(kwargs, "find_ranked_dirs(), which ranks every match")
+    res = _find_dirs(
+        search_path=search_path,
+        key=key,
+        exclude_key=exclude_key,
+        use_regex=use_regex,
+        return_relative_path=return_relative_path,
+        disable_alert=disable_alert,
+        **kwargs,
+    )
+    return rank_paths(query, res, top_n)
+
+
+def _check_removable(kwargs):
+    """The rm_* functions delete with ``os``/``shutil``: only local paths may reach them."""
+    backend = kwargs.get("backend")
+    if backend is not None and not backend.local:
+        raise ValueError(
+            "{} paths cannot be removed; rm_* only deletes local files".format(
+                type(backend).__name__
+            )
+        )
+
+
 def rm_files(path=None, and_key=None, exclude_key=None, **kwargs):
     key = kwargs.pop("key", and_key)
+    dry_run = kwargs.pop("dry_run", False)
+    _check_removable(kwargs)
 
     if not path:
         path = os.getcwd()
@@ -815,6 +1953,10 @@ def rm_files(path=None, and_key=None, exclude_key=None, **kwargs):
             **kwargs,
         )
 
+        if dry_run:
+            print(colored("FindFile Warning: Dry run, would remove files {}".format(fs), "yellow"))
+            return fs
+
         print(colored("FindFile Warning: Remove files {}".format(fs), "red"))
 
         for f in fs:
@@ -842,6 +1984,10 @@ def rm_files(path=None, and_key=None, exclude_key=None, **kwargs):
                 **kwargs,
             )
 
+        if dry_run:
+            print(colored("FindFile Warning: Dry run, would remove files {}".format(fs), "yellow"))
+            return fs
+
         print(colored("FindFile Warning: Remove files {}".format(fs), "red"))
 
         for f in fs:
@@ -860,7 +2006,11 @@ def rm_files(path=None, and_key=None, exclude_key=None, **kwargs):
 
 
 def rm_dirs(path=None, and_key=None, exclude_key=None, **kwargs):
+    import shutil
+
     key = kwargs.pop("key", and_key)
+    dry_run = kwargs.pop("dry_run", False)
+    _check_removable(kwargs)
 
     if not path:
         path = os.getcwd()
@@ -880,6 +2030,10 @@ def rm_dirs(path=None, and_key=None, exclude_key=None, **kwargs):
             **kwargs,
         )
 
+        if dry_run:
+            print(colored("FindFile Warning: Dry run, would remove dirs {}".format(ds), "yellow"))
+            return ds
+
         print(colored("FindFile Warning: Remove dirs {}".format(ds), "red"))
 
         for d in ds:
@@ -907,6 +2061,10 @@ def rm_dirs(path=None, and_key=None, exclude_key=None, **kwargs):
                 **kwargs,
             )
 
+        if dry_run:
+            print(colored("FindFile Warning: Dry run, would remove dirs {}".format(ds), "yellow"))
+            return ds
+
         print(colored("FindFile Warning: Remove dirs {}".format(ds), "red"))
 
         for d in ds:
@@ -927,6 +2085,8 @@ def rm_dirs(path=None, and_key=None, exclude_key=None, **kwargs):
 
 def rm_file(path=None, and_key=None, exclude_key=None, **kwargs):
     key = kwargs.pop("key", and_key)
+    dry_run = kwargs.pop("dry_run", False)
+    _check_removable(kwargs)
 
     if not path:
         path = os.getcwd()
@@ -949,6 +2109,10 @@ def rm_file(path=None, and_key=None, exclude_key=None, **kwargs):
         if len(fs) > 1:
             raise ValueError("Multi-files detected while removing single file.")
 
+        if dry_run:
+            print(colored("FindFile Warning: Dry run, would remove files {}".format(fs), "yellow"))
+            return fs
+
         print(colored("FindFile Warning: Remove file {}".format(fs), "red"))
 
         for f in fs:
@@ -980,6 +2144,10 @@ def rm_file(path=None, and_key=None, exclude_key=None, **kwargs):
         if len(fs) > 1:
             raise ValueError("Multi-files detected while removing single file.")
 
+        if dry_run:
+            print(colored("FindFile Warning: Dry run, would remove files {}".format(fs), "yellow"))
+            return fs
+
         print(colored("FindFile Warning --> Remove file {}".format(fs), "red"))
 
         for f in fs:
@@ -996,7 +2164,11 @@ def rm_file(path=None, and_key=None, exclude_key=None, **kwargs):
 
 
 def rm_dir(path=None, and_key=None, exclude_key=None, **kwargs):
+    import shutil
+
     key = kwargs.pop("key", and_key)
+    dry_run = kwargs.pop("dry_run", False)
+    _check_removable(kwargs)
 
     if not path:
         path = os.getcwd()
@@ -1019,6 +2191,10 @@ def rm_dir(path=None, and_key=None, exclude_key=None, **kwargs):
         if len(ds) > 1:
             raise ValueError("Multi-dirs detected while removing single file.")
 
+        if dry_run:
+            print(colored("FindFile Warning: Dry run, would remove dirs {}".format(ds), "yellow"))
+            return ds
+
         print(colored("FindFile Warning: Remove dirs {}".format(ds), "red"))
 
         for d in ds:
@@ -1051,6 +2227,10 @@ def rm_dir(path=None, and_key=None, exclude_key=None, **kwargs):
         if len(ds) > 1:
             raise ValueError("Multi-dirs detected while removing single file.")
 
+        if dry_run:
+            print(colored("FindFile Warning: Dry run, would remove dirs {}".format(ds), "yellow"))
+            return ds
+
         print(colored("FindFile Warning: Remove dirs {}".format(ds), "red"))
 
         for d in ds:
@@ -1069,16 +2249,16 @@ def rm_dir(path=None, and_key=None, exclude_key=None, **kwargs):
 
 
 def rm_cwd_file(and_key=None, exclude_key=None, **kwargs):
-    rm_file(os.getcwd(), and_key, exclude_key, **kwargs)
+    return rm_file(os.getcwd(), and_key, exclude_key, **kwargs)
 
 
 def rm_cwd_files(and_key=None, exclude_key=None, **kwargs):
-    rm_files(os.getcwd(), and_key, exclude_key, **kwargs)
+    return rm_files(os.getcwd(), and_key, exclude_key, **kwargs)
 
 
 def rm_cwd_dir(and_key=None, exclude_key=None, **kwargs):
-    rm_dir(os.getcwd(), and_key, exclude_key, **kwargs)
+    return rm_dir(os.getcwd(), and_key, exclude_key, **kwargs)
 
 
 def rm_cwd_dirs(and_key=None, exclude_key=None, **kwargs):
-    rm_dirs(os.getcwd(), and_key, exclude_key, **kwargs)
+    return rm_dirs(os.getcwd(), and_key, exclude_key, **kwargs)
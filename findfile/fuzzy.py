@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+# file: fuzzy.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import heapq
+import os
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable
+
+
+def _trigrams(text: str) -> set:
+    """Padded, casefolded trigrams of *text* ("  a", " ab", "abc", ..., "yz ")."""
+    s = "  " + text.casefold() + " "
+    return {s[i : i + 3] for i in range(len(s) - 2)}
+
+
+def _is_subsequence(query: str, name: str) -> bool:
+    it = iter(name)
+    return all(c in it for c in query)
+
+
+def _score(query: str, name: str, shared: int, q_size: int, n_size: int) -> float:
+    """Similarity in [0, 1] between a casefolded *query* and basename *name*.
+
+    Trigram Dice similarity, lifted for exact, substring and subsequence hits so
+    that "cfg" still finds "config.yaml" and "config" prefers "config.yaml" over
+    "my_config_backup.yaml".
+    """
+    name = name.casefold()
+    if name == query:
+        return 1.0
+    score = 2.0 * shared / (q_size + n_size) if q_size + n_size else 0.0
+    stem = os.path.splitext(name)[0]
+    if stem == query:
+        score = max(score, 0.95)
+    elif name.startswith(query):
+        score = max(score, 0.7 + 0.2 * len(query) / len(name))
+    elif query in name:
+        score = max(score, 0.6 + 0.2 * len(query) / len(name))
+    elif _is_subsequence(query, name):
+        score = max(score, 0.3 + 0.3 * len(query) / len(name))
+    return score
+
+
+class TrigramIndex:
+    """Inverted index from padded trigrams to the ids of the indexed strings."""
+
+    def __init__(self, strings: Iterable[str]):
+        self.strings = list(strings)
+        self.sizes = array("I")
+        self.postings = {}
+        self.non_ascii = array("I")
+        for i, s in enumerate(self.strings):
+            if not s.isascii():
+                self.non_ascii.append(i)
+            grams = _trigrams(s)
+            self.sizes.append(len(grams))
+            for g in grams:
+                posting = self.postings.get(g)
+                if posting is None:
+                    posting = self.postings[g] = array("I")
+                posting.append(i)
+
+    def __len__(self):
+        return len(self.strings)
+
+    def overlap(self, grams: Iterable[str], budget: int | None = None) -> Counter:
+        """Count, per string id, how many of *grams* it contains.
+
+        Grams are visited rarest first; with a *budget*, counting stops before the
+        total posting length would exceed it (the rarest gram is always counted),
+        so very common trigrams like ".py" cannot dominate the query time.
+        """
+        postings = [p for p in map(self.postings.get, grams) if p is not None]
+        postings.sort(key=len)
+        counts = Counter()
+        used = 0
+        for posting in postings:
+            if budget is not None and used and used + len(posting) > budget:
+                break
+            counts.update(posting)
+            used += len(posting)
+        return counts
+
+    @staticmethod
+    def _literal_grams(literals) -> set:
+        grams = set()
+        for literal in literals:
+            s = literal.casefold()
+            grams.update(s[i : i + 3] for i in range(len(s) - 2))
+        return grams
+
+    def estimate(self, *literals: str) -> int | None:
+        """Upper bound of :meth:`candidates` size, without building any set."""
+        grams = self._literal_grams(literals)
+        if not grams or not all(literal.isascii() for literal in literals):
+            return None
+        return min(len(self.postings.get(g, ())) for g in grams) + len(self.non_ascii)
+
+    def candidates(self, *literals: str) -> set | None:
+        """Ids of the strings that contain every trigram of all *literals*.
+
+        This is a superset of the strings a case-insensitive regex of the
+        literals matches (callers verify); *None* means it cannot narrow, as
+        every literal is shorter than a trigram or one is not ASCII. Casefolding
+        and ``re.IGNORECASE`` only agree on ASCII ("i" matches "ı" but is not
+        its casefold), so the non-ASCII strings are always candidates.
+        Intersection starts from the rarest posting and stops once the running
+        set is much smaller than the next posting, where verifying the few
+        remaining candidates is cheaper than walking the posting.
+        """
+        grams = self._literal_grams(literals)
+        if not grams or not all(literal.isascii() for literal in literals):
+            return None
+        postings = sorted((self.postings.get(g, ()) for g in grams), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result or len(posting) > 8 * len(result):
+                break
+            result.intersection_update(posting)
+        result.update(self.non_ascii)
+        return result
+
+
+class NameIndex:
+    """Trigram index over the unique basenames of a list of paths."""
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = list(paths)
+        ids_by_name = {}
+        for i, p in enumerate(self.paths):
+            ids_by_name.setdefault(os.path.basename(p), []).append(i)
+        self.index = TrigramIndex(ids_by_name.keys())
+        self.path_ids = list(ids_by_name.values())
+
+    def search(
+        self,
+        query: str,
+        top_n: int = 10,
+        accept: Callable[[str], bool] | None = None,
+        budget: int = 100000,
+    ) -> list[tuple[str, float]]:
+        """The *top_n* best paths for *query*, scored like :func:`rank_paths`.
+
+        Only names sharing the rarest trigrams of *query* are scored at first. A
+        name sharing none can still be lifted by containing *query* as a
+        subsequence ("cfg" in "config.yaml"); such names are scanned for when
+        *query* is shorter than a trigram or the pool yields no *top_n* results
+        above the subsequence lift, so these hits agree with :func:`rank_paths`.
+        A name sharing only common trigrams that *budget* skipped may be missed.
+        """
+        if top_n <= 0:
+            return []
+        query = query.casefold()
+        q_grams = _trigrams(query)
+        counts = self.index.overlap(q_grams, budget=budget)
+        sizes, q_size = self.index.sizes, len(q_grams)
+        # The Dice similarity of the partial overlap only pre-selects a bounded
+        # pool; the pool is then rescored with the exact overlap, so the ranking
+        # itself is exact.
+        pool = heapq.nlargest(
+            max(top_n * 20, 200), counts, key=lambda i: counts[i] / (q_size + sizes[i])
+        )
+        scored = self._expand(query, q_grams, pool, top_n, accept)
+        best = _top(scored, top_n)
+        if len(query) < 3 or len(best) < top_n or best[-1][1] < 0.6:
+            pooled = set(pool)
+            lifted = [
+                name_id
+                for name_id, name in enumerate(self.index.strings)
+                if name_id not in pooled and _is_subsequence(query, name.casefold())
+            ]
+            scored += self._expand(query, q_grams, lifted, top_n, accept)
+        return _top(scored, top_n)
+
+    def _expand(self, query, q_grams, name_ids, top_n, accept) -> list[tuple[str, float]]:
+        """Score the names *name_ids*, best first, into ``(path, score)`` pairs."""
+        ranked = []
+        for name_id in name_ids:
+            name = self.index.strings[name_id]
+            n_grams = _trigrams(name)
+            score = _score(query, name, len(q_grams & n_grams), len(q_grams), len(n_grams))
+            ranked.append((score, name_id))
+        ranked.sort(reverse=True)
+        # Expand names into paths only until top_n accepted paths are collected
+        # and the score drops, so popular names ("__init__.py") stay cheap.
+        scored = []
+        accepted = 0
+        for score, name_id in ranked:
+            if accepted >= top_n and score < scored[-1][1]:
+                break
+            for path_id in self.path_ids[name_id]:
+                path = self.paths[path_id]
+                if accept is None or accept(path):
+                    scored.append((path, score))
+                    accepted += 1
+        return scored
+
+
+def _top(scored, top_n, accept=None) -> list[tuple[str, float]]:
+    # best score first, then the shortest path, then alphabetical for stable output
+    if top_n <= 0:
+        return []
+    scored.sort(key=lambda ps: (-ps[1], len(ps[0]), ps[0]))
+    results = []
+    for path, score in scored:
+        if accept is None or accept(path):
+            results.append((path, round(score, 4)))
+            if len(results) >= top_n:
+                break
+    return results
+
+
+def rank_paths(
+    query: str,
+    paths: Iterable[str],
+    top_n: int = 10,
+    accept: Callable[[str], bool] | None = None,
+) -> list[tuple[str, float]]:
+    """Score every path's basename against *query* and return the *top_n* best.
+
+    This is the linear fallback used for live walks; use :class:`NameIndex`
+    when the same paths are ranked repeatedly.
+    """
+    query = query.casefold()
+    q_grams = _trigrams(query)
+    q_size = len(q_grams)
+    scores = {}
+    scored = []
+    for p in paths:
+        name = os.path.basename(p)
+        score = scores.get(name)
+        if score is None:
+            n_grams = _trigrams(name)
+            score = scores[name] = _score(
+                query, name, len(q_grams & n_grams), q_size, len(n_grams)
+            )
+        if score > 0:
+            scored.append((p, score))
+    return _top(scored, top_n, accept)
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+# file: globbing.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Glob queries walked segment by segment.
+
+``"data/*/train/**/*.json"`` is split into per-depth segment matchers. The
+walker carries, for every directory, the set of pattern positions that are
+still reachable and descends only into directories that can still match; a
+directory whose remaining segments are all literal names is not listed at
+all, its candidate children are stat'ed directly.
+"""
+import os
+import re
+import stat as stat_module
+import time
+from collections import deque
+from collections.abc import Iterator
+from fnmatch import translate
+from pathlib import Path
+
+_LITERAL, _PATTERN, _ANY_DEPTH = 0, 1, 2
+_MAGIC = re.compile(r"[*?\[]")
+
+
+def _compile_glob(pattern: str) -> list[tuple[int, object]]:
+    """Segments of *pattern* as ``(kind, literal name or compiled regex)``."""
+    segments = []
+    for part in re.split(r"[/\\]" if os.sep == "\\" else "/", pattern):
+        if part in ("", "."):
+            continue
+        if part == "..":
+            raise ValueError("'..' is not supported in glob patterns: {}".format(pattern))
+        if part == "**":
+            if not segments or segments[-1][0] != _ANY_DEPTH:
+                segments.append((_ANY_DEPTH, None))
+        elif _MAGIC.search(part):
+            segments.append((_PATTERN, re.compile(translate(part))))
+        else:
+            segments.append((_LITERAL, part))
+    if not segments:
+        raise ValueError("Empty glob pattern: {!r}".format(pattern))
+    return segments
+
+
+def _closure(states, segments) -> frozenset:
+    """Add the position after every ``**``, which may match zero names."""
+    out = set()
+    n = len(segments)
+    for i in states:
+        out.add(i)
+        while i < n and segments[i][0] == _ANY_DEPTH:
+            i += 1
+            out.add(i)
+    return frozenset(out)
+
+
+def _step(states, name, segments) -> frozenset:
+    """The positions reached from *states* by one path component *name*."""
+    out = []
+    n = len(segments)
+    for i in states:
+        if i == n:
+            continue
+        kind, value = segments[i]
+        if kind == _ANY_DEPTH:
+            out.append(i)
+        elif kind == _LITERAL:
+            if name == value:
+                out.append(i + 1)
+        elif value.match(name):
+            out.append(i + 1)
+    return _closure(out, segments) if out else frozenset()
+
+
+def _glob_root(search_root: Path, pattern: str) -> tuple[Path, str]:
+    """The root to walk *pattern* from and the pattern relative to it.
+
+    Relative patterns are walked from *search_root*. An absolute pattern starts
+    at its longest literal directory prefix, so ``recursive`` counts from there.
+    """
+    if not os.path.isabs(pattern):
+        return search_root, pattern
+    parts = pattern.replace(os.sep, "/").split("/")
+    literal = 0
+    while literal < len(parts) - 1:
+        if parts[literal] == "**" or _MAGIC.search(parts[literal]):
+            break
+        literal += 1
+    root = os.sep.join(parts[:literal]) or os.sep
+    return Path(os.path.abspath(root)), "/".join(parts[literal:])
+
+
+def _walk_glob(
+    root: Path,
+    pattern: str,
+    max_depth: int,
+    listed: list | None = None,
+    stats=None,
+    follow_symlinks: bool = False,
+) -> Iterator[tuple[str, int, bool]]:
+    """Breadth‑first walk yielding the ``(path, depth, is_dir)`` entries matching *pattern*.
+
+    Names are matched case-sensitively like a POSIX shell, ``*`` also matches
+    names starting with a dot (as ``pathlib`` does) and ``**`` matches any
+    number of directories, including none; a trailing ``**`` matches files
+    too, like bash's ``globstar``. *max_depth* still bounds ``**``.
+    Symlinks and special files are skipped unless *follow_symlinks*; then the
+    depth limit is what ends a cycle. *listed* receives ``(dir, st_mtime_ns)``
+    for every directory looked into, listed or not, for the query cache.
+    """
+    segments = _compile_glob(pattern)
+    n = len(segments)
+    if stats is not None:
+        stats.stat_calls += 1
+        stats.entries_visited += 1
+    if max_depth < 0 or not root.is_dir():
+        return
+    start = _closure({0}, segments)
+    if n in start:
+        yield str(root), 0, True
+
+    clock = time.perf_counter
+    queue = deque([(str(root), 0, start)])
+    while queue:
+        current, depth, states = queue.popleft()
+        if depth >= max_depth:
+            if stats is not None:
+                stats.entries_pruned += 1
+            continue
+        started = clock() if stats is not None else 0.0
+        try:
+            if listed is not None:
+                listed.append((current, os.stat(current).st_mtime_ns))
+        except OSError:
+            continue
+
+        pending = [i for i in states if i < n]
+        children = []
+        if all(segments[i][0] == _LITERAL for i in pending):
+            # every remaining segment is a plain name: stat those, don't list
+            for name in {segments[i][1] for i in pending}:
+                path = os.path.join(current, name)
+                try:
+                    st = os.stat(path) if follow_symlinks else os.lstat(path)
+                except OSError:
+                    continue
+                finally:
+                    if stats is not None:
+                        stats.stat_calls += 1
+                if stat_module.S_ISDIR(st.st_mode):
+                    children.append((name, path, True))
+                elif stat_module.S_ISREG(st.st_mode):
+                    children.append((name, path, False))
+        else:
+            visited = pruned = 0
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        visited += 1
+                        if entry.is_symlink() and not follow_symlinks:
+                            pruned += 1
+                            continue
+                        try:
+                            is_dir = entry.is_dir()
+                            if not is_dir and not entry.is_file():
+                                pruned += 1
+                                continue
+                        except OSError:
+                            pruned += 1
+                            continue
+                        children.append((entry.name, entry.path, is_dir))
+            except OSError:
+                continue
+            finally:
+                if stats is not None:
+                    stats.dirs_listed += 1
+                    stats.entries_visited += visited
+                    stats.entries_pruned += pruned
+                    stats.record_listing(current, clock() - started)
+
+        for name, path, is_dir in children:
+            reached = _step(states, name, segments)
+            if not reached:
+                continue
+            if n in reached:
+                yield path, depth + 1, is_dir
+            if is_dir and len(reached) > (n in reached):
+                queue.append((path, depth + 1, reached))
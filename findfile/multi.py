@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# file: multi.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+import re
+import time
+from pathlib import Path
+
+from findfile.find import (
+    _compile_patterns,
+    _filter_leaf_dirs,
+    _finalize,
+    _matches_all_include,
+    _matches_any_exclude_and,
+    _matches_any_exclude_or,
+    _matches_any_include,
+    _normalize_query,
+    _select_target,
+    _walk,
+)
+from findfile.stats import FindStats, _emit_stats, _stats_for
+
+
+class _Query:
+    """One ``find_many`` spec, compiled."""
+
+    def __init__(self, spec, recursive, disable_alert):
+        if isinstance(spec, str):
+            spec = {"key": spec}
+        spec = dict(spec)
+        key = spec.pop("key", spec.pop("and_key", None))
+        or_key = spec.pop("or_key", None)
+        if isinstance(or_key, str):
+            or_key = [or_key]
+        if key and or_key:
+            raise ValueError("The key and or_key arg are contradictory!")
+        self.any = bool(or_key)
+        _, keys, _, exclude_combined, self.max_depth = _normalize_query(
+            None, or_key or key, spec.pop("exclude_key", None), spec.pop("recursive", recursive)
+        )
+        use_regex = spec.pop("use_regex", False)
+        self.want_dir = spec.pop("want", "file") == "dir"
+        self.all = spec.pop("all", False)
+        self.return_deepest_path = spec.pop("return_deepest_path", False)
+        self.return_leaf_only = spec.pop("return_leaf_only", self.want_dir)
+        exclude_logic = spec.pop("exclude_logic", "or")
+        if spec:
+            raise ValueError("Unknown find_many query options: {}".format(sorted(spec)))
+        if self.all and self.return_deepest_path:
+            raise ValueError("return_deepest_path is not supported with 'all' results.")
+
+        keys = [k for k in keys or () if k]
+        self.include = _compile_patterns(keys, use_regex, disable_alert=disable_alert)
+        self.exclude = _compile_patterns(exclude_combined, use_regex, disable_alert=disable_alert)
+        self.included = _matches_any_include if self.any else _matches_all_include
+        if exclude_logic == "or":
+            self.excluded = _matches_any_exclude_or
+        else:
+            self.excluded = _matches_any_exclude_and
+        # Plain ASCII keys without a separator are looked up in the hit sets of
+        # _Dispatcher; regexes, key-less queries and the rest are matched as usual.
+        self.literal = (
+            bool(keys)
+            and not use_regex
+            and all(k.isascii() and os.sep not in k for k in keys)
+        )
+        self.keys = frozenset(k.lower() for k in keys)
+        self.hits = []
+
+    def accepts(self, path, hit_keys=None) -> bool:
+        if hit_keys is None:
+            if not self.included(path, self.include):
+                return False
+        elif not (self.keys & hit_keys if self.any else self.keys <= hit_keys):
+            return False
+        return not self.excluded(path, self.exclude)
+
+
+class _Dispatcher:
+    """Routes every walked entry to the queries it matches.
+
+    The literal keys of all queries are searched at once: a key without a
+    separator lies either in the parent dir path (looked up once per
+    directory) or in the basename, and one combined regex over all keys rejects
+    most basenames before any per-key check. Only the queries owning a key that
+    was hit are then checked, each against the set of hit keys.
+    """
+
+    def __init__(self, queries):
+        self.queries = queries
+        self.slow = [q for q in queries if not q.literal]
+        self.by_key = {}
+        for q in queries:
+            if q.literal:
+                for k in q.keys:
+                    self.by_key.setdefault(k, []).append(q)
+        self.keys = sorted(self.by_key, key=len, reverse=True)
+        self.combined = (
+            re.compile("|".join(map(re.escape, self.keys))) if self.keys else None
+        )
+        self.parent = None
+        self.parent_hits = frozenset()
+
+    def _key_hits(self, text: str) -> frozenset:
+        if self.combined is None or not self.combined.search(text):
+            return frozenset()
+        return frozenset(k for k in self.keys if k in text)
+
+    def dispatch(self, path: str, depth: int, is_dir: bool):
+        if not path.isascii():
+            # lower() and IGNORECASE disagree on a few non-ASCII letters
+            for q in self.queries:
+                if q.want_dir == is_dir and depth <= q.max_depth and q.accepts(path):
+                    q.hits.append((path, depth))
+            return
+
+        parent, _, name = path.rpartition(os.sep)
+        if parent != self.parent:  # siblings arrive together from the walker
+            self.parent = parent
+            self.parent_hits = self._key_hits(parent.lower())
+        hit_keys = self.parent_hits
+        name_hits = self._key_hits(name.lower())
+        if name_hits:
+            hit_keys = hit_keys | name_hits
+
+        if hit_keys:
+            seen = set()
+            for k in hit_keys:
+                for q in self.by_key[k]:
+                    if id(q) in seen:
+                        continue
+                    seen.add(id(q))
+                    if (
+                        q.want_dir == is_dir
+                        and depth <= q.max_depth
+                        and q.accepts(path, hit_keys)
+                    ):
+                        q.hits.append((path, depth))
+        for q in self.slow:
+            if q.want_dir == is_dir and depth <= q.max_depth and q.accepts(path):
+                q.hits.append((path, depth))
+
+
+def find_many(
+    search_path: str | Path = None,
+    queries=(),
+    recursive: int | bool = 5,
+    return_relative_path: bool = True,
+    disable_alert: bool = False,
+    stats: FindStats | bool | None = None,
+    **walk_options,
+) -> list:
+    """
+    Answer many queries under the same 'search_path' with a single walk.
+
+    'queries' a list of key strings or dicts with the ``find_*`` options 'key' (or 'and_key'),
+        'or_key', 'exclude_key', 'use_regex', 'exclude_logic', 'recursive', 'return_deepest_path',
+        plus 'want' ("file" or "dir") and 'all' (False: one path like ``find_file``/``find_dir``,
+        True: every match like ``find_files``/``find_dirs``, with their 'return_leaf_only')
+    'recursive' default depth limit of the queries; the walk goes as deep as the deepest one
+    'return_relative_path', 'disable_alert' as in :func:`findfile.find_file`
+    'walk_options' follow_symlinks, one_file_system, skip_fstypes, workers, ... as in ``find_files``
+
+    :return one result per query, in order: a path (or None) or a list of paths
+    """
+    stats = _stats_for(stats)
+    started = time.perf_counter()
+    compiled = [_Query(spec, recursive, disable_alert) for spec in queries]
+    if not compiled:
+        return []
+    root, _, _, _, _ = _normalize_query(search_path, None, None, 0)
+    dispatcher = _Dispatcher(compiled)
+    max_depth = max(q.max_depth for q in compiled)
+
+    dispatch = dispatcher.dispatch
+    for path, depth, is_dir in _walk(root, max_depth, stats=stats, **walk_options):
+        dispatch(path, depth, is_dir)
+    walked = time.perf_counter()
+
+    results = []
+    for q in compiled:
+        if q.all:
+            res = _finalize(q.hits, return_relative_path)
+            if q.want_dir and q.return_leaf_only:
+                res = _filter_leaf_dirs(res)
+        else:
+            res = _finalize(q.hits, return_relative_path, q.return_deepest_path)
+            res = _select_target(res, q.return_deepest_path, disable_alert)
+        results.append(res)
+
+    if stats is not None:
+        stats.calls += 1
+        stats.matches += sum(len(q.hits) for q in compiled)
+        stats.walk_time += walked - started
+        stats.postprocess_time += time.perf_counter() - walked
+        stats.total_time += time.perf_counter() - started
+        stats.query = {"search_path": str(root), "queries": len(compiled)}
+        _emit_stats(stats)
+    return results
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# file: paging.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Paginated results in sorted path order.
+
+A page cursor is the last absolute path of the previous page, so any source
+that can enumerate paths in sorted order from a given key can serve the next
+page: a ``DiskCache`` bisects to it, and a live walk re-descends only into the
+directories whose subtree can still hold a later path.
+"""
+import heapq
+import os
+import time
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+
+from findfile.find import (
+    FindResult,
+    _admission,
+    _compile_patterns,
+    _finalize,
+    _matches_all_include,
+    _matches_any_exclude_and,
+    _matches_any_exclude_or,
+    _matches_any_include,
+    _normalize_query,
+    _skipped_mounts,
+)
+from findfile.stats import FindStats, _emit_stats, _stats_for
+
+_ENTRY, _EXPAND = 0, 1
+
+
+def _walk_sorted(
+    root: Path,
+    max_depth: int,
+    after: str | None = None,
+    stats: FindStats | None = None,
+    one_file_system: bool = False,
+    skip_fstypes=None,
+) -> Iterator[tuple[str, int, bool]]:
+    """The entries of :func:`findfile.find._walk`, in sorted path order, after *after*.
+
+    A heap holds listed-but-unreported entries keyed by path and unlisted dirs
+    keyed by ``dir + os.sep``, the lower bound of their descendants, so a dir
+    is only listed once the output reaches its subtree. With *after*, entries
+    up to it are dropped and dirs whose whole subtree sorts before it are
+    never listed: resuming costs one listing per level of the cursor's path.
+    """
+    if stats is not None:
+        stats.stat_calls += 3
+        stats.entries_visited += 1
+    if not root.exists() or max_depth < 0 or root.is_symlink():
+        return
+    root_is_dir = root.is_dir()
+    if not root_is_dir and not root.is_file():
+        return
+    top = str(root)
+    if after is None or top > after:
+        yield top, 0, root_is_dir
+    if not root_is_dir:
+        return
+
+    admit, needs_stat = _admission(
+        False,
+        seen_dirs=None,
+        seen_targets=None,
+        root_dev=root.stat().st_dev if one_file_system else None,
+        skip_mounts=_skipped_mounts(skip_fstypes) if skip_fstypes else None,
+    )
+    upper = chr(ord(os.sep) + 1)
+    clock = time.perf_counter
+    # (sort key, kind, path, depth, is_dir, descend); sort keys are unique
+    heap = [(top.rstrip(os.sep) + os.sep, _EXPAND, top, 0, True, True)] if max_depth > 0 else []
+    while heap:
+        key, kind, path, depth, is_dir, descend = heapq.heappop(heap)
+        if kind == _ENTRY:
+            yield path, depth, is_dir
+            if descend and depth < max_depth:
+                heapq.heappush(heap, (path + os.sep, _EXPAND, path, depth, True, True))
+            continue
+        if after is not None and key[:-1] + upper <= after:
+            continue  # everything below sorts before the cursor
+        started = clock() if stats is not None else 0.0
+        visited = pruned = 0
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    visited += 1
+                    if entry.is_symlink():
+                        pruned += 1
+                        continue
+                    try:
+                        child_is_dir = entry.is_dir()
+                        if not child_is_dir and not entry.is_file():
+                            pruned += 1
+                            continue
+                        descend = child_is_dir
+                        if admit is not None:
+                            st = entry.stat() if needs_stat(child_is_dir) else None
+                            _, descend = admit(entry.path, child_is_dir, st)
+                    except OSError:
+                        pruned += 1
+                        continue
+                    if after is None or entry.path > after:
+                        heapq.heappush(
+                            heap,
+                            (entry.path, _ENTRY, entry.path, depth + 1, child_is_dir, descend),
+                        )
+                    elif descend and depth + 1 < max_depth:
+                        # reported on an earlier page, but its subtree may not be
+                        heapq.heappush(
+                            heap,
+                            (entry.path + os.sep, _EXPAND, entry.path, depth + 1, True, True),
+                        )
+        except OSError:
+            continue
+        finally:
+            if stats is not None:
+                stats.dirs_listed += 1
+                stats.entries_visited += visited
+                stats.entries_pruned += pruned
+                stats.record_listing(path, clock() - started)
+
+
+def _find_page(
+    want: str,
+    search_path=None,
+    key=None,
+    exclude_key=None,
+    use_regex=False,
+    recursive=5,
+    page_size=1000,
+    cursor: str | None = None,
+    return_relative_path=True,
+    disable_alert=False,
+    exclude_logic="or",
+    or_key=None,
+    stats=None,
+    one_file_system=False,
+    skip_fstypes=None,
+) -> FindResult:
+    if page_size < 1:
+        raise ValueError("page_size must be positive: {}".format(page_size))
+    if key and or_key:
+        raise ValueError("The key and or_key arg are contradictory!")
+    stats = _stats_for(stats)
+    started = time.perf_counter()
+    root, keys, _, exclude_combined, recursive = _normalize_query(
+        search_path, or_key or key, exclude_key, recursive
+    )
+    include = _compile_patterns(keys, use_regex, disable_alert=disable_alert)
+    exclude = _compile_patterns(exclude_combined, use_regex, disable_alert=disable_alert)
+    included = _matches_any_include if or_key else _matches_all_include
+    excluded = _matches_any_exclude_or if exclude_logic == "or" else _matches_any_exclude_and
+    want_dir = want == "dir"
+
+    entries = _walk_sorted(
+        root,
+        recursive,
+        after=cursor,
+        stats=stats,
+        one_file_system=one_file_system,
+        skip_fstypes=skip_fstypes,
+    )
+    hits = list(
+        islice(
+            (
+                (path, depth)
+                for path, depth, is_dir in entries
+                if is_dir == want_dir
+                and included(path, include)
+                and not excluded(path, exclude)
+            ),
+            page_size,
+        )
+    )
+    entries.close()
+    return _page_result(hits, page_size, return_relative_path, stats, started, root, want)
+
+
+def _page_result(hits, page_size, return_relative_path, stats, started, root, want):
+    """The :class:`FindResult` of a page of sorted ``(path, depth)`` hits."""
+    next_cursor = hits[-1][0] if len(hits) == page_size else None
+    results = FindResult(_finalize(hits, return_relative_path), next_cursor)
+    if stats is not None:
+        stats.calls += 1
+        stats.matches += len(hits)
+        stats.total_time += time.perf_counter() - started
+        stats.query = {"search_path": str(root), "want": want, "page_size": page_size}
+        _emit_stats(stats)
+    return results
+
+
+def find_files_page(
+    search_path: str | Path = None,
+    and_key=None,
+    exclude_key=None,
+    page_size: int = 1000,
+    cursor: str | None = None,
+    **kwargs,
+) -> FindResult:
+    """
+    One page of ``find_files`` results, in sorted absolute path order.
+
+    'page_size' number of results per page
+    'cursor' the ``cursor`` of the previous page (None for the first one)
+    'key', 'or_key', 'exclude_key', 'use_regex', 'exclude_logic', 'recursive',
+        'return_relative_path', 'disable_alert' as in :func:`findfile.find_files`;
+        'one_file_system' and 'skip_fstypes' as well, symlinks are not followed
+
+    :return a :class:`findfile.FindResult`; its ``cursor`` continues after the last
+        result, and is None once a page came out short (the last page may be empty)
+    """
+    key = kwargs.pop("key", and_key)
+    return _find_page(
+        "file", search_path, key, exclude_key, page_size=page_size, cursor=cursor, **kwargs
+    )
+
+
+def find_dirs_page(
+    search_path: str | Path = None,
+    and_key=None,
+    exclude_key=None,
+    page_size: int = 1000,
+    cursor: str | None = None,
+    **kwargs,
+) -> FindResult:
+    """
+    One page of ``find_dirs`` results (every matching dir, not only the leaves),
+    in sorted absolute path order; see :func:`find_files_page`.
+    """
+    key = kwargs.pop("key", and_key)
+    return _find_page(
+        "dir", search_path, key, exclude_key, page_size=page_size, cursor=cursor, **kwargs
+    )
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# file: query_cache.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def _dirs_unchanged(listed_dirs) -> bool:
+    """Whether every ``(dir, st_mtime_ns)`` still has that mtime (None: still missing)."""
+    for path, mtime in listed_dirs:
+        try:
+            if os.stat(path).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            if mtime is not None:
+                return False
+    return True
+
+
+def _root_anchor(root) -> tuple:
+    """``(dir, st_mtime_ns)`` of *root*, or of its parent when *root* is not a dir.
+
+    Recorded for every cached query so that one that lists nothing (depth 0,
+    or a search path that is a file) is still invalidated by a change.
+    """
+    root = str(root)
+    try:
+        if not os.path.isdir(root):
+            root = os.path.dirname(os.path.abspath(root))
+        return root, os.stat(root).st_mtime_ns
+    except OSError:
+        return root, None
+
+
+class QueryCache:
+    """In-process LRU cache of raw ``_find`` traversal results.
+
+    Each entry remembers the ``st_mtime_ns`` of every directory listed while it
+    was built (at least the search root, see :func:`_root_anchor`); an entry
+    without any is never stored. A lookup re-stats those directories (one ``stat`` per directory
+    instead of a full listing walk) and drops the entry if any of them changed,
+    disappeared, or if the entry is older than *ttl* seconds. The TTL covers
+    filesystems with coarse or lazily propagated mtimes (e.g. NFS attribute
+    caching), where a directory change may not be visible immediately.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float | None = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            results, listed_dirs, created = entry
+            expired = self.ttl is not None and time.monotonic() - created > self.ttl
+            if not expired and _dirs_unchanged(listed_dirs):
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                    self.hits += 1
+                return results
+            with self._lock:
+                self._entries.pop(key, None)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, results, listed_dirs):
+        if not listed_dirs or (self.maxsize is not None and self.maxsize <= 0):
+            return  # nothing to validate the entry by
+        with self._lock:
+            self._entries[key] = (tuple(results), tuple(listed_dirs), time.monotonic())
+            self._entries.move_to_end(key)
+            while self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+_QUERY_CACHE = QueryCache()
+_QUERY_CACHE_ENABLED = False
+
+
+def enable_query_cache(maxsize: int = 128, ttl: float | None = 60.0):
+    """Cache the results of repeated identical ``find_*`` calls in this process.
+
+    'maxsize' number of distinct queries kept (LRU), None for unbounded
+    'ttl' seconds after which an entry is re-walked even if no mtime changed
+    """
+    global _QUERY_CACHE_ENABLED
+    _QUERY_CACHE.maxsize = maxsize
+    _QUERY_CACHE.ttl = ttl
+    _QUERY_CACHE_ENABLED = True
+
+
+def disable_query_cache():
+    """Stop using the query cache by default and drop all entries."""
+    global _QUERY_CACHE_ENABLED
+    _QUERY_CACHE_ENABLED = False
+    _QUERY_CACHE.clear()
+
+
+def clear_query_cache():
+    """Drop all cached queries and reset the hit/miss counters."""
+    _QUERY_CACHE.clear()
+
+
+def query_cache_info() -> CacheInfo:
+    """Return ``CacheInfo(hits, misses, maxsize, currsize)`` like ``functools.lru_cache``."""
+    return _QUERY_CACHE.info()
+
+
+def _query_cache_enabled(use_cache: bool | None) -> bool:
+    return _QUERY_CACHE_ENABLED if use_cache is None else bool(use_cache)
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+# file: server.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Index daemon answering ``find_*`` queries over a Unix domain socket.
+
+    findfile serve ~/datasets ~/experiments --depth 20
+
+keeps one :class:`findfile.DiskCache` per root in memory. The directories a
+query reads are checked by ``st_mtime_ns`` before it is answered, and all of
+them every *refresh_interval* seconds; only the changed ones are listed again.
+Library calls opt in with ``server=True`` (or a socket path, or the
+``FINDFILE_SERVER`` environment variable) and fall back to a local walk when
+no daemon answers.
+
+Protocol: every message is a 4-byte big-endian length followed by that many
+bytes of compact UTF-8 JSON. A request is ``{"op": ..., ...}``; the reply is
+``{"ok": true, ...}`` or ``{"ok": false, "error": ...}``. Ops:
+
+    ping                                    -> {"ok": true, "roots": [...]}
+    find   root, want, key, exclude_key,    -> {"ok": true, "paths": [...], "depths": [...]}
+           use_regex, recursive, exclude_logic,
+           follow_symlinks, dedupe_targets,
+           one_file_system, skip_fstypes
+    refresh                                 -> {"ok": true, "rebuilt": [...]}  (changed roots)
+"""
+import json
+import os
+import socket
+import stat
+import struct
+import threading
+
+_HEADER = struct.Struct("!I")
+_MAX_MESSAGE = 1 << 30
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "findfile.sock")
+    import tempfile
+
+    return os.path.join(tempfile.gettempdir(), "findfile-{}.sock".format(os.getuid()))
+
+
+def _recv_exact(sock, size: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(min(size - len(buf), 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed mid-message")
+        buf += chunk
+    return bytes(buf)
+
+
+def send_message(sock, obj):
+    data = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def recv_message(sock):
+    """The next message on *sock*, or None if the peer closed the connection."""
+    header = sock.recv(_HEADER.size, socket.MSG_WAITALL)
+    if not header:
+        return None
+    if len(header) < _HEADER.size:
+        header += _recv_exact(sock, _HEADER.size - len(header))
+    (size,) = _HEADER.unpack(header)
+    if size > _MAX_MESSAGE:
+        raise ValueError("message of {} bytes exceeds the limit".format(size))
+    return json.loads(_recv_exact(sock, size).decode("utf-8"))
+
+
+class IndexServer:
+    """Serve in-memory indexes of *roots* on a Unix domain socket.
+
+    'roots' directories to index; a query is answered by the deepest root containing it
+    'socket_path' defaults to :func:`default_socket_path`
+    'recursive' depth limit of every index; deeper queries fall back to a local walk
+    'refresh_interval' seconds between mtime checks of the indexed directories
+    'walk_options' e.g. follow_symlinks, one_file_system, skip_fstypes, workers and
+    listing_timeout for building the indexes; queries whose options would see other
+    entries fall back to a local walk
+    """
+
+    def __init__(
+        self,
+        roots=(),
+        socket_path: str | None = None,
+        recursive: int = 30,
+        refresh_interval: float = 2.0,
+        **walk_options,
+    ):
+        self.socket_path = socket_path or default_socket_path()
+        self.recursive = recursive
+        self.refresh_interval = refresh_interval
+        self.walk_options = walk_options
+        self.indexes = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._sock = None
+        for root in roots:
+            self.add_root(root)
+
+    def _build(self, root):
+        from findfile.file_manager import DiskCache
+
+        return DiskCache(
+            root,
+            recursive=self.recursive,
+            track_mtimes=True,
+            **self.walk_options,
+        )
+
+    def add_root(self, root):
+        if not os.path.isdir(root):
+            raise ValueError("Root '{}' is not a directory".format(root))
+        index = self._build(root)
+        with self._lock:
+            self.indexes[index.work_dir] = index
+        return index
+
+    def lookup(self, search_path: str):
+        """The index of the deepest root containing *search_path*, or None."""
+        with self._lock:
+            best = None
+            for root, index in self.indexes.items():
+                inside = search_path == root or search_path.startswith(
+                    root.rstrip(os.sep) + os.sep
+                )
+                if inside and (best is None or len(root) > len(best.work_dir)):
+                    best = index
+            return best
+
+    def refresh(self) -> list[str]:
+        """Re-list the changed dirs of every index; return the roots that changed."""
+        with self._lock:
+            indexes = list(self.indexes.items())
+        rebuilt = []
+        for root, index in indexes:
+            if self._validated(index) is not index:
+                rebuilt.append(root)
+        return rebuilt
+
+    def _validated(self, index, search_path=None, recursive=None):
+        """*index*, or a copy with the changed dirs below *search_path* listed again.
+
+        The copy is built aside and swapped in, queries keep using the old one
+        meanwhile. None if *root* itself is gone.
+        """
+        changed = index.changed_dirs(search_path, recursive)
+        if not changed:
+            return index
+        root = index.work_dir
+        if not os.path.isdir(root):
+            with self._lock:
+                if self.indexes.get(root) is index:
+                    del self.indexes[root]
+            return None
+        fresh = index.relisted(changed)
+        with self._lock:
+            if self.indexes.get(root) is index:
+                self.indexes[root] = fresh
+        return fresh
+
+    def handle(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            with self._lock:
+                return {"ok": True, "roots": sorted(self.indexes)}
+        if op == "refresh":
+            return {"ok": True, "rebuilt": self.refresh()}
+        if op != "find":
+            return {"ok": False, "error": "unknown op {!r}".format(op)}
+
+        root = request["root"]
+        recursive = int(request.get("recursive", 5))
+        index = self.lookup(root)
+        if (
+            index is None
+            or not index.walked_like(**request)
+            or not index.covers(root, recursive)
+        ):
+            return {"ok": False, "error": "not_served"}
+        # the refresh loop may lag behind: check the dirs this query reads
+        index = self._validated(index, root, recursive)
+        if index is None or not index.covers(root, recursive):
+            return {"ok": False, "error": "not_served"}
+        hits = index.query(
+            root,
+            want=request.get("want", "file"),
+            key=request.get("key"),
+            exclude_key=request.get("exclude_key"),
+            use_regex=bool(request.get("use_regex", False)),
+            recursive=recursive,
+            exclude_logic=request.get("exclude_logic", "or"),
+        )
+        return {
+            "ok": True,
+            "paths": [p for p, _ in hits],
+            "depths": [d for _, d in hits],
+        }
+
+    def _serve_connection(self, conn):
+        with conn:
+            while not self._stopped.is_set():
+                try:
+                    request = recv_message(conn)
+                except (OSError, ValueError):
+                    return
+                if request is None:
+                    return
+                try:
+                    response = self.handle(request)
+                except Exception as e:  # keep the daemon up on a bad query
+                    response = {"ok": False, "error": "{}: {}".format(type(e).__name__, e)}
+                try:
+                    send_message(conn, response)
+                except OSError:
+                    return
+
+    def _refresh_loop(self):
+        while not self._stopped.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except OSError:
+                pass
+
+    def _bind(self):
+        if os.path.exists(self.socket_path):
+            if ping(self.socket_path) is not None:
+                raise RuntimeError(
+                    "A findfile server is already running on {}".format(self.socket_path)
+                )
+            os.unlink(self.socket_path)  # stale socket of a dead server
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)  # only the owner may query
+        try:
+            sock.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        sock.listen(64)
+        return sock
+
+    def serve_forever(self):
+        self._sock = self._bind()
+        refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        refresher.start()
+        try:
+            while not self._stopped.is_set():
+                try:
+                    conn, _ = self._sock.accept()
+                except OSError:
+                    break
+                threading.Thread(
+                    target=self._serve_connection, args=(conn,), daemon=True
+                ).start()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        self._stopped.set()
+        if self._sock is not None:
+            sock, self._sock = self._sock, None
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+
+def _socket_path(server) -> str | None:
+    if server is None:
+        server = os.environ.get("FINDFILE_SERVER") or None
+    if not server:
+        return None
+    if server is True or server in ("1", "true", "default"):
+        return default_socket_path()
+    return os.fspath(server)
+
+
+def _trusted_socket(path) -> bool:
+    """True if *path* is a socket owned by the current user.
+
+    Anyone can create one in a shared temp dir, and the daemon's answers
+    decide what the ``rm_*`` functions delete.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def request(server, message: dict, timeout: float = 10.0) -> dict | None:
+    """Send one request to the daemon at *server*; None if it cannot be reached."""
+    path = _socket_path(server)
+    if path is None or not hasattr(socket, "AF_UNIX") or not _trusted_socket(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+        send_message(sock, message)
+        return recv_message(sock)
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def ping(server=True) -> list[str] | None:
+    """The roots served by the daemon, or None if no daemon is running."""
+    response = request(server, {"op": "ping"}, timeout=2.0)
+    return response["roots"] if response and response.get("ok") else None
+
+
+def _find_via_server(server, root, **query) -> list[tuple[str, int]] | None:
+    """``(path, depth)`` hits of *query* from the daemon; None means walk locally."""
+    response = request(server, dict(query, op="find", root=str(root)))
+    if not response or not response.get("ok"):
+        return None
+    return list(zip(response["paths"], response["depths"]))
+
+
+def serve(roots, socket_path=None, recursive=30, refresh_interval=2.0, **kwargs):
+    """Index *roots* and answer queries until interrupted."""
+    server = IndexServer(roots, socket_path, recursive, refresh_interval, **kwargs)
+    server.serve_forever()
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+# file: snapshot.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Snapshots of a tree on disk, and streaming diffs between two of them.
+
+    take_snapshot("datasets", "monday.snap")
+    take_snapshot("datasets", "tuesday.snap")
+    for change in diff("monday.snap", "tuesday.snap"):
+        print(change.status, change.path)  # added / removed / modified
+
+A snapshot file holds one record per file or dir, ``(path, size, mtime, inode)``
+plus the child count of dirs, in tree order: a dir comes right before its
+subtree and siblings are sorted by name. Every dir record also holds the byte
+length and a digest of its subtree, so :func:`diff` is a merge join of two
+files that seeks past every dir whose mtime, child count and subtree digest
+are unchanged. Taking a snapshot holds the sorted child list, with stats,
+of every dir on the current path, so memory grows with the width of those
+dirs but not with the size of the tree. Diffing holds only the current
+record of each of the two files.
+"""
+import hashlib
+import os
+import struct
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from findfile.find import __FINDFILE_IGNORE__, _compile_patterns, _matches_any_exclude_or
+
+_MAGIC = b"findfile-snapshot\x001\n"
+_HEADER = struct.Struct("<Iid")  # root length, recursive, created
+# path length, is_dir, size, mtime_ns, inode, children, subtree bytes, subtree digest
+_RECORD = struct.Struct("<I?qqQIQ16s")
+_NO_DIGEST = bytes(16)
+
+
+class Record(NamedTuple):
+    """One entry; *path* is relative to the snapshot root, ``/``-separated ("" for the root)."""
+
+    path: str
+    is_dir: bool
+    size: int
+    mtime_ns: int
+    inode: int
+    children: int  # files and dirs directly inside a dir (0 for files)
+
+
+class Change(NamedTuple):
+    status: str  # "added", "removed" or "modified"
+    path: str
+    old: Record | None
+    new: Record | None
+
+
+def _pack(rel: bytes, is_dir, st, children=0, span=0, digest=_NO_DIGEST) -> bytes:
+    head = _RECORD.pack(
+        len(rel), is_dir, st.st_size, st.st_mtime_ns, st.st_ino, children, span, digest
+    )
+    return head + rel
+
+
+def _children(path, rel, depth, recursive, ignore) -> list:
+    """``(name, path, rel, is_dir, stat)`` of the files and dirs in *path*, sorted by name."""
+    if depth >= recursive:
+        return []
+    children = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_symlink():
+                        continue
+                    is_dir = entry.is_dir()
+                    if not is_dir and not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if _matches_any_exclude_or(entry.path, ignore):
+                    continue
+                child = rel + "/" + entry.name if rel else entry.name
+                children.append((entry.name, entry.path, child, is_dir, st))
+    except OSError:
+        return []
+    children.sort(key=lambda c: c[0])
+    return children
+
+
+def take_snapshot(search_path, snapshot_file, recursive: int = 30) -> "Snapshot":
+    """Record every file and dir within *recursive* levels of *search_path*.
+
+    Symlinks, special files and paths matching the global ignore list are
+    left out, as in a :class:`findfile.DiskCache`. The file is written to a
+    temporary name and renamed into place.
+    """
+    root = Path(search_path or Path.cwd()).expanduser().resolve()
+    root_st = os.stat(root)
+    if not os.path.isdir(root):
+        raise NotADirectoryError(str(root))
+    ignore = _compile_patterns(list(__FINDFILE_IGNORE__), False, disable_alert=True)
+    recursive = int(recursive)
+    tmp = "{}.{}.tmp".format(snapshot_file, os.getpid())
+    try:
+        with open(tmp, "wb") as f:
+            encoded_root = os.fsencode(str(root))
+            f.write(_MAGIC)
+            f.write(_HEADER.pack(len(encoded_root), recursive, time.time()))
+            f.write(encoded_root)
+
+            def open_dir(path, rel, depth, st):
+                children = _children(path, rel, depth, recursive, ignore)
+                frame = [iter(children), depth, os.fsencode(rel), st, len(children), f.tell()]
+                f.write(_pack(frame[2], True, st, len(children)))
+                frame.append(f.tell())  # where the subtree starts
+                frame.append(hashlib.blake2b(digest_size=16))
+                return frame
+
+            stack = [open_dir(str(root), "", 0, root_st)]
+            while stack:
+                it, depth, rel, st, count, offset, start, digest = stack[-1]
+                child = next(it, None)
+                if child is None:
+                    # the subtree is complete: fill in its length and digest
+                    stack.pop()
+                    end = f.tell()
+                    record = _pack(rel, True, st, count, end - start, digest.digest())
+                    f.seek(offset)
+                    f.write(record)
+                    f.seek(end)
+                    if stack:
+                        stack[-1][7].update(record)
+                    continue
+                _, path, child_rel, is_dir, child_st = child
+                if is_dir:
+                    stack.append(open_dir(path, child_rel, depth + 1, child_st))
+                else:
+                    record = _pack(os.fsencode(child_rel), False, child_st)
+                    f.write(record)
+                    digest.update(record)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, snapshot_file)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return Snapshot(snapshot_file)
+
+
+class _Reader:
+    """Sequential records of a snapshot file, with :meth:`skip` over a dir's subtree."""
+
+    def __init__(self, f):
+        self.f = f
+
+    def next(self):
+        """``(record, tree key, subtree bytes, digest)`` or None at the end."""
+        head = self.f.read(_RECORD.size)
+        if not head:
+            return None
+        if len(head) < _RECORD.size:
+            raise ValueError("Truncated snapshot: {}".format(self.f.name))
+        n, is_dir, size, mtime_ns, inode, children, span, digest = _RECORD.unpack(head)
+        path = os.fsdecode(self.f.read(n))
+        record = Record(path, is_dir, size, mtime_ns, inode, children)
+        return record, tuple(path.split("/")) if path else (), span, digest
+
+    def skip(self, span):
+        self.f.seek(span, os.SEEK_CUR)
+
+
+class Snapshot:
+    """A snapshot file written by :func:`take_snapshot`; iterating yields its :class:`Record` s."""
+
+    def __init__(self, snapshot_file):
+        self.file = str(snapshot_file)
+        with open(self.file, "rb") as f:
+            self._read_header(f)
+
+    def _read_header(self, f):
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError("Not a findfile snapshot: {}".format(self.file))
+        n, self.recursive, self.created = _HEADER.unpack(f.read(_HEADER.size))
+        self.root = os.fsdecode(f.read(n))
+
+    def _open(self):
+        f = open(self.file, "rb")
+        self._read_header(f)
+        return f
+
+    def __iter__(self) -> Iterator[Record]:
+        with self._open() as f:
+            reader = _Reader(f)
+            item = reader.next()
+            while item is not None:
+                yield item[0]
+                item = reader.next()
+
+    def __repr__(self):
+        return "Snapshot({!r} of {}, recursive={})".format(self.file, self.root, self.recursive)
+
+
+def _modified(old: Record, new: Record) -> bool:
+    if old.is_dir:
+        return old.mtime_ns != new.mtime_ns or old.children != new.children
+    return (old.size, old.mtime_ns, old.inode) != (new.size, new.mtime_ns, new.inode)
+
+
+def diff(old, new) -> Iterator[Change]:
+    """Stream the :class:`Change` s from snapshot *old* to snapshot *new*, in tree order.
+
+    'old', 'new' :class:`Snapshot` s or snapshot file paths, taken with the same
+        ``recursive``; paths are compared relative to the snapshot roots
+
+    Both files are read once, side by side. A dir whose mtime and child count
+    are unchanged is skipped with its whole subtree when the subtree digests
+    agree too: mtime and count alone would miss files rewritten in place. A
+    file is modified when its size, mtime or inode changed, a dir when its
+    mtime or child count did; a path that turned from file to dir (or back)
+    is removed and added.
+    """
+    old = old if isinstance(old, Snapshot) else Snapshot(old)
+    new = new if isinstance(new, Snapshot) else Snapshot(new)
+    if old.recursive != new.recursive:
+        raise ValueError(
+            "Snapshots of different depths: {} and {}".format(old.recursive, new.recursive)
+        )
+    with old._open() as f_old, new._open() as f_new:
+        a, b = _Reader(f_old), _Reader(f_new)
+        x, y = a.next(), b.next()
+        while x is not None or y is not None:
+            if y is None or (x is not None and x[1] < y[1]):
+                yield Change("removed", x[0].path, x[0], None)
+                x = a.next()
+            elif x is None or y[1] < x[1]:
+                yield Change("added", y[0].path, None, y[0])
+                y = b.next()
+            else:
+                (r, _, span, digest), (s, _, span_new, digest_new) = x, y
+                if r.is_dir != s.is_dir:
+                    yield Change("removed", r.path, r, None)
+                    yield Change("added", s.path, None, s)
+                elif r.is_dir and digest == digest_new and not _modified(r, s):
+                    a.skip(span)
+                    b.skip(span_new)
+                elif _modified(r, s):
+                    yield Change("modified", r.path, r, s)
+                x, y = a.next(), b.next()
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# file: stats.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import heapq
+import sys
+
+_STATS_HOOKS = []
+
+
+class FindStats:
+    """Traversal counters and phase timings of one or more ``_find`` calls.
+
+    Pass an instance as ``stats=`` to any ``find_*`` function to have it filled
+    in (counters accumulate over calls, e.g. for every ``or_key``), or pass
+    ``stats=True`` to only feed the registered hooks and the ``findfile`` logger.
+
+    'dirs_listed' directories whose entries were listed
+    'entries_visited' directory entries seen by the walker, plus the root
+    'stat_calls' explicit stat calls; type checks served by ``scandir`` are free
+    'entries_pruned' symlinks, special files and dirs not descended (depth limit)
+    'dirs_timed_out' listings abandoned after ``listing_timeout`` seconds
+    'throttle_sleep' seconds the walk waited on its :class:`findfile.Throttle`
+    'bytes_read' file contents read by :func:`findfile.find_duplicates`
+    'regex_evals' pattern searches run by the include/exclude matchers
+    'matches' entries that passed the matchers
+    'walk_time', 'match_time', 'postprocess_time', 'total_time' seconds per phase
+    'slowest_dirs' the slowest directory listings as (seconds, dir), slowest first
+    'dirs_per_second', 'stats_per_second' achieved rates over 'walk_time'
+    """
+
+    max_slowest = 10
+
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.dirs_listed = 0
+        self.entries_visited = 0
+        self.stat_calls = 0
+        self.entries_pruned = 0
+        self.dirs_timed_out = 0
+        self.throttle_sleep = 0.0
+        self.bytes_read = 0
+        self.regex_evals = 0
+        self.matches = 0
+        self.walk_time = 0.0
+        self.match_time = 0.0
+        self.postprocess_time = 0.0
+        self.total_time = 0.0
+        self.query = None
+        self._slowest = []
+
+    def record_listing(self, path: str, seconds: float):
+        if len(self._slowest) < self.max_slowest:
+            heapq.heappush(self._slowest, (seconds, path))
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, path))
+
+    @property
+    def dirs_per_second(self) -> float:
+        return self.dirs_listed / self.walk_time if self.walk_time else 0.0
+
+    @property
+    def stats_per_second(self) -> float:
+        return self.stat_calls / self.walk_time if self.walk_time else 0.0
+
+    @property
+    def slowest_dirs(self) -> list:
+        return sorted(self._slowest, reverse=True)
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "dirs_listed": self.dirs_listed,
+            "entries_visited": self.entries_visited,
+            "stat_calls": self.stat_calls,
+            "entries_pruned": self.entries_pruned,
+            "dirs_timed_out": self.dirs_timed_out,
+            "throttle_sleep": self.throttle_sleep,
+            "bytes_read": self.bytes_read,
+            "dirs_per_second": self.dirs_per_second,
+            "stats_per_second": self.stats_per_second,
+            "regex_evals": self.regex_evals,
+            "matches": self.matches,
+            "walk_time": self.walk_time,
+            "match_time": self.match_time,
+            "postprocess_time": self.postprocess_time,
+            "total_time": self.total_time,
+            "slowest_dirs": self.slowest_dirs,
+            "query": self.query,
+        }
+
+    def __repr__(self):
+        return (
+            "FindStats(dirs_listed={}, entries_visited={}, matches={}, "
+            "regex_evals={}, total_time={:.4f}s)".format(
+                self.dirs_listed,
+                self.entries_visited,
+                self.matches,
+                self.regex_evals,
+                self.total_time,
+            )
+        )
+
+
+class _CountingPattern:
+    """Proxy of a compiled pattern that counts ``search`` calls into *stats*."""
+
+    __slots__ = ("pattern", "stats")
+
+    def __init__(self, pattern, stats: FindStats):
+        self.pattern = pattern
+        self.stats = stats
+
+    def search(self, string):
+        self.stats.regex_evals += 1
+        return self.pattern.search(string)
+
+
+def add_stats_hook(hook):
+    """Call ``hook(stats)`` with a :class:`FindStats` after every ``_find`` call.
+
+    Registering a hook turns statistics collection on for all queries, e.g. to
+    ship them to a monitoring system; remove it with :func:`remove_stats_hook`.
+    """
+    if hook not in _STATS_HOOKS:
+        _STATS_HOOKS.append(hook)
+
+
+def remove_stats_hook(hook):
+    if hook in _STATS_HOOKS:
+        _STATS_HOOKS.remove(hook)
+
+
+def _debug_logger():
+    """The ``findfile`` logger if it logs DEBUG records, without importing logging.
+
+    Nobody can have configured the logger unless ``logging`` was imported, so the
+    module is only looked up, which keeps it off the ``import findfile`` path.
+    """
+    logging = sys.modules.get("logging")
+    if logging is None:
+        return None
+    logger = logging.getLogger("findfile")
+    return logger if logger.isEnabledFor(logging.DEBUG) else None
+
+
+def _stats_for(stats) -> FindStats | None:
+    """The stats object to fill for this call, or None when nobody listens."""
+    if isinstance(stats, FindStats):
+        return stats
+    if stats or _STATS_HOOKS or _debug_logger() is not None:
+        return FindStats()
+    return None
+
+
+def _emit_stats(stats: FindStats):
+    for hook in list(_STATS_HOOKS):
+        hook(stats)
+    logger = _debug_logger()
+    if logger is not None:
+        logger.debug("findfile query %s: %r", stats.query, stats)
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+# file: throttle.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""Rate limits for walks that must not disturb other workloads on the host.
+
+    throttle = Throttle(dirs_per_second=200, stats_per_second=2000, adaptive=True)
+    DiskCache("/mnt/shared", recursive=30, throttle=throttle)
+    print(throttle.rates())
+
+The walkers call :meth:`Throttle.before_listing` before and
+:meth:`Throttle.after_listing` after every directory listing, from whichever
+thread lists it; one instance may be shared by several walks to cap them
+together.
+"""
+import os
+import sys
+import threading
+import time
+
+# ioprio_set(2) syscall numbers; other platforms only get the CPU hint
+_IOPRIO_SET = {"x86_64": 251, "aarch64": 30, "i686": 289, "i386": 289}
+_IOPRIO_CLASS_IDLE = 3
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_WHO_PROCESS = 1
+
+
+def _lower_thread_priority():
+    """Best effort: lowest CPU priority and the idle I/O class for the calling thread.
+
+    On Linux both apply to the calling thread only (its native id is a valid
+    ``PRIO_PROCESS``/``IOPRIO_WHO_PROCESS`` target). Neither can be undone
+    without privileges, so use it from background threads or processes.
+    """
+    tid = threading.get_native_id()
+    try:
+        os.setpriority(os.PRIO_PROCESS, tid if sys.platform.startswith("linux") else 0, 19)
+    except (AttributeError, OSError):
+        pass
+    number = _IOPRIO_SET.get(os.uname().machine) if hasattr(os, "uname") else None
+    if number is None or not sys.platform.startswith("linux"):
+        return
+    try:
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.syscall(number, _IOPRIO_WHO_PROCESS, tid, _IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT)
+    except (OSError, AttributeError):
+        pass
+
+
+class _TokenBucket:
+    """*rate* tokens per second, at most *burst* saved up; callers may go into debt."""
+
+    def __init__(self, rate: float, burst: float | None = None):
+        if rate <= 0:
+            raise ValueError("rates must be positive: {}".format(rate))
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.tokens = self.burst
+        self.last = time.monotonic()
+
+    def reserve(self, n: float) -> float:
+        """Take *n* tokens; return how long to sleep until they are covered."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        self.tokens -= n
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class Throttle:
+    """Token-bucket limits, latency back-off and a low-priority hint for walks.
+
+    'dirs_per_second' maximum directory listings per second
+    'stats_per_second' maximum stat calls per second (the mtime stat of a tracked
+        listing included; type checks answered by ``scandir`` are free)
+    'burst' tokens that may be saved up, default one second's worth
+    'adaptive' pause before each listing while listings are slow: while the recent
+        latency per listed entry (a fast moving average) exceeds 'latency_target', the
+        pause is a factor, doubling up to 64, times the duration of the last listing
+        (at most 'max_backoff' seconds); the factor halves again once it is below, so
+        busy storage is left alone in proportion to how slow it has become
+    'latency_target' seconds per listed entry; default three times the usual latency
+        (a slow moving average over the whole walk): back off when the storage gets busier
+    'low_priority' lowest CPU priority and idle I/O class for the listing threads,
+        see :func:`_lower_thread_priority`; that cannot be undone, so the walks list
+        on threads of their own and the caller's thread keeps its priority
+    """
+
+    def __init__(
+        self,
+        dirs_per_second: float | None = None,
+        stats_per_second: float | None = None,
+        burst: float | None = None,
+        adaptive: bool = False,
+        latency_target: float | None = None,
+        max_backoff: float = 1.0,
+        low_priority: bool = False,
+    ):
+        self.dirs_per_second = dirs_per_second
+        self.stats_per_second = stats_per_second
+        self.burst = burst
+        self.adaptive = adaptive
+        self.latency_target = latency_target
+        self.max_backoff = max_backoff
+        self.low_priority = low_priority
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._dirs = self._stats = None
+        if self.dirs_per_second:
+            self._dirs = _TokenBucket(self.dirs_per_second, self.burst)
+        if self.stats_per_second:
+            self._stats = _TokenBucket(self.stats_per_second, self.burst)
+        self._lowered = threading.local()  # per thread: idents are reused by new threads
+        self._recent = None  # moving averages of the listing seconds
+        self._usual = None
+        self._factor = 0.0
+        self.backoff = 0.0
+        self.dirs = 0
+        self.stats = 0
+        self.slept = 0.0
+        self.started = None
+
+    def __getstate__(self):
+        # pickled with a DiskCache's build options: keep the limits, not the counters
+        return {
+            k: getattr(self, k)
+            for k in (
+                "dirs_per_second",
+                "stats_per_second",
+                "burst",
+                "adaptive",
+                "latency_target",
+                "max_backoff",
+                "low_priority",
+            )
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    def _sleep(self, seconds: float) -> float:
+        if seconds > 0:
+            time.sleep(seconds)
+            with self._lock:
+                self.slept += seconds
+        return seconds
+
+    def before_listing(self) -> float:
+        """Wait for a listing token (and the back-off pause); return the seconds slept."""
+        if self.low_priority and not getattr(self._lowered, "done", False):
+            self._lowered.done = True
+            _lower_thread_priority()
+        with self._lock:
+            if self.started is None:
+                self.started = time.monotonic()
+            self.dirs += 1
+            wait = self._dirs.reserve(1) if self._dirs is not None else 0.0
+            wait += self.backoff
+        return self._sleep(wait)
+
+    def after_listing(self, seconds: float, stat_calls: int = 0, entries: int = 1) -> float:
+        """Account a listing of *entries* that took *seconds* and made *stat_calls*.
+
+        Returns the seconds slept to keep the stat rate.
+        """
+        with self._lock:
+            self.stats += stat_calls
+            wait = 0.0
+            if self._stats is not None and stat_calls:
+                wait = self._stats.reserve(stat_calls)
+            if self.adaptive:
+                self._adapt(seconds, entries)
+        return self._sleep(wait)
+
+    def _adapt(self, seconds: float, entries: int):
+        # per entry, so that large directories do not look slow
+        latency = seconds / max(1, entries)
+        if self._recent is None:
+            self._recent = self._usual = latency
+        self._recent = 0.8 * self._recent + 0.2 * latency
+        self._usual = 0.99 * self._usual + 0.01 * latency
+        target = self.latency_target if self.latency_target is not None else 3 * self._usual
+        if self._recent > target:
+            self._factor = min(64.0, max(1.0, 2 * self._factor))
+        else:
+            self._factor = self._factor / 2 if self._factor > 1 else 0.0
+        self.backoff = min(self.max_backoff, self._factor * seconds)
+
+    def rates(self) -> dict:
+        """Achieved listings and stats per second since the first listing, and time slept."""
+        elapsed = time.monotonic() - self.started if self.started is not None else 0.0
+        return {
+            "dirs": self.dirs,
+            "stats": self.stats,
+            "elapsed": elapsed,
+            "dirs_per_second": self.dirs / elapsed if elapsed else 0.0,
+            "stats_per_second": self.stats / elapsed if elapsed else 0.0,
+            "slept": self.slept,
+            "backoff": self.backoff,
+        }
+
+    def __repr__(self):
+        return "Throttle(dirs_per_second={}, stats_per_second={}, adaptive={})".format(
+            self.dirs_per_second, self.stats_per_second, self.adaptive
+        )
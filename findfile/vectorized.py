@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# file: vectorized.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+"""NumPy engine for matching literal keys against many cached paths at once.
+
+The lowercased paths are stored as one fixed-width byte array, so include,
+exclude and extension filters become vectorised ``np.char`` calls producing
+boolean masks. Results equal those of the regex matchers in
+:mod:`findfile.find`: ``re.IGNORECASE`` and ``str.lower`` only agree on ASCII,
+so non-ASCII paths (and queries with non-ASCII keys) are matched in Python.
+
+Requires numpy (``pip install findfile[numpy]``); used through
+``DiskCache(..., engine="numpy")``.
+"""
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "engine='numpy' needs numpy, install it with: pip install findfile[numpy]"
+    ) from e
+
+from findfile.find import (
+    _compile_extensions,
+    _compile_patterns,
+    _matches_all_include,
+    _matches_any_exclude_and,
+    _matches_any_exclude_or,
+)
+
+
+def _as_list(keys) -> list[str]:
+    if keys is None:
+        return []
+    return [keys] if isinstance(keys, str) else list(keys)
+
+
+class PathArray:
+    """Lowercased *paths* as an ``S<width>`` array; non-ASCII rows are kept aside."""
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.size = len(paths)
+        ascii_rows = [p.isascii() for p in paths]
+        self.fallback = np.flatnonzero(~np.array(ascii_rows, dtype=bool))
+        self.lowered = np.array(
+            [p.lower().encode("ascii") if a else b"" for p, a in zip(paths, ascii_rows)],
+            dtype="S{}".format(max((len(p) for p in paths), default=1) or 1),
+        )
+
+    def _key_mask(self, key: str, masks: dict, lo: int, hi: int):
+        mask = masks.get(key)
+        if mask is None:
+            mask = np.char.find(self.lowered[lo:hi], key.lower().encode("ascii")) >= 0
+            masks[key] = mask
+        return mask
+
+    def mask(
+        self,
+        key=None,
+        exclude_key=None,
+        exclude_logic="or",
+        extensions=None,
+        lo=0,
+        hi=None,
+        _masks=None,
+    ):
+        """Boolean mask over ``paths[lo:hi]`` of the paths a query accepts.
+
+        'key' all must be contained, 'exclude_key' any (exclude_logic "or") or all
+        ("and") must not be, 'extensions' one of them must end the path; all
+        case-insensitive literal substrings as in :func:`findfile.find_files`.
+        """
+        hi = self.size if hi is None else hi
+        keys, excludes, exts = _as_list(key), _as_list(exclude_key), _as_list(extensions)
+        if not all(k.isascii() for k in keys + excludes + exts):
+            return self._python_mask(keys, excludes, exclude_logic, exts, lo, hi)
+        masks = {} if _masks is None else _masks.setdefault((lo, hi), {})
+
+        accepted = np.ones(hi - lo, dtype=bool)
+        for k in keys:
+            accepted &= self._key_mask(k, masks, lo, hi)
+        if excludes:
+            hit = [self._key_mask(e, masks, lo, hi) for e in excludes]
+            combine = np.logical_or if exclude_logic == "or" else np.logical_and
+            accepted &= ~combine.reduce(hit)
+        if exts:
+            suffixes = [e.lower().encode("ascii") for e in exts]
+            ends = np.zeros(hi - lo, dtype=bool)
+            for s in suffixes:
+                ends |= np.char.endswith(self.lowered[lo:hi], s)
+            accepted &= ends
+
+        # rows the byte array cannot answer exactly
+        rows = self.fallback[(self.fallback >= lo) & (self.fallback < hi)]
+        if len(rows):
+            accepted[rows - lo] = self._python_mask(
+                keys, excludes, exclude_logic, exts, rows=rows
+            )
+        return accepted
+
+    def _python_mask(self, keys, excludes, exclude_logic, exts, lo=0, hi=0, rows=None):
+        include = _compile_patterns(keys, False, disable_alert=True)
+        exclude = _compile_patterns(excludes, False, disable_alert=True)
+        excluded = _matches_any_exclude_or if exclude_logic == "or" else _matches_any_exclude_and
+        ext = _compile_extensions(exts)
+        rows = range(lo, hi) if rows is None else rows
+        return np.fromiter(
+            (
+                _matches_all_include(self.paths[i], include)
+                and not excluded(self.paths[i], exclude)
+                and (ext is None or ext.search(self.paths[i]) is not None)
+                for i in rows
+            ),
+            dtype=bool,
+            count=len(rows),
+        )
+
+    def match_ids(self, key=None, exclude_key=None, exclude_logic="or", extensions=None):
+        """Sorted ids of the accepted paths."""
+        return np.flatnonzero(self.mask(key, exclude_key, exclude_logic, extensions))
+
+    def match_many(self, queries) -> list:
+        """Ids per query dict (``key``, ``exclude_key``, ``exclude_logic``, ``extensions``).
+
+        The mask of every distinct key is computed once for the whole batch, so
+        thousands of key combinations cost one scan per distinct key.
+        """
+        masks = {}
+        return [
+            np.flatnonzero(
+                self.mask(
+                    q.get("key"),
+                    q.get("exclude_key"),
+                    q.get("exclude_logic", "or"),
+                    q.get("extensions"),
+                    _masks=masks,
+                )
+            )
+            for q in queries
+        ]
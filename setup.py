@@ -27,4 +27,12 @@ setup(
     install_requires=[
         "termcolor",
     ],
+    extras_require={
+        "numpy": ["numpy"],
+    },
+    entry_points={
+        "console_scripts": [
+            "findfile = findfile.cli:main",
+        ],
+    },
 )
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# file: conftest.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import pytest
+
+FILES = [
+    "c.py",
+    "a/x.py",
+    "a/y.txt",
+    "a/a1/z.py",
+    "a/a1/deep/w.py",
+    "b/x.py",
+    "b/b1/u.txt",
+    "b/b1/b2/v.py",
+    "d/e/f/g.py",
+] + ["wide/f{:02d}.py".format(i) for i in range(30)]
+DIRS = ["empty", "a/a2"]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A small tree with nested, wide and empty dirs; its resolved root as a str."""
+    root = tmp_path.resolve() / "tree"
+    for rel in DIRS:
+        (root / rel).mkdir(parents=True)
+    for rel in FILES:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+    return str(root)
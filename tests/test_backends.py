@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# file: test_backends.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+
+import pytest
+
+from findfile import (
+    DictObjectStore,
+    LocalBackend,
+    MemoryBackend,
+    PrefixBackend,
+    find_dirs,
+    find_file,
+    find_files,
+    rm_files,
+)
+
+
+def contents(tree):
+    """``({"rel/path": bytes}, [empty dirs])`` of *tree*, ``/``-separated."""
+    files, empty = {}, []
+    for top, dirs, names in os.walk(tree):
+        rel = os.path.relpath(top, tree).replace(os.sep, "/")
+        prefix = "" if rel == "." else rel + "/"
+        if not dirs and not names:
+            empty.append(rel)
+        for name in names:
+            with open(os.path.join(top, name), "rb") as f:
+                files[prefix + name] = f.read()
+    return files, empty
+
+
+def memory(tree):
+    files, empty = contents(tree)
+    return MemoryBackend({"/" + k: v for k, v in files.items()}, dirs=["/" + d for d in empty])
+
+
+def store(tree):
+    files, empty = contents(tree)
+    return DictObjectStore(dict(files, **{d + "/": b"" for d in empty}))  # dir markers
+
+
+BACKENDS = {
+    "memory": (memory, "/"),
+    "prefix-flat": (lambda tree: PrefixBackend(store(tree), page_size=7), ""),
+    "prefix-levels": (lambda tree: PrefixBackend(store(tree), page_size=7, flat=False), ""),
+}
+
+
+def local(tree, find, search_path, key, **kwargs):
+    found = find(os.path.join(tree, search_path), key, return_relative_path=False, **kwargs)
+    return sorted(os.path.relpath(p, tree).replace(os.sep, "/") for p in found)
+
+
+def remote(backend, top, find, search_path, key, **kwargs):
+    found = find(top + search_path, key, backend=backend, return_relative_path=False, **kwargs)
+    return sorted(p[len(top) :] or "." for p in found)
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+@pytest.mark.parametrize("search_path", ["", "a", "b/b1"])
+@pytest.mark.parametrize("recursive", [0, 1, 2, 10])
+def test_backends_find_what_the_local_walk_finds(tree, name, search_path, recursive):
+    make, top = BACKENDS[name]
+    backend = make(tree)
+    for key in ("", ".py", "b1"):
+        for find, extra in ((find_files, {}), (find_dirs, {"return_leaf_only": False})):
+            expected = local(tree, find, search_path, key, recursive=recursive, **extra)
+            if search_path == "" and find is find_dirs and top == "":
+                expected = [p for p in expected if p != "."]  # a bucket has no name
+            found = remote(backend, top, find, search_path, key, recursive=recursive, **extra)
+            assert found == expected, (find.__name__, key)
+
+
+def test_flat_listing_needs_fewer_requests(tree):
+    files, empty = contents(tree)
+    keys = len(files) + len(empty)
+    page_size = 7
+    flat, levels = store(tree), store(tree)
+    found = find_files("", ".py", backend=PrefixBackend(flat, page_size), recursive=10)
+    assert sorted(found) == sorted(
+        find_files("", ".py", backend=PrefixBackend(levels, page_size, flat=False), recursive=10)
+    )
+    # one request for the root stat, then every page of the whole bucket
+    assert flat.calls == 1 + keys // page_size + 1
+    assert levels.calls > flat.calls
+    levels.calls = 0
+    find_files("", ".py", backend=PrefixBackend(levels, page_size, flat=False), recursive=1)
+    assert levels.calls == 2  # the root stat and one page of the top level
+
+
+def test_local_backend_is_the_local_walk(tree):
+    kwargs = dict(recursive=10, return_relative_path=False, use_cache=False)
+    assert find_files(tree, ".py", backend=LocalBackend(), **kwargs) == find_files(
+        tree, ".py", **kwargs
+    )
+
+
+def test_reading_and_unsupported_options(tree):
+    backend = memory(tree)
+    path = find_file("/", "u.txt", backend=backend, recursive=10)
+    assert path == "/b/b1/u.txt"
+    with backend.open(path, "r") as f:
+        assert f.read() == "b/b1/u.txt"
+    with pytest.raises(ValueError):
+        find_files("/", ".py", backend=backend, follow_symlinks=True)
+    with pytest.raises(ValueError):
+        find_files("/", backend=backend, glob="*.py")
+    with pytest.raises(ValueError):
+        rm_files("/", ".py", backend=backend)
+    assert os.path.exists(os.path.join(tree, "c.py"))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# file: test_budgets.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import pytest
+
+from findfile import FindResult, find_dir, find_dirs, find_file, find_files
+from findfile.file_manager import FileManager
+
+
+def resumed(search, max_entries):
+    """Every page of a budgeted search, resumed until complete."""
+    pages = [search(max_entries=max_entries)]
+    while not pages[-1].complete:
+        assert len(pages) < 100
+        pages.append(search(max_entries=max_entries, cursor=pages[-1].cursor))
+    return pages
+
+
+@pytest.mark.parametrize("max_entries", [1, 3, 7, 1000])
+@pytest.mark.parametrize("key", ["", ".py", "x"])
+def test_cursor_resume_equals_a_full_run(tree, max_entries, key):
+    def search(**budget):
+        return find_files(tree, key, recursive=10, return_relative_path=False, **budget)
+
+    pages = resumed(search, max_entries)
+    assert all(isinstance(page, FindResult) for page in pages)
+    assert [p for page in pages for p in page] == find_files(
+        tree, key, recursive=10, return_relative_path=False, use_cache=False
+    )
+
+
+def test_resumed_dirs_equal_a_full_run(tree):
+    def search(**budget):
+        return find_dirs(
+            tree, "", recursive=10, return_relative_path=False, return_leaf_only=False, **budget
+        )
+
+    pages = resumed(search, 2)
+    assert len(pages) > 1
+    assert [p for page in pages for p in page] == find_dirs(
+        tree, "", recursive=10, return_relative_path=False, return_leaf_only=False, use_cache=False
+    )
+
+
+@pytest.mark.parametrize("options", [{}, {"follow_symlinks": True, "dedupe_targets": True}])
+def test_a_cursor_resumes_the_same_way_twice(tree, options):
+    def search(**budget):
+        return find_files(tree, "", recursive=10, return_relative_path=False, **options, **budget)
+
+    first = search(max_entries=3)
+    assert not first.complete
+    rest = [search(cursor=first.cursor) for _ in range(2)]
+    assert rest[0] == rest[1]
+    assert first + rest[0] == find_files(
+        tree, "", recursive=10, return_relative_path=False, use_cache=False, **options
+    )
+
+
+def test_cursor_of_another_query_raises(tree):
+    first = find_files(tree, ".py", recursive=10, max_entries=1)
+    assert not first.complete
+    with pytest.raises(ValueError):
+        find_files(tree, ".txt", recursive=10, cursor=first.cursor)
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda tree: find_file(tree, ".py", max_entries=5),
+        lambda tree: find_dir(tree, "a", timeout=5.0),
+        lambda tree: find_dirs(tree, "a", max_entries=5),
+        lambda tree: find_files(tree, or_key=["x", "y"], max_entries=5),
+        lambda tree: FileManager(tree).find_file(tree, ".py", max_entries=5),
+        lambda tree: FileManager(tree).find_dirs(tree, "a", max_entries=5),
+    ],
+)
+def test_budget_with_a_post_processed_result_raises(tree, call):
+    with pytest.raises(ValueError):
+        call(tree)
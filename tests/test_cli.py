@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# file: test_cli.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import json
+import os
+
+import pytest
+
+from findfile import find_dirs, find_files
+from findfile.cli import main
+
+
+def walked(tree, key, **kwargs):
+    return sorted(find_files(tree, key, return_relative_path=False, use_cache=False, **kwargs))
+
+
+def test_nul_separated_output(tree, capsys):
+    assert main([".py", "-p", tree, "-d", "10", "-0", "-a"]) == 0
+    out = capsys.readouterr().out
+    assert out.endswith("\0") and "\n" not in out
+    assert sorted(out[:-1].split("\0")) == walked(tree, ".py", recursive=10)
+
+
+def test_json_lines_relative_to_the_cwd(tree, capsys, monkeypatch):
+    monkeypatch.chdir(os.path.join(tree, "a"))
+    assert main(["-p", ".", "-t", "d", "-d", "10", "--json"]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert {line["type"] for line in lines} == {"dir"}
+    assert sorted(line["path"] for line in lines) == sorted(
+        find_dirs(".", "", recursive=10, return_leaf_only=False, use_cache=False)
+    )
+
+
+def test_or_keys_and_no_match(tree, capsys):
+    assert main(["-o", "u.txt", "v.py", "-p", tree, "-d", "10", "-a"]) == 0
+    assert sorted(capsys.readouterr().out.split()) == walked(
+        tree, "", or_key=["u.txt", "v.py"], recursive=10
+    )
+    assert main(["nothing-like-this", "-p", tree]) == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_stats_go_to_stderr(tree, capsys):
+    main([".txt", "-p", tree, "-d", "10", "--stats"])
+    captured = capsys.readouterr()
+    report = json.loads(captured.err)
+    assert report["results"] == len(captured.out.split()) == 2
+
+
+@pytest.mark.parametrize("argv", [["--delete"], ["-t", "d", "--delete", "--dry-run"]])
+def test_delete_without_a_key_is_refused(tree, capsys, argv):
+    before = walked(tree, "", recursive=10)
+    with pytest.raises(SystemExit) as e:
+        main(argv + ["-p", tree])
+    assert e.value.code == 2
+    assert "requires a key" in capsys.readouterr().err
+    assert walked(tree, "", recursive=10) == before
+
+
+def test_delete_removes_the_matches_but_not_the_root(tree, capsys):
+    b1 = os.path.join(tree, "b", "b1")
+    assert main(["b1", "-t", "d", "-p", tree, "--delete", "--dry-run", "-a"]) == 0
+    assert capsys.readouterr().out.split() == [b1, os.path.join(b1, "b2")]
+    assert os.path.isdir(b1)
+    assert main(["b1", "-t", "d", "-p", tree, "--delete"]) == 0
+    assert not os.path.exists(b1)
+
+    empty = os.path.join(tree, "empty")  # its own path contains the key
+    main(["empty", "-t", "d", "-p", empty, "--delete"])
+    assert "not removing the search root" in capsys.readouterr().err
+    assert os.path.isdir(empty)
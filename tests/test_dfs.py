@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# file: test_dfs.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+
+import pytest
+
+import findfile.find
+from findfile import find_dirs, find_files
+
+
+class CountingScandir:
+    """``os.scandir`` that remembers how many of its iterators were open at once."""
+
+    def __init__(self, scandir):
+        self.scandir = scandir
+        self.open = self.most = 0
+
+    def __call__(self, path):
+        counter = self
+
+        class Iterator:
+            def __init__(self):
+                self.it = counter.scandir(path)
+                counter.open += 1
+                counter.most = max(counter.most, counter.open)
+
+            def __iter__(self):
+                return self
+
+            def __next__(self):
+                return next(self.it)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self.close()
+
+            def close(self):
+                if self.it is not None:
+                    self.it.close()
+                    self.it = None
+                    counter.open -= 1
+
+        return Iterator()
+
+
+def walked(tree, find=find_files, **kwargs):
+    found = find(tree, "", return_relative_path=False, use_cache=False, **kwargs)
+    return [os.path.relpath(p, tree) for p in found]
+
+
+@pytest.mark.parametrize("recursive", [0, 1, 2, 10])
+def test_dfs_finds_what_bfs_finds(tree, recursive):
+    for find, extra in ((find_files, {}), (find_dirs, {"return_leaf_only": False})):
+        bfs = walked(tree, find, recursive=recursive, **extra)
+        dfs = walked(tree, find, recursive=recursive, strategy="dfs", **extra)
+        assert sorted(dfs) == sorted(bfs)
+
+
+def test_dfs_comes_in_pre_order(tree):
+    dirs = walked(tree, find_dirs, recursive=10, return_leaf_only=False, strategy="dfs")
+    for i, d in enumerate(dirs):
+        below = [j for j, p in enumerate(dirs) if p.startswith(d + os.sep)]
+        # a dir comes right before its subtree, which is not interleaved with others
+        assert below == list(range(i + 1, i + 1 + len(below)))
+
+
+def test_dfs_holds_one_listing_per_level(tree, monkeypatch):
+    scandir = CountingScandir(os.scandir)
+    monkeypatch.setattr(findfile.find.os, "scandir", scandir)
+    walked(tree, recursive=10, strategy="dfs")
+    assert scandir.open == 0
+    assert scandir.most == 4  # tree, a, a/a1, a/a1/deep: the deepest dirs
+    scandir.most = 0
+    walked(tree, recursive=2, strategy="dfs")
+    assert scandir.most == 2 and scandir.open == 0
+
+
+def test_dfs_refuses_the_bfs_only_options(tree):
+    with pytest.raises(ValueError):
+        find_files(tree, "", strategy="dfs", workers=2, use_cache=False)
+    with pytest.raises(ValueError):
+        find_files(tree, "", strategy="dfs", max_entries=3, use_cache=False)
+    with pytest.raises(ValueError):
+        find_files(tree, "", strategy="sideways", use_cache=False)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# file: test_disk_cache.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+import shutil
+import time
+
+import pytest
+
+import findfile.file_manager
+from findfile import find_files
+from findfile.file_manager import DiskCache, FileManager
+
+
+def entries(cache):
+    return list(cache._entries())
+
+
+@pytest.mark.parametrize("start", [0, 1, 2])
+def test_deepen_equals_a_fresh_build(tree, start):
+    cache = DiskCache(tree, recursive=start).deepen(4)
+    assert cache.recursive == 4
+    assert entries(cache) == entries(DiskCache(tree, recursive=4))
+
+
+@pytest.mark.parametrize("depth", [0, 1, 3])
+def test_view_equals_a_shallow_build(tree, depth):
+    deep = DiskCache(tree, recursive=5)
+    assert entries(deep.view(depth)) == entries(DiskCache(tree, recursive=depth))
+    assert deep.recursive == 5  # the deep cache itself is untouched
+
+
+def test_file_manager_deepens_and_views_the_saved_cache(tree):
+    FileManager(tree, recursive=1)
+    deeper = FileManager(tree, recursive=4)
+    shallower = FileManager(tree, recursive=2)
+    assert deeper.disk_cache.build_params["recursive"] == 4
+    for fm, depth in ((deeper, 4), (shallower, 2)):
+        assert fm.find_files(tree, ".py", recursive=depth, return_relative_path=False) == sorted(
+            find_files(tree, ".py", recursive=depth, return_relative_path=False, use_cache=False)
+        )
+
+
+def parts_of(tree, top_depth=1, below=9, skip=()):
+    """A cache of the top of *tree* and one per dir on its depth frontier."""
+    top = DiskCache(tree, recursive=top_depth)
+    frontier = [p for p, is_dir, depth in top._entries() if is_dir and depth == top_depth]
+    return [top] + [DiskCache(d, recursive=below) for d in frontier if d not in skip]
+
+
+def test_merge_equals_a_full_build(tree):
+    merged = DiskCache.merge(parts_of(tree))
+    assert merged.recursive == 10
+    assert entries(merged) == entries(DiskCache(tree, recursive=10))
+    # the order of the parts does not matter, and parts can be split further
+    nested = parts_of(tree)[::-1]
+    nested = [p for p in nested if not p.work_dir.endswith(os.sep + "a")] + [
+        DiskCache(os.path.join(tree, "a"), recursive=1),
+        DiskCache(os.path.join(tree, "a", "a1"), recursive=8),
+        DiskCache(os.path.join(tree, "a", "a2"), recursive=8),
+    ]
+    assert entries(DiskCache.merge(nested)) == entries(DiskCache(tree, recursive=10))
+
+
+def test_merge_stops_at_a_dir_no_part_continues(tree):
+    merged = DiskCache.merge(parts_of(tree, skip={os.path.join(tree, "empty")}))
+    assert merged.recursive == 1
+    assert entries(merged) == entries(DiskCache(tree, recursive=1))
+
+
+def test_merged_cache_answers_like_a_walk(tree):
+    merged = DiskCache.merge(parts_of(tree, top_depth=2, below=8))
+    for key in ("", ".py", "b1"):
+        assert [p for p, _ in merged.query(tree, want="file", key=[key], recursive=10)] == sorted(
+            find_files(tree, key, recursive=10, return_relative_path=False, use_cache=False)
+        )
+
+
+def test_merge_rejects_overlaps_and_gaps(tree):
+    a, b = os.path.join(tree, "a"), os.path.join(tree, "b")
+    with pytest.raises(ValueError, match="Overlapping"):
+        DiskCache.merge(parts_of(tree) + [DiskCache(a, recursive=2)])
+    with pytest.raises(ValueError, match="Overlapping"):
+        DiskCache.merge([DiskCache(tree, recursive=2), DiskCache(a, recursive=3)])
+    with pytest.raises(ValueError, match="Gap"):
+        DiskCache.merge([DiskCache(tree, recursive=1), DiskCache(os.path.join(a, "a1"))])
+    with pytest.raises(ValueError, match="not inside"):
+        DiskCache.merge([DiskCache(a, recursive=1), DiskCache(b, recursive=1)])
+    with pytest.raises(ValueError, match="other options"):
+        DiskCache.merge([DiskCache(tree, recursive=1), DiskCache(a, one_file_system=True)])
+    with pytest.raises(ValueError):
+        DiskCache.merge([])
+
+
+def test_relisted_equals_a_fresh_build(tree, monkeypatch):
+    cache = DiskCache(tree, recursive=4, track_mtimes=True)
+    time.sleep(0.02)  # a new dir mtime even with a coarse clock
+    open(os.path.join(tree, "a", "a1", "new.py"), "w").close()
+    shutil.rmtree(os.path.join(tree, "d", "e"))
+    os.remove(os.path.join(tree, "c.py"))
+    os.makedirs(os.path.join(tree, "c.py", "x", "y", "z"))  # a file replaced by a deep dir
+    changed = cache.changed_dirs()
+    removed = [os.path.join(tree, "d", "e"), os.path.join(tree, "d", "e", "f")]
+    assert sorted(changed) == sorted(
+        [tree, os.path.join(tree, "a", "a1"), os.path.join(tree, "d")] + removed
+    )
+    assert cache.changed_dirs(os.path.join(tree, "a"), 1) == []  # a1 is listed, a1/* not read
+
+    listings = []
+    walk = findfile.file_manager._walk
+
+    def counted(top, *args, **kwargs):
+        listings.append(str(top))
+        return walk(top, *args, **kwargs)
+
+    monkeypatch.setattr(findfile.file_manager, "_walk", counted)
+    fresh = cache.relisted(changed)
+    # the removed dirs are dropped with d, the new c.py dir is walked from below
+    expected = [d for d in changed if d not in removed] + [os.path.join(tree, "c.py")]
+    assert sorted(listings) == sorted(expected)
+    assert entries(fresh) == entries(DiskCache(tree, recursive=4))
+    assert fresh.is_fresh() and fresh.changed_dirs() == []
+    assert len(cache) != len(fresh)  # the old cache is untouched
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# file: test_duplicates.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+
+import pytest
+
+from findfile import FindStats, MemoryBackend, find_duplicates
+
+BLOCK = 16
+
+
+@pytest.fixture
+def dups(tmp_path):
+    """Files that differ only at their ends, only in the middle, or not at all."""
+    root = tmp_path.resolve() / "dups"
+    contents = {
+        "one/same.bin": b"s" * 100,
+        "two/same.bin": b"s" * 100,
+        "two/deeper/same.bin": b"s" * 100,
+        "one/middle.bin": b"m" * 50 + b"1" + b"m" * 49,  # same edges, other middle
+        "two/middle.bin": b"m" * 50 + b"2" + b"m" * 49,
+        "one/small.txt": b"tiny",
+        "two/small.txt": b"tiny",
+        "one/other.txt": b"tony",  # same size, other content
+        "one/empty": b"",
+        "two/empty": b"",
+        "one/unique.bin": b"u" * 300,
+    }
+    for rel, data in contents.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return str(root)
+
+
+def rel(root, groups):
+    return [[os.path.relpath(p, root) for p in group] for group in groups]
+
+
+def test_groups_of_identical_files(dups):
+    groups = find_duplicates(dups, recursive=5, block_size=BLOCK, return_relative_path=False)
+    assert rel(dups, groups) == [
+        ["one/same.bin", "two/deeper/same.bin", "two/same.bin"],
+        ["one/small.txt", "two/small.txt"],
+    ]
+
+
+def test_only_colliding_files_are_read(dups):
+    stats = FindStats()
+    find_duplicates(dups, recursive=5, block_size=BLOCK, stats=stats)
+    edges = 3 * 2 * BLOCK + 2 * 2 * BLOCK + 3 * 4  # same, middle and the four-byte files
+    full = 3 * 100 + 2 * 100  # the same and middle files collide on their edges
+    assert stats.bytes_read == edges + full
+
+
+def test_hard_links_are_one_file(dups):
+    for name in ("link1", "link2"):
+        os.link(os.path.join(dups, "one", "same.bin"), os.path.join(dups, name))
+    os.link(os.path.join(dups, "one", "unique.bin"), os.path.join(dups, "unique_link"))
+    stats = FindStats()
+    groups = find_duplicates(
+        dups, recursive=5, block_size=BLOCK, return_relative_path=False, stats=stats
+    )
+    # the links come together with the path they share an inode with, read once
+    assert rel(dups, groups)[0] == [
+        "link1",
+        "link2",
+        "one/same.bin",
+        "two/deeper/same.bin",
+        "two/same.bin",
+    ]
+    assert stats.bytes_read == 3 * 2 * BLOCK + 2 * 2 * BLOCK + 3 * 4 + 3 * 100 + 2 * 100
+    # links alone free nothing when deleted: only reported on request
+    assert ["unique_link"] not in [sorted(g) for g in rel(dups, groups)]
+    with_links = find_duplicates(
+        dups, recursive=5, block_size=BLOCK, return_relative_path=False, include_hardlinks=True
+    )
+    assert ["one/unique.bin", "unique_link"] in rel(dups, with_links)
+
+
+def test_keys_and_sizes_select_the_candidates(dups, monkeypatch):
+    monkeypatch.chdir(dups)
+    assert find_duplicates(dups, ".txt", recursive=5) == [
+        [os.path.join("one", "small.txt"), os.path.join("two", "small.txt")]
+    ]
+    assert find_duplicates(dups, ".bin", exclude_key="deeper", recursive=5, block_size=BLOCK) == [
+        [os.path.join("one", "same.bin"), os.path.join("two", "same.bin")]
+    ]
+    assert len(find_duplicates(dups, recursive=5, min_size=0)) == 3  # the empty files too
+    assert find_duplicates(dups, recursive=5, min_size=101) == []
+
+
+def test_remote_backends_are_refused(dups):
+    with pytest.raises(ValueError):
+        find_duplicates("/", backend=MemoryBackend({"/a": b"x", "/b": b"x"}))
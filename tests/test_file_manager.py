@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# file: test_file_manager.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+import shutil
+import time
+
+from findfile import find_dirs, find_file, find_files, find_files_page
+from findfile.file_manager import _CACHE_NAME, FileManager
+
+
+def test_cache_and_lock_are_not_results(tree):
+    manager = FileManager(tree)
+    assert os.path.exists(os.path.join(tree, _CACHE_NAME))
+    assert os.path.exists(os.path.join(tree, _CACHE_NAME + ".lock"))
+    # a second manager loads the saved cache, which must not index itself either
+    for fm in (manager, FileManager(tree)):
+        found = fm.find_files(tree, "", recursive=10, return_relative_path=False)
+        assert not [p for p in found if _CACHE_NAME in p]
+        assert sorted(found) == sorted(
+            find_files(tree, "", recursive=10, return_relative_path=False, use_cache=False)
+        )
+    live = find_files(tree, "", recursive=10, return_relative_path=False, use_cache=False)
+    assert not [p for p in live if _CACHE_NAME in p]
+    page = find_files_page(tree, "", page_size=100, recursive=10, return_relative_path=False)
+    assert not [p for p in page if _CACHE_NAME in p]
+
+
+def test_saved_cache_answers_like_a_walk(tree):
+    FileManager(tree)
+    fm = FileManager(tree)
+    for key in (".py", "x", "a1"):
+        assert fm.find_files(tree, key, recursive=10, return_relative_path=False) == sorted(
+            find_files(tree, key, recursive=10, return_relative_path=False, use_cache=False)
+        )
+        assert sorted(fm.find_dirs(tree, key, recursive=10, return_relative_path=False)) == sorted(
+            find_dirs(tree, key, recursive=10, return_relative_path=False, use_cache=False)
+        )
+
+
+def test_find_file_agrees_with_the_walk(tree):
+    fm = FileManager(tree)
+    # a/x.py and b/x.py are equally long: the cache and the walk pick the same one
+    for deepest in (False, True):
+        kwargs = dict(return_deepest_path=deepest, disable_alert=True, return_relative_path=False)
+        assert fm.find_file(tree, "x.py", **kwargs) == os.path.join(tree, "a", "x.py")
+        assert find_file(tree, "x.py", use_cache=False, **kwargs) == os.path.join(tree, "a", "x.py")
+
+
+def walked(tree, key):
+    return sorted(find_files(tree, key, recursive=10, return_relative_path=False, use_cache=False))
+
+
+def change(tree):
+    time.sleep(0.02)  # a new dir mtime even with a coarse clock
+    open(os.path.join(tree, "a", "a1", "deep", "new.py"), "w").close()
+    shutil.rmtree(os.path.join(tree, "b", "b1"))
+    os.remove(os.path.join(tree, "c.py"))
+    os.makedirs(os.path.join(tree, "c.py", "in"))
+
+
+def test_a_tree_changed_between_managers_is_relisted(tree):
+    FileManager(tree, recursive=10)
+    change(tree)
+    fm = FileManager(tree, recursive=10)
+    found = fm.find_files(tree, ".py", recursive=10, return_relative_path=False)
+    assert found == walked(tree, ".py")
+    ranked = fm.find_ranked("new.py", top_n=1)
+    assert [p for p, _ in ranked] == [os.path.join(tree, "a", "a1", "deep", "new.py")]
+    # the re-listed cache was saved; loading it again does not write it again
+    saved = os.stat(os.path.join(tree, _CACHE_NAME)).st_mtime_ns
+    fm = FileManager(tree, recursive=10)
+    assert os.stat(os.path.join(tree, _CACHE_NAME)).st_mtime_ns == saved
+    assert fm.find_files(tree, "", recursive=10, return_relative_path=False) == walked(tree, "")
+
+
+def test_a_tree_changed_after_loading_is_relisted_per_query(tree):
+    fm = FileManager(tree, recursive=10)
+    change(tree)
+    found = fm.find_files(tree, ".py", recursive=10, return_relative_path=False)
+    assert found == walked(tree, ".py")
+    page = fm.find_files_page(tree, "", page_size=100, recursive=10, return_relative_path=False)
+    assert list(page) == walked(tree, "")
+    assert fm.find_dirs(tree, "in", recursive=10, return_relative_path=False) == [
+        os.path.join(tree, "c.py", "in")
+    ]
+
+
+def test_and_excludes_see_the_ignored_entries_like_a_walk(tree):
+    open(os.path.join(tree, "a", "notes.ffi"), "w").close()
+    fm = FileManager(tree, recursive=10)
+    kwargs = dict(recursive=10, return_relative_path=False)
+    for exclude_logic in ("or", "and"):
+        options = dict(kwargs, exclude_key=["y.txt", "u"], exclude_logic=exclude_logic)
+        expected = sorted(find_files(tree, "", use_cache=False, **options))
+        assert sorted(fm.find_files(tree, "", **options)) == expected
+        assert list(fm.find_files_page(tree, "", page_size=100, **options)) == expected
+        # only a walk that ands the exclude keys with the ignore list reports these
+        ignored = [p for p in expected if p.endswith(".ffi") or _CACHE_NAME in p]
+        assert bool(ignored) == (exclude_logic == "and")
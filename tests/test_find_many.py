@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# file: test_find_many.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import pytest
+
+from findfile import FindStats, find_dir, find_dirs, find_file, find_files, find_many
+
+# each find_many spec and the separate call it must agree with
+QUERIES = [
+    (".py", lambda tree, **kw: find_file(tree, ".py", **kw)),
+    ({"key": ".py", "all": True}, lambda tree, **kw: find_files(tree, ".py", **kw)),
+    ({"key": "X.PY", "all": True}, lambda tree, **kw: find_files(tree, "X.PY", **kw)),
+    (
+        {"key": ["a", ".py"], "exclude_key": "deep", "all": True},
+        lambda tree, **kw: find_files(tree, ["a", ".py"], exclude_key="deep", **kw),
+    ),
+    (
+        {"or_key": ["u.txt", "v.py"], "all": True},
+        lambda tree, **kw: find_files(tree, or_key=["u.txt", "v.py"], **kw),
+    ),
+    (
+        {"key": r"f\d+\.py$", "use_regex": True, "all": True},
+        lambda tree, **kw: find_files(tree, r"f\d+\.py$", use_regex=True, **kw),
+    ),
+    (
+        {"key": ".py", "recursive": 1, "all": True},
+        lambda tree, **kw: find_files(tree, ".py", **dict(kw, recursive=1)),
+    ),
+    (
+        {"key": ".py", "return_deepest_path": True},
+        lambda tree, **kw: find_file(tree, ".py", return_deepest_path=True, **kw),
+    ),
+    ({"key": "b1", "want": "dir"}, lambda tree, **kw: find_dir(tree, "b1", **kw)),
+    (
+        {"key": "a", "want": "dir", "all": True},
+        lambda tree, **kw: find_dirs(tree, "a", **kw),
+    ),
+    (
+        {"key": "a", "want": "dir", "all": True, "return_leaf_only": False},
+        lambda tree, **kw: find_dirs(tree, "a", return_leaf_only=False, **kw),
+    ),
+]
+
+
+@pytest.mark.parametrize("walk", [{}, {"strategy": "dfs"}, {"workers": 3}])
+def test_results_equal_separate_calls(tree, walk):
+    kwargs = dict(recursive=10, return_relative_path=False, disable_alert=True)
+    results = find_many(tree, [spec for spec, _ in QUERIES], **kwargs, **walk)
+    assert len(results) == len(QUERIES)
+    for (spec, call), result in zip(QUERIES, results):
+        expected = call(tree, use_cache=False, **kwargs, **walk)
+        if isinstance(expected, list):
+            assert sorted(result) == sorted(expected), spec
+        else:
+            assert result == expected, spec
+
+
+def test_one_walk_for_all_queries(tree):
+    stats = FindStats()
+    find_many(tree, [".py", ".txt", {"key": "a", "want": "dir"}], recursive=10, stats=stats)
+    single = FindStats()
+    find_files(tree, "", recursive=10, stats=single, use_cache=False)
+    assert stats.dirs_listed == single.dirs_listed
+
+
+def test_bad_queries_raise(tree):
+    assert find_many(tree, []) == []
+    with pytest.raises(ValueError):
+        find_many(tree, [{"key": "a", "or_key": ["b"]}])
+    with pytest.raises(ValueError):
+        find_many(tree, [{"key": "a", "colour": "red"}])
+    with pytest.raises(ValueError):
+        find_many(tree, [{"key": "a", "all": True, "return_deepest_path": True}])
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# file: test_fuzzy.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+
+import pytest
+
+from findfile import find_ranked_files
+from findfile.file_manager import FileManager
+from findfile.fuzzy import NameIndex, rank_paths
+
+QUERIES = ["cfg", "config", "conf.yaml", "x", "xy", "x.py", "g", "wide", "f0", "deep", "zzz"]
+
+
+@pytest.fixture
+def crowded():
+    """Short names sharing the leading trigram of "cfg", crowding config.yaml out of the pool."""
+    paths = ["/p/c{:03d}.txt".format(i) for i in range(400)]
+    paths += ["/p/config.yaml", "/q/config.yaml", "/p/my_config_backup.yaml", "/p/c.fg"]
+    return paths
+
+
+@pytest.mark.parametrize("top_n", [1, 3, 10])
+def test_index_search_equals_rank_paths(tree, top_n):
+    paths = [os.path.join(top, n) for top, dirs, names in os.walk(tree) for n in dirs + names]
+    index = NameIndex(paths)
+    for query in QUERIES:
+        assert index.search(query, top_n) == rank_paths(query, paths, top_n), query
+
+
+@pytest.mark.parametrize("query", ["cfg", "cg", "config", "c.fg", "yaml"])
+def test_subsequence_hits_outside_the_pool(crowded, query):
+    index = NameIndex(crowded)
+    found = index.search(query, 5)
+    assert found == rank_paths(query, crowded, 5)
+    if query in ("cfg", "cg"):
+        assert "/p/config.yaml" in [p for p, _ in found]
+
+
+def test_accept_filters_before_the_cut(crowded):
+    index = NameIndex(crowded)
+
+    def accept(path):
+        return path.startswith("/q/")
+
+    assert index.search("cfg", 2, accept=accept) == rank_paths("cfg", crowded, 2, accept=accept)
+    assert index.search("cfg", 2, accept=accept)[0][0] == "/q/config.yaml"
+
+
+def test_file_manager_ranks_like_a_walk(tree):
+    fm = FileManager(tree, recursive=10)
+    for query in ("x", "w", "g.py"):
+        assert fm.find_ranked(query, top_n=3, want="file") == find_ranked_files(
+            tree, query, top_n=3, recursive=10, return_relative_path=False, use_cache=False
+        )
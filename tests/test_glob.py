@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# file: test_glob.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+from pathlib import Path
+
+import pytest
+
+from findfile import FindStats, find_dirs, find_files
+
+
+@pytest.fixture
+def dotted(tree):
+    """*tree* with a hidden dir and a dot file."""
+    os.makedirs(os.path.join(tree, ".hidden", "in"))
+    for rel in (".hidden/h.py", ".hidden/in/i.py", "a/.dot.py"):
+        with open(os.path.join(tree, rel), "w") as f:
+            f.write(rel)
+    return tree
+
+
+def globbed(tree, pattern, **kwargs):
+    kwargs = {"recursive": 10, "return_relative_path": False, "use_cache": False, **kwargs}
+    files = find_files(tree, "", glob=pattern, **kwargs)
+    dirs = find_dirs(tree, "", glob=pattern, return_leaf_only=False, **kwargs)
+    return sorted(files), sorted(dirs)
+
+
+def pathlib_glob(tree, pattern):
+    found = list(Path(tree).glob(pattern))
+    return sorted(str(p) for p in found if p.is_file()), sorted(str(p) for p in found if p.is_dir())
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "*.py",
+        "*/*.py",
+        "**/*.py",
+        "a/**/*.py",
+        "**/b1",
+        "**/b1/**/*.py",
+        "wide/f0?.py",
+        "wide/f[12]*.py",
+        "*/*",
+        ".hidden/*",
+        "*/.dot.py",
+        "**/.hidden/**/*.py",
+        "d/e/f/g.py",
+        "missing/*.py",
+    ],
+)
+def test_matches_like_pathlib(dotted, pattern):
+    assert globbed(dotted, pattern) == pathlib_glob(dotted, pattern)
+
+
+def test_trailing_double_star_matches_files_too(tree):
+    files, dirs = globbed(tree, "a/**")
+    assert files == sorted(find_files(os.path.join(tree, "a"), "", return_relative_path=False))
+    assert dirs == sorted(
+        find_dirs(os.path.join(tree, "a"), "", return_relative_path=False, return_leaf_only=False)
+    )
+
+
+def test_depth_limit_bounds_double_star(tree):
+    files, _ = globbed(tree, "**/*.py", recursive=2)
+    assert files == sorted(
+        p for p in pathlib_glob(tree, "**/*.py")[0] if os.path.relpath(p, tree).count(os.sep) < 2
+    )
+
+
+@pytest.mark.parametrize(
+    "pattern, listed",
+    [
+        ("a/a1/deep/w.py", 0),  # all literal: stat'ed, never listed
+        ("wide/*.py", 1),  # only wide
+        ("*/x.py", 1),  # only the root; x.py is stat'ed in each dir
+        ("b/**/*.py", 3),  # b, b1, b2; nothing outside b
+    ],
+)
+def test_walk_is_pruned_to_the_pattern(tree, pattern, listed):
+    stats = FindStats()
+    find_files(tree, "", glob=pattern, recursive=10, stats=stats, use_cache=False)
+    assert stats.dirs_listed == listed
+
+
+def test_absolute_pattern_and_keys(tree, monkeypatch):
+    monkeypatch.chdir(os.path.join(tree, "empty"))
+    pattern = os.path.join(tree, "*", "x.py")
+    assert sorted(find_files(glob=pattern, recursive=2, return_relative_path=False)) == [
+        os.path.join(tree, "a", "x.py"),
+        os.path.join(tree, "b", "x.py"),
+    ]
+    found = find_files(tree, "b1", glob="**/*.py", recursive=10, return_relative_path=False)
+    assert found == [os.path.join(tree, "b", "b1", "b2", "v.py")]
+
+
+def test_unsupported_patterns_raise(tree):
+    for pattern in ("../*.py", ""):
+        with pytest.raises(ValueError):
+            find_files(tree, glob=pattern)
+    with pytest.raises(ValueError):
+        find_files(tree, glob="*.py", strategy="dfs")
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# file: test_mounts.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+import tempfile
+import time
+
+import pytest
+
+import findfile.find
+from findfile import FindStats, find_dirs, find_files
+from findfile.find import DEFAULT_SKIP_FSTYPES, _fstypes
+
+WALKS = [{"strategy": "bfs"}, {"strategy": "dfs"}, {"workers": 3}]
+
+
+def walked(tree, **kwargs):
+    found = find_files(tree, "", recursive=10, return_relative_path=False, use_cache=False, **kwargs)
+    return sorted(os.path.relpath(p, tree) for p in found)
+
+
+@pytest.fixture
+def mounts(tree, monkeypatch):
+    """Pretend that a, b and d are mount points of these types."""
+    types = {
+        os.path.join(tree, "a"): "nfs4",
+        os.path.join(tree, "b"): "fuse.sshfs",
+        os.path.join(tree, "d"): "ext4",
+    }
+    monkeypatch.setattr(findfile.find, "_mount_fstypes", lambda: types)
+    return tree
+
+
+def test_fstypes_are_normalized():
+    assert _fstypes(None) == _fstypes(False) == ()
+    assert _fstypes(True) == tuple(sorted(DEFAULT_SKIP_FSTYPES))
+    assert _fstypes("nfs") == ("nfs",)
+    assert _fstypes(["nfs", "cifs", "nfs"]) == ("cifs", "nfs")
+
+
+@pytest.mark.parametrize("walk", WALKS)
+@pytest.mark.parametrize(
+    "skip, skipped",
+    [(True, {"a", "b"}), ("fuse", {"b"}), (["ext4", "nfs4"], {"a", "d"}), (None, set())],
+)
+def test_skipped_mounts_are_reported_not_descended(mounts, walk, skip, skipped):
+    files = walked(mounts, skip_fstypes=skip, **walk)
+    assert files == [p for p in walked(mounts) if p.split(os.sep)[0] not in skipped]
+    dirs = find_dirs(
+        mounts, "", recursive=1, return_relative_path=False, skip_fstypes=skip, **walk
+    )
+    assert {"a", "b", "d"} <= {os.path.basename(p) for p in dirs}
+
+
+@pytest.fixture
+def other_device():
+    """A temporary dir in /dev/shm, which is usually a tmpfs mounted below /dev."""
+    if not os.path.isdir("/dev/shm") or os.stat("/dev").st_dev == os.stat("/dev/shm").st_dev:
+        pytest.skip("needs /dev/shm on its own device")
+    try:
+        mark = tempfile.mkdtemp(prefix="findfile-mark-", dir="/dev/shm")
+    except OSError:
+        pytest.skip("needs a writable /dev/shm")
+    yield mark
+    os.rmdir(mark)
+
+
+@pytest.mark.parametrize("walk", WALKS)
+def test_one_file_system_stays_on_the_device(other_device, walk):
+    name = os.path.basename(other_device)
+    kwargs = dict(recursive=2, return_relative_path=False, return_leaf_only=False, **walk)
+    assert find_dirs("/dev", name, use_cache=False, **kwargs) == [other_device]
+    assert find_dirs("/dev", name, one_file_system=True, use_cache=False, **kwargs) == []
+    # the mount point itself is still reported
+    assert "/dev/shm" in find_dirs("/dev", "shm", one_file_system=True, **kwargs)
+
+
+def test_worker_results_equal_the_sequential_walk(tree):
+    for workers in (1, 2, 8):
+        assert walked(tree, workers=workers) == walked(tree)
+
+
+def test_slow_listing_times_out(tree, monkeypatch):
+    slow = os.path.join(tree, "wide")
+    scan = findfile.find._scan_dir
+
+    def stuck(current, *args):
+        if current == slow:
+            time.sleep(0.5)
+        return scan(current, *args)
+
+    monkeypatch.setattr(findfile.find, "_scan_dir", stuck)
+    stats = FindStats()
+    started = time.monotonic()
+    found = walked(tree, workers=2, listing_timeout=0.1, stats=stats)
+    assert time.monotonic() - started < 0.45
+    assert stats.dirs_timed_out == 1
+    assert found == [p for p in walked(tree) if not p.startswith("wide" + os.sep)]
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# file: test_numpy_engine.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from findfile.file_manager import DiskCache  # noqa: E402
+
+QUERIES = [
+    {},
+    {"key": ".py"},
+    {"key": ["a", ".py"]},
+    {"key": "X.PY"},
+    {"exclude_key": "b"},
+    {"key": ".py", "exclude_key": ["a1", "b2"]},
+    {"key": ".py", "exclude_key": ["a1", "deep"], "exclude_logic": "and"},
+    {"extensions": [".txt"]},
+    {"key": "straße"},
+    {"key": "STRASSE"},
+    {"exclude_key": "ü"},
+]
+
+
+@pytest.fixture
+def caches(tree):
+    for name in ("Straße.py", "grün/über.txt", "İndex.py"):
+        path = os.path.join(tree, "a", name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(name)
+    return DiskCache(tree, recursive=10), DiskCache(tree, recursive=10, engine="numpy")
+
+
+def test_search_equals_the_python_engine(caches):
+    python, vectorized = caches
+    for q in QUERIES:
+        assert vectorized.search(**q) == python.search(**q), q
+
+
+def test_search_many_equals_one_search_per_query(caches):
+    python, vectorized = caches
+    expected = [python.search(**q) for q in QUERIES]
+    assert vectorized.search_many(QUERIES) == expected
+    assert python.search_many(QUERIES) == expected
+
+
+@pytest.mark.parametrize("want", ["file", "dir"])
+@pytest.mark.parametrize("sub, recursive", [("", 10), ("", 1), ("a", 2), ("b/b1", 0)])
+def test_query_equals_the_python_engine(tree, caches, want, sub, recursive):
+    python, vectorized = caches
+    search_path = os.path.join(tree, sub) if sub else tree
+    for q in QUERIES:
+        if "extensions" in q:
+            continue
+        kwargs = dict(want=want, recursive=recursive, **q)
+        assert vectorized.query(search_path, **kwargs) == python.query(search_path, **kwargs), q
+
+
+def test_regex_queries_bypass_the_engine(caches):
+    python, vectorized = caches
+    assert vectorized.search(r"x\.py$", use_regex=True) == python.search(r"x\.py$", use_regex=True)
+    with pytest.raises(ValueError):
+        DiskCache(os.path.dirname(python.work_dir), recursive=1, engine="cuda")
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# file: test_paging.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+
+import pytest
+
+import findfile.paging
+from findfile import find_dirs, find_dirs_page, find_files, find_files_page
+from findfile.file_manager import FileManager
+
+
+def all_pages(page, page_size, **kwargs):
+    pages = [page(page_size=page_size, **kwargs)]
+    while not pages[-1].complete:
+        assert len(pages[-1]) == page_size
+        assert len(pages) < 100
+        pages.append(page(page_size=page_size, cursor=pages[-1].cursor, **kwargs))
+    return [p for result in pages for p in result]
+
+
+@pytest.mark.parametrize("page_size", [1, 4, 39, 1000])
+@pytest.mark.parametrize("key", ["", ".py", "b1"])
+def test_pages_equal_the_sorted_walk(tree, page_size, key):
+    kwargs = dict(recursive=10, return_relative_path=False)
+    walk = sorted(find_files(tree, key, use_cache=False, **kwargs))
+    assert all_pages(lambda **kw: find_files_page(tree, key, **kw), page_size, **kwargs) == walk
+    walk = sorted(find_dirs(tree, key, return_leaf_only=False, use_cache=False, **kwargs))
+    assert all_pages(lambda **kw: find_dirs_page(tree, key, **kw), page_size, **kwargs) == walk
+
+
+@pytest.mark.parametrize("page_size", [1, 5, 1000])
+@pytest.mark.parametrize("search_path", ["", "a", "wide"])
+def test_cached_pages_equal_the_live_pages(tree, page_size, search_path):
+    fm = FileManager(tree, recursive=10)
+    root = os.path.join(tree, search_path)
+    kwargs = dict(recursive=6, return_relative_path=False)
+    for key in ("", ".py"):
+        live = all_pages(lambda **kw: find_files_page(root, key, **kw), page_size, **kwargs)
+        cached = all_pages(lambda **kw: fm.find_files_page(root, key, **kw), page_size, **kwargs)
+        assert cached == live
+        live = all_pages(lambda **kw: find_dirs_page(root, key, **kw), page_size, **kwargs)
+        cached = all_pages(lambda **kw: fm.find_dirs_page(root, key, **kw), page_size, **kwargs)
+        assert cached == live
+
+
+def test_cached_pages_come_from_the_cache(tree, monkeypatch):
+    fm = FileManager(tree, recursive=10)
+
+    def no_walk(*args, **kwargs):
+        raise AssertionError("walked instead of reading the cache")
+
+    monkeypatch.setattr(findfile.paging, "_find_page", no_walk)
+    page = fm.find_files_page(tree, ".py", page_size=3, recursive=5)
+    assert len(page) == 3 and not page.complete
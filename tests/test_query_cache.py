@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# file: test_query_cache.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+import shutil
+import time
+
+import pytest
+
+from findfile import (
+    clear_query_cache,
+    disable_query_cache,
+    enable_query_cache,
+    find_dirs,
+    find_file,
+    find_files,
+    query_cache_info,
+)
+
+
+@pytest.fixture(autouse=True)
+def query_cache():
+    enable_query_cache()
+    yield
+    disable_query_cache()
+
+
+def later():
+    """Wait out coarse mtime clocks so that the next change gets a new dir mtime."""
+    time.sleep(0.02)
+
+
+def py_files(root, **kwargs):
+    return find_files(root, ".py", recursive=10, return_relative_path=False, **kwargs)
+
+
+def test_repeated_query_is_a_hit(tree):
+    first = py_files(tree)
+    assert py_files(tree) == first
+    info = query_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+    clear_query_cache()
+    assert tuple(query_cache_info()) == (0, 0, 128, 0)
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda tree: open(os.path.join(tree, "a", "a1", "deep", "new.py"), "w").close(),
+        lambda tree: os.remove(os.path.join(tree, "d", "e", "f", "g.py")),
+        lambda tree: os.rename(
+            os.path.join(tree, "b", "b1", "b2"), os.path.join(tree, "b", "b1", "moved")
+        ),
+        lambda tree: shutil.rmtree(os.path.join(tree, "a")),
+    ],
+    ids=["create", "delete", "rename", "rmtree"],
+)
+def test_changes_below_the_root_invalidate(tree, change):
+    py_files(tree)
+    later()
+    change(tree)
+    assert py_files(tree) == py_files(tree, use_cache=False)
+    assert query_cache_info().hits == 0
+
+
+def test_a_search_path_that_is_a_file_invalidates(tree):
+    path = os.path.join(tree, "c.py")
+    assert find_file(path, "c.py", return_relative_path=False) == path
+    assert find_file(path, "c.py", return_relative_path=False) == path
+    assert query_cache_info().hits == 1
+    later()
+    os.remove(path)
+    assert find_files(path, "c.py") == []
+    later()
+    os.makedirs(os.path.join(path, "sub"))
+    assert find_dirs(path, "sub", return_relative_path=False) == [os.path.join(path, "sub")]
+
+
+def test_depth_zero_invalidates(tree):
+    root = os.path.join(tree, "empty")
+    assert find_dirs(root, "empty", recursive=0, return_relative_path=False) == [root]
+    later()
+    os.rename(root, os.path.join(tree, "gone"))
+    assert find_dirs(root, "empty", recursive=0) == []
+    assert query_cache_info().hits == 0
+
+
+def test_entries_expire_after_the_ttl(tree):
+    enable_query_cache(ttl=0.05)
+    py_files(tree)
+    py_files(tree)
+    assert query_cache_info().hits == 1
+    time.sleep(0.1)
+    py_files(tree)
+    assert query_cache_info().hits == 1
+
+
+def test_least_recently_used_entry_is_evicted(tree):
+    enable_query_cache(maxsize=2)
+    a, b, c = (os.path.join(tree, d) for d in "abd")
+    for root in (a, b, a, c):  # the hit on *a* makes *b* the oldest
+        py_files(root)
+    assert query_cache_info().currsize == 2
+    py_files(a)
+    assert query_cache_info().hits == 2
+    py_files(b)
+    assert query_cache_info().hits == 2
+
+
+def test_use_cache_overrides_the_default(tree):
+    py_files(tree, use_cache=False)
+    py_files(tree, use_cache=False)
+    info = query_cache_info()
+    assert (info.hits, info.currsize) == (0, 0)
+    disable_query_cache()
+    py_files(tree, use_cache=True)
+    assert py_files(tree, use_cache=True) == py_files(tree, use_cache=False)
+    assert query_cache_info().hits == 1
+    py_files(tree)
+    assert query_cache_info().hits == 1
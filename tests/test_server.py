@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# file: test_server.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+import findfile.find
+from findfile import find_dirs, find_files
+from findfile.server import IndexServer, ping, request
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def served(tree):
+    """An IndexServer of *tree* (depth 6) on a private socket; its socket path."""
+    sock_dir = tempfile.mkdtemp(prefix="ff")  # short: socket paths are limited to ~100 bytes
+    path = os.path.join(sock_dir, "s.sock")
+    server = IndexServer([tree], path, recursive=6, refresh_interval=3600)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if ping(path) is not None:
+            break
+        time.sleep(0.01)
+    yield path
+    server.shutdown()
+    thread.join(5)
+    shutil.rmtree(sock_dir)
+
+
+def later():
+    """Wait out coarse mtime clocks so that the next change gets a new dir mtime."""
+    time.sleep(0.02)
+
+
+def walked(root, key, **kwargs):
+    return find_files(root, key, return_relative_path=False, use_cache=False, **kwargs)
+
+
+def no_local_walk(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("walked locally instead of asking the server")
+
+    monkeypatch.setattr(findfile.find, "_walk", fail)
+
+
+def test_ping_lists_the_roots(tree, served):
+    assert ping(served) == [tree]
+    assert request(served, {"op": "nonsense"})["ok"] is False
+
+
+@pytest.mark.parametrize("search_path", ["", "a", "wide"])
+def test_served_results_equal_a_walk(tree, served, search_path, monkeypatch):
+    root = os.path.join(tree, search_path)
+    expected = sorted(walked(root, ".py", recursive=4))
+    dirs = sorted(
+        find_dirs(root, "", recursive=4, return_relative_path=False, return_leaf_only=False)
+    )
+    no_local_walk(monkeypatch)
+    served_files = find_files(root, ".py", recursive=4, server=served, return_relative_path=False)
+    served_dirs = find_dirs(
+        root, "", recursive=4, server=served, return_relative_path=False, return_leaf_only=False
+    )
+    assert (served_files, served_dirs) == (expected, dirs)
+
+
+def test_queries_it_cannot_answer_fall_back(tree, served, tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "o.py").write_text("o")
+    for root, recursive, options in [
+        (str(outside), 5, {}),  # not a served root
+        (tree, 10, {}),  # deeper than the index
+        (os.path.join(tree, "missing"), 2, {}),  # not a cached dir
+        (tree, 5, {"follow_symlinks": True}),  # other walk options
+        (tree, 5, {"exclude_logic": "and"}),  # would see the ignored entries
+    ]:
+        query = dict(key=[".py"], recursive=recursive, **options)
+        assert request(served, dict(query, op="find", root=root)) == {
+            "ok": False,
+            "error": "not_served",
+        }
+        assert find_files(
+            root, ".py", server=served, return_relative_path=False, recursive=recursive, **options
+        ) == walked(root, ".py", recursive=recursive, **options)
+
+
+def test_changes_are_seen_before_the_refresh(tree, served, monkeypatch):
+    later()
+    open(os.path.join(tree, "a", "a1", "deep", "new.py"), "w").close()
+    shutil.rmtree(os.path.join(tree, "d", "e"))
+    os.rename(os.path.join(tree, "b", "b1"), os.path.join(tree, "b", "moved"))
+    expected = sorted(walked(tree, ".py", recursive=6))
+    no_local_walk(monkeypatch)
+    found = find_files(tree, ".py", recursive=6, server=served, return_relative_path=False)
+    assert found == expected
+    assert request(served, {"op": "refresh"}) == {"ok": True, "rebuilt": []}
+
+
+def test_refresh_relists_the_changed_dirs(tree, served, monkeypatch):
+    later()
+    os.remove(os.path.join(tree, "wide", "f00.py"))
+    # a query of another subtree does not look at wide
+    assert find_files(os.path.join(tree, "a"), "f00", recursive=3, server=served) == []
+    assert request(served, {"op": "refresh"}) == {"ok": True, "rebuilt": [tree]}
+    assert request(served, {"op": "refresh"}) == {"ok": True, "rebuilt": []}
+    no_local_walk(monkeypatch)
+    assert find_files(tree, "f00", recursive=6, server=served) == []
+
+
+def test_a_removed_root_is_dropped(tree, served):
+    later()
+    shutil.rmtree(tree)
+    assert find_files(tree, ".py", recursive=3, server=served) == []
+    assert ping(served) == []
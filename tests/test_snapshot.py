@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# file: test_snapshot.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+import shutil
+
+import pytest
+
+from findfile.snapshot import Snapshot, diff, take_snapshot
+
+
+def changes(old, new):
+    return {(c.status, c.path) for c in diff(old, new)}
+
+
+@pytest.fixture
+def before(tree, tmp_path):
+    return take_snapshot(tree, tmp_path / "before.snap")
+
+
+def after(tree, tmp_path):
+    return take_snapshot(tree, tmp_path / "after.snap")
+
+
+def test_snapshot_records_the_tree(tree, before):
+    records = list(before)
+    assert records[0].path == "" and records[0].is_dir
+    paths = [r.path for r in records[1:]]
+    expected = {}
+    for top, dirs, files in os.walk(tree):
+        rel = os.path.relpath(top, tree).replace(os.sep, "/")
+        for names, is_dir in ((dirs, True), (files, False)):
+            expected.update((name if rel == "." else rel + "/" + name, is_dir) for name in names)
+    assert {r.path: r.is_dir for r in records[1:]} == expected and len(paths) == len(expected)
+    assert [tuple(p.split("/")) for p in paths] == sorted(tuple(p.split("/")) for p in paths)
+    assert Snapshot(before.file).root == tree
+
+
+def test_unchanged_tree_has_no_changes(tree, before, tmp_path):
+    assert changes(before, after(tree, tmp_path)) == set()
+
+
+def test_added_removed_and_modified(tree, before, tmp_path):
+    with open(os.path.join(tree, "b", "new.py"), "w") as f:
+        f.write("new")
+    os.mkdir(os.path.join(tree, "empty", "sub"))
+    os.remove(os.path.join(tree, "a", "y.txt"))
+    shutil.rmtree(os.path.join(tree, "d", "e"))
+    with open(os.path.join(tree, "wide", "f07.py"), "a") as f:
+        f.write(" and more")
+
+    found = changes(before, after(tree, tmp_path))
+    assert {("added", "b/new.py"), ("added", "empty/sub")} <= found
+    assert {("removed", "a/y.txt"), ("removed", "d/e"), ("removed", "d/e/f/g.py")} <= found
+    assert ("modified", "wide/f07.py") in found
+    # the dirs whose entries changed, and nothing else
+    assert {p for s, p in found if s == "modified"} == {"a", "b", "d", "empty", "wide/f07.py"}
+
+
+def test_file_replaced_by_a_dir_and_back(tree, before, tmp_path):
+    os.remove(os.path.join(tree, "c.py"))
+    os.makedirs(os.path.join(tree, "c.py", "inner"))
+    shutil.rmtree(os.path.join(tree, "b", "b1"))
+    with open(os.path.join(tree, "b", "b1"), "w") as f:
+        f.write("now a file")
+
+    found = changes(before, after(tree, tmp_path))
+    assert {("removed", "c.py"), ("added", "c.py"), ("added", "c.py/inner")} <= found
+    assert {("removed", "b/b1"), ("added", "b/b1"), ("removed", "b/b1/b2/v.py")} <= found
+    assert not [p for s, p in found if s == "added" and p.startswith("b/b1/")]
+
+
+def test_rewrite_in_place_is_found_below_unchanged_dirs(tree, before, tmp_path):
+    # same size, and the dir mtimes do not change: only the subtree digest tells
+    path = os.path.join(tree, "a", "a1", "deep", "w.py")
+    st = os.stat(path)
+    with open(path, "w") as f:
+        f.write("W" * st.st_size)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    found = changes(before, after(tree, tmp_path))
+    assert found == {("modified", "a/a1/deep/w.py")}
+
+
+def test_diff_of_different_depths_raises(tree, before, tmp_path):
+    shallow = take_snapshot(tree, tmp_path / "shallow.snap", recursive=1)
+    with pytest.raises(ValueError):
+        list(diff(before, shallow))
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# file: test_stats.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import json
+import logging
+import os
+
+import pytest
+
+from findfile import (
+    FileManager,
+    FindStats,
+    add_stats_hook,
+    disable_query_cache,
+    enable_query_cache,
+    find_files,
+    remove_stats_hook,
+)
+
+
+def counts(tree):
+    """(dirs, files) below and including *tree*."""
+    dirs = files = 0
+    for _, _, names in os.walk(tree):
+        dirs += 1
+        files += len(names)
+    return dirs, files
+
+
+@pytest.mark.parametrize("walk", [{}, {"strategy": "dfs"}, {"workers": 3}])
+def test_counters_of_a_full_walk(tree, walk):
+    dirs, files = counts(tree)
+    stats = FindStats()
+    found = find_files(tree, ".py", recursive=10, stats=stats, use_cache=False, **walk)
+    assert (stats.calls, stats.cache_hits) == (1, 0)
+    assert stats.dirs_listed == dirs
+    assert stats.entries_visited == dirs + files  # every entry plus the root
+    assert stats.matches == len(found)
+    assert stats.regex_evals >= files  # every file is matched against the key
+    assert stats.query["search_path"] == tree and stats.query["want"] == "file"
+    assert 0 < stats.walk_time <= stats.total_time
+    assert len(stats.slowest_dirs) == min(dirs, FindStats.max_slowest)
+    assert stats.slowest_dirs == sorted(stats.slowest_dirs, reverse=True)
+    json.dumps(stats.as_dict())
+
+
+def test_depth_limit_prunes(tree):
+    stats = FindStats()
+    find_files(tree, "", recursive=1, stats=stats, use_cache=False)
+    top = os.listdir(tree)
+    assert stats.dirs_listed == 1
+    assert stats.entries_pruned == sum(os.path.isdir(os.path.join(tree, n)) for n in top)
+
+
+def test_counters_accumulate_over_or_keys(tree):
+    stats = FindStats()
+    find_files(tree, or_key=["x.py", "u.txt"], recursive=10, stats=stats, use_cache=False)
+    assert stats.calls == 2
+    assert stats.dirs_listed == 2 * counts(tree)[0]
+
+
+def test_cache_hits_list_nothing(tree):
+    enable_query_cache()
+    try:
+        stats = FindStats()
+        find_files(tree, ".py", recursive=10, stats=stats)
+        listed = stats.dirs_listed
+        find_files(tree, ".py", recursive=10, stats=stats)
+        assert (stats.calls, stats.cache_hits, stats.dirs_listed) == (2, 1, listed)
+    finally:
+        disable_query_cache()
+    stats = FindStats()
+    FileManager(tree, recursive=10).find_files(tree, ".py", recursive=10, stats=stats)
+    assert (stats.cache_hits, stats.dirs_listed) == (1, 0)
+
+
+def test_hooks_and_the_debug_logger(tree, caplog):
+    seen = []
+    add_stats_hook(seen.append)
+    try:
+        find_files(tree, ".txt", recursive=10, use_cache=False)
+    finally:
+        remove_stats_hook(seen.append)
+    assert len(seen) == 1 and seen[0].matches == 2
+    find_files(tree, ".txt", recursive=10, use_cache=False)
+    assert len(seen) == 1
+
+    with caplog.at_level(logging.DEBUG, logger="findfile"):
+        find_files(tree, ".txt", recursive=10, use_cache=False)
+    assert [r.name for r in caplog.records] == ["findfile"]
+    assert "FindStats(" in caplog.records[0].getMessage()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# file: test_symlinks.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+
+import pytest
+
+from findfile import find_dirs, find_file, find_files
+from findfile.file_manager import DiskCache
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+
+WALKS = [{"strategy": "bfs"}, {"strategy": "dfs"}, {"workers": 3}]
+
+
+def files(root, key="", **kwargs):
+    return sorted(
+        find_files(root, key, recursive=10, return_relative_path=False, use_cache=False, **kwargs)
+    )
+
+
+def rel(root, paths):
+    return sorted(os.path.relpath(p, root) for p in paths)
+
+
+@pytest.fixture
+def linked(tmp_path):
+    """``s/real`` with two files, aliased by links that sort before and after it."""
+    root = tmp_path.resolve() / "s"
+    (root / "real" / "sub").mkdir(parents=True)
+    (root / "real" / "f.txt").write_text("f")
+    (root / "real" / "sub" / "g.txt").write_text("g")
+    os.symlink("real", root / "a_alias")
+    os.symlink("real", root / "z_alias")
+    os.symlink("..", root / "real" / "sub" / "loop")  # a cycle back to real
+    return str(root)
+
+
+@pytest.mark.parametrize("walk", WALKS)
+def test_following_links_never_loses_real_paths(linked, walk):
+    plain = files(linked, "real", **walk)
+    assert rel(linked, plain) == ["real/f.txt", "real/sub/g.txt"]
+    followed = files(linked, "real", follow_symlinks=True, **walk)
+    assert set(plain) <= set(followed)
+    found = find_file(linked, "real/sub/g.txt", follow_symlinks=True, disable_alert=True, **walk)
+    assert found is not None and found.endswith(os.path.join("real", "sub", "g.txt"))
+
+
+@pytest.mark.parametrize("walk", WALKS)
+def test_cycles_end_and_aliases_are_reported_not_listed(linked, walk):
+    followed = files(linked, follow_symlinks=True, **walk)
+    assert rel(linked, followed) == ["real/f.txt", "real/sub/g.txt"]
+    dirs = find_dirs(
+        linked,
+        "",
+        recursive=10,
+        return_relative_path=False,
+        return_leaf_only=False,
+        follow_symlinks=True,
+        use_cache=False,
+        **walk,
+    )
+    assert rel(linked, dirs) == [".", "a_alias", "real", "real/sub", "real/sub/loop", "z_alias"]
+
+
+@pytest.mark.parametrize("walk", WALKS)
+def test_dedupe_targets_keeps_the_real_path(linked, walk):
+    os.symlink(os.path.join("real", "f.txt"), os.path.join(linked, "0_file_alias"))
+    found = files(linked, follow_symlinks=True, dedupe_targets=True, **walk)
+    assert rel(linked, found) == ["real/f.txt", "real/sub/g.txt"]
+    dirs = find_dirs(
+        linked,
+        "",
+        recursive=10,
+        return_relative_path=False,
+        return_leaf_only=False,
+        follow_symlinks=True,
+        dedupe_targets=True,
+        use_cache=False,
+        **walk,
+    )
+    assert rel(linked, dirs) == [".", "real", "real/sub"]
+
+
+@pytest.mark.parametrize("walk", WALKS)
+def test_shared_subtree_outside_the_root_is_listed_once(linked, tmp_path, walk):
+    outside = tmp_path.resolve() / "outside"
+    (outside / "deep").mkdir(parents=True)
+    (outside / "deep" / "h.txt").write_text("h")
+    os.symlink(os.path.join("..", "..", "s"), outside / "deep" / "back")  # back into the root
+    os.symlink(str(outside), os.path.join(linked, "ext1"))
+    os.symlink(str(outside), os.path.join(linked, "ext2"))
+
+    found = rel(linked, files(linked, "h.txt", follow_symlinks=True, **walk))
+    assert found in (["ext1/deep/h.txt"], ["ext2/deep/h.txt"])
+    everything = rel(linked, files(linked, follow_symlinks=True, **walk))
+    assert everything == sorted(["real/f.txt", "real/sub/g.txt"] + found)
+
+
+def test_a_link_to_a_target_beyond_the_depth_limit_is_followed(tmp_path):
+    root = tmp_path.resolve() / "s"
+    (root / "a" / "b" / "c").mkdir(parents=True)
+    (root / "a" / "b" / "c" / "t.txt").write_text("t")
+    os.symlink(os.path.join("a", "b", "c"), root / "short")
+    found = find_files(
+        str(root), "t.txt", recursive=2, follow_symlinks=True, return_relative_path=False
+    )
+    assert rel(str(root), found) == ["short/t.txt"]
+
+
+def test_disk_cache_follows_links_like_the_walk(linked):
+    cache = DiskCache(linked, recursive=10, follow_symlinks=True)
+    cached = [p for p, _ in cache.query(linked, want="file", key=[""], recursive=10)]
+    assert cached == files(linked, follow_symlinks=True)
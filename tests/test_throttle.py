@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# file: test_throttle.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+import pickle
+import sys
+import threading
+
+import pytest
+
+import findfile.throttle
+from findfile import Throttle, find_dirs, find_files
+from findfile.throttle import _TokenBucket
+
+
+class FakeTime:
+    """A clock that only moves when slept on."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(findfile.throttle, "time", fake)
+    return fake
+
+
+def test_token_bucket(clock):
+    bucket = _TokenBucket(10, burst=2)
+    assert [bucket.reserve(1) for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve(1) == pytest.approx(0.1)  # in debt by one token
+    clock.sleep(0.1)
+    assert bucket.reserve(3) == pytest.approx(0.3)
+    clock.sleep(60)
+    assert bucket.reserve(2) == 0.0  # saved up no more than the burst
+    assert bucket.reserve(1) == pytest.approx(0.1)
+    with pytest.raises(ValueError):
+        _TokenBucket(0)
+
+
+def test_walk_keeps_the_listing_rate(tree, clock):
+    dirs = len(find_dirs(tree, "", recursive=10, return_leaf_only=False, use_cache=False))
+    throttle = Throttle(dirs_per_second=2, burst=1)
+    find_files(tree, "", recursive=10, throttle=throttle, use_cache=False)
+    assert throttle.dirs == dirs
+    # one listing from the burst, then one every half second
+    assert throttle.slept == pytest.approx((dirs - 1) / 2)
+    assert throttle.rates()["elapsed"] == pytest.approx(throttle.slept)
+
+
+def test_stat_rate(clock):
+    throttle = Throttle(stats_per_second=100, burst=100)
+    assert throttle.after_listing(0.0, stat_calls=150) == pytest.approx(0.5)
+    assert throttle.after_listing(0.0, stat_calls=0) == 0.0
+    assert throttle.stats == 150
+
+
+def test_adaptive_backoff_grows_and_decays(clock):
+    throttle = Throttle(adaptive=True, latency_target=0.01, max_backoff=0.5)
+    backoffs = []
+    for _ in range(6):
+        throttle.after_listing(0.1, entries=1)
+        backoffs.append(throttle.backoff)
+    assert backoffs == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5, 0.5])
+    assert throttle.before_listing() == pytest.approx(0.5)
+    for _ in range(40):
+        throttle.after_listing(0.0001, entries=1)
+    assert throttle.backoff == 0.0
+    assert throttle.before_listing() == 0.0
+
+
+@pytest.mark.parametrize("walk", [{}, {"strategy": "dfs"}, {"workers": 3}])
+def test_throttled_results_are_unchanged(tree, walk):
+    throttle = Throttle(dirs_per_second=10000, stats_per_second=10000, adaptive=True)
+    kwargs = dict(recursive=10, return_relative_path=False, use_cache=False, **walk)
+    assert sorted(find_files(tree, ".py", throttle=throttle, **kwargs)) == sorted(
+        find_files(tree, ".py", **kwargs)
+    )
+
+
+def test_pickled_throttle_keeps_limits_not_counters():
+    throttle = Throttle(dirs_per_second=5, adaptive=True, low_priority=True)
+    throttle.after_listing(0.1, stat_calls=3)  # not before_listing: that lowers this thread
+    copy = pickle.loads(pickle.dumps(throttle))
+    assert (copy.dirs_per_second, copy.adaptive, copy.low_priority) == (5, True, True)
+    assert throttle.stats == 3 and copy.stats == 0
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="per-thread priorities")
+def test_low_priority_spares_the_callers_thread(tree):
+    def priority():
+        return os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+
+    before = priority()
+    throttle = Throttle(low_priority=True)
+    found = find_files(tree, ".py", recursive=10, throttle=throttle, use_cache=False)
+    assert found and throttle.dirs > 0
+    assert priority() == before
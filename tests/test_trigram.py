@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# file: test_trigram.py
+# time: 2026/10/19
+# author: yangheng <hy345@exeter.ac.uk>
+# github: https://github.com/yangheng95
+# Copyright (C) 2021. All Rights Reserved.
+import os
+
+import pytest
+
+from findfile import find_dirs, find_files
+from findfile.file_manager import DiskCache
+from findfile.fuzzy import TrigramIndex
+
+# "ß" casefolds to "ss" but re.IGNORECASE only pairs it with "ẞ"; "İ" lowers to
+# "i̇" and "ı" matches "i" under re.IGNORECASE without being its casefold; the
+# Kelvin sign matches "k"
+NAMES = ["Straße.py", "STRASSE.txt", "ẞ-big.txt", "İndex.py", "ındex.txt", "Kelvin.py"]
+KEYS = ["", "straße", "STRASSE", "ss", "ß", "ẞ", "İndex", "i̇ndex", "ndex", "INDEX", "kelvin"]
+KEYS += ["x.py", "a1/", "wide/f1"]
+
+
+@pytest.fixture
+def unicode_tree(tree):
+    for name in NAMES:
+        os.makedirs(os.path.join(tree, "a", "uni", name + ".d"))
+        open(os.path.join(tree, "a", "uni", name), "w").close()
+    return tree
+
+
+@pytest.fixture
+def caches(unicode_tree):
+    return DiskCache(unicode_tree, recursive=10), DiskCache(
+        unicode_tree, recursive=10, trigram_index=True
+    )
+
+
+def test_search_equals_a_scan(caches):
+    scan, indexed = caches
+    assert indexed.path_index is not None and scan.path_index is None
+    for key in KEYS:
+        assert indexed.search(key) == scan.search(key), key
+        assert indexed.search(exclude_key=key) == scan.search(exclude_key=key), key
+        for exclude_logic in ("or", "and"):
+            q = dict(key=".py", exclude_key=[key, "uni/"], exclude_logic=exclude_logic)
+            assert indexed.search(**q) == scan.search(**q), (key, exclude_logic)
+
+
+@pytest.mark.parametrize(
+    "want, find, extra",
+    [("file", find_files, {}), ("dir", find_dirs, {"return_leaf_only": False})],
+)
+def test_query_equals_a_walk(unicode_tree, caches, want, find, extra):
+    scan, indexed = caches
+    kwargs = dict(recursive=10, return_relative_path=False, use_cache=False, **extra)
+    for key in KEYS:
+        hits = [p for p, _ in indexed.query(unicode_tree, want=want, key=key, recursive=10)]
+        assert hits == [p for p, _ in scan.query(unicode_tree, want=want, key=key, recursive=10)]
+        assert hits == sorted(find(unicode_tree, key, **kwargs)), key
+
+
+def test_candidates_keep_what_the_regex_matches():
+    index = TrigramIndex(["/p/straße", "/p/ındex", "/p/plain.py", "/p/other.txt"])
+    assert index.candidates("plain") == {0, 1, 2}  # the non-ASCII strings are always in
+    assert index.candidates("index") == {0, 1}
+    assert index.candidates("straße") is None  # a non-ASCII key cannot narrow
+    assert index.estimate("straße") is None
+    assert index.estimate("plain") == 1 + 2